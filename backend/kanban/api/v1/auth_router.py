@@ -3,7 +3,6 @@ from fastapi import APIRouter, Request, Response
 from backend.kanban.dependencies.annotated_types import FormData
 from backend.kanban.dependencies.auth_dep import CurrentUserDep
 from backend.kanban.dependencies.service_dependencies.user_dep import UserSvcDep
-from backend.kanban.models.models import User
 from backend.kanban.schemas.token_schema import TokenResponse
 from backend.kanban.schemas.user_schema import (
     UserCredentials,
@@ -60,8 +59,8 @@ def create_auth_router() -> APIRouter:
         response.delete_cookie(key="access_token", httponly=True, samesite="lax")
         return {"message": "Succesfully logged out"}
 
-    @user_auth_router.get("/me", response_model=UserGet)
-    async def get_me(current_user: CurrentUserDep) -> User:
+    @user_auth_router.get("/me")
+    async def get_me(current_user: CurrentUserDep) -> UserGet:
         return current_user
 
     return user_auth_router
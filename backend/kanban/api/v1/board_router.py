@@ -1,5 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
+from backend.kanban.api.v1.board_router_ext.board_tasks_router import (
+    create_board_tasks_router,
+)
+from backend.kanban.api.v1.board_router_ext.channel_router import (
+    create_channel_router,
+)
 from backend.kanban.api.v1.board_router_ext.columns_router import (
     create_columns_router,
 )
@@ -9,8 +16,14 @@ from backend.kanban.api.v1.board_router_ext.member_router import (
 from backend.kanban.api.v1.board_router_ext.tasks_router import (
     create_tasks_router,
 )
+from backend.kanban.core.utility.etag import board_etag, etag_matches
+from backend.kanban.core.utility.ndjson import NDJSON_MEDIA_TYPE
 from backend.kanban.core.utility.role_enum import RoleEnum
-from backend.kanban.dependencies.annotated_types import PaginationDep
+from backend.kanban.dependencies.annotated_types import (
+    BoardReadOptionsDep,
+    PaginationDep,
+)
+from backend.kanban.dependencies.bulk_dep import BoardImportRecordsDep
 from backend.kanban.dependencies.permission_dep import (
     CurrentUserDep,
     PermissionDep,
@@ -18,12 +31,19 @@ from backend.kanban.dependencies.permission_dep import (
 from backend.kanban.dependencies.service_dependencies.board_svc_dep import (
     BoardSvcDep,
 )
+from backend.kanban.event_manager.tasks_event_manager import connection_manager
 from backend.kanban.schemas.board_schema import (
+    BoardChanges,
+    BoardClone,
+    BoardCloneResult,
     BoardCreate,
     BoardFullView,
     BoardGet,
+    BoardImportResult,
+    BoardPage,
     BoardUpdate,
 )
+from backend.kanban.schemas.events_schema import BoardEventStats
 
 
 def create_board_router() -> APIRouter:
@@ -31,6 +51,8 @@ def create_board_router() -> APIRouter:
     board_router.include_router(create_member_router())
     board_router.include_router(create_columns_router())
     board_router.include_router(create_tasks_router())
+    board_router.include_router(create_board_tasks_router())
+    board_router.include_router(create_channel_router())
 
     @board_router.post(
         "/",
@@ -50,27 +72,154 @@ def create_board_router() -> APIRouter:
     @board_router.get(
         "/all",
         status_code=200,
-        description="Returns all boards where user presented",
-        response_description="returns a list of all the boards, where user exists",
+        description="Returns all boards where user presented, newest first. \n"
+        "Pass next_cursor of the previous page as cursor to get the next one",
+        response_description="returns a page of the boards, where user exists",
     )
     async def get_all_boards(
         board_svc: BoardSvcDep,
         current_user: CurrentUserDep,
         pagination: PaginationDep,
-    ) -> list[BoardGet]:
+    ) -> BoardPage:
         return await board_svc.get_boards(
             user_id=current_user.id, pagination=pagination
         )
 
     @board_router.get(
         "/{id}",
-        description="Gets a full about the board",
+        description="Gets a full about the board. \n"
+        "include= and fields= narrow the response (and the queries behind it) "
+        "f.e. include=columns,tasks&fields=title. \n"
+        "Supports If-None-Match with the ETag of the previous response",
         response_description="Gets a full data about the Board",
+        response_model=BoardFullView,
+        responses={304: {"description": "Board has not changed"}},
     )
     async def get_full_board(
+        id: int,
+        request: Request,
+        response: Response,
+        board_svc: BoardSvcDep,
+        current_user: CurrentUserDep,
+        read_options: BoardReadOptionsDep,
+    ) -> BoardFullView | Response:
+        version = await board_svc.get_board_version(user_id=current_user.id, id=id)
+        etag = board_etag(id, version, read_options.fingerprint)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        board = await board_svc.get_board(
+            user_id=current_user.id, id=id, read_options=read_options
+        )
+        if read_options.is_full:
+            response.headers["ETag"] = etag
+            return board
+        return Response(
+            board.model_dump_json(),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+
+    @board_router.get(
+        "/{id}/stream",
+        description="Streams the full board as NDJSON. Records are "
+        '{"type": "board" | "member" | "column" | "task", "data": {...}}. \n'
+        "Tasks come last, ordered by column and position, with their column_id",
+        response_class=StreamingResponse,
+    )
+    async def stream_full_board(
         id: int, board_svc: BoardSvcDep, current_user: CurrentUserDep
-    ) -> BoardFullView:
-        return await board_svc.get_board(user_id=current_user.id, id=id)
+    ) -> StreamingResponse:
+        board = await board_svc.get_board_header(user_id=current_user.id, id=id)
+        return StreamingResponse(
+            board_svc.stream_board(board), media_type="application/x-ndjson"
+        )
+
+    @board_router.get(
+        "/{id}/export",
+        description="Exports the board as NDJSON for POST /board/import: the "
+        "board, members by email, columns, then tasks with the email of "
+        "their assignee. Streamed, so the size of the board does not matter",
+        response_class=StreamingResponse,
+    )
+    async def export_board(
+        id: int, board_svc: BoardSvcDep, current_user: CurrentUserDep
+    ) -> StreamingResponse:
+        board = await board_svc.get_board_header(user_id=current_user.id, id=id)
+        return StreamingResponse(
+            board_svc.export_board(board),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={
+                "Content-Disposition": f'attachment; filename="board-{id}.ndjson"'
+            },
+        )
+
+    @board_router.post(
+        "/import",
+        status_code=201,
+        description="Creates a new board, owned by the current user, from the "
+        "NDJSON of GET /board/{id}/export. Columns and tasks get new ids, "
+        "members and assignees are matched by email. Members without an "
+        "account are skipped and reported. Nothing is imported if a record "
+        "is invalid",
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    NDJSON_MEDIA_TYPE: {
+                        "schema": {"type": "string", "format": "binary"}
+                    }
+                },
+            }
+        },
+    )
+    async def import_board(
+        board_svc: BoardSvcDep,
+        current_user: CurrentUserDep,
+        records: BoardImportRecordsDep,
+    ) -> BoardImportResult:
+        return await board_svc.import_board(owner_id=current_user.id, records=records)
+
+    @board_router.post(
+        "/{id}/clone",
+        status_code=201,
+        description="Copies the board into a new board owned by the current "
+        "user, in one transaction. Columns are always copied, tasks unless "
+        "include_tasks is false. Members and the assignees of the tasks are "
+        "copied on request",
+    )
+    async def clone_board(
+        id: int,
+        board_svc: BoardSvcDep,
+        current_user: CurrentUserDep,
+        options: BoardClone | None = None,
+    ) -> BoardCloneResult:
+        return await board_svc.clone_board(
+            user_id=current_user.id, id=id, options=options or BoardClone()
+        )
+
+    @board_router.get(
+        "/{id}/changes",
+        description="Changes of the board after the since version (the version "
+        "of a previous /changes response or of the board ETag). Deleted "
+        "entities are listed by id, tasks of a deleted column are listed as "
+        "deleted too. reset=true means the board has to be fetched again",
+    )
+    async def get_board_changes(
+        id: int,
+        board_svc: BoardSvcDep,
+        current_user: CurrentUserDep,
+        since: int = Query(ge=0),
+    ) -> BoardChanges:
+        return await board_svc.get_changes(user_id=current_user.id, id=id, since=since)
+
+    @board_router.get(
+        "/{board_id}/events/stats",
+        dependencies=[PermissionDep([RoleEnum.ADMIN])],
+        description="Realtime subscribers of the board and events dropped for "
+        "slow subscribers. Counters are per worker process",
+    )
+    async def get_board_event_stats(board_id: int) -> BoardEventStats:
+        return connection_manager.stats(board_id)
 
     @board_router.put(
         "/{board_id}",
@@ -0,0 +1,63 @@
+from fastapi import APIRouter
+
+from backend.kanban.core.utility.ndjson import NDJSON_MEDIA_TYPE
+from backend.kanban.core.utility.role_enum import RoleEnum
+from backend.kanban.dependencies.bulk_dep import BulkTaskRowsDep
+from backend.kanban.dependencies.permission_dep import PermissionDep
+from backend.kanban.dependencies.service_dependencies.tasks_dep import TaskSvcDep
+from backend.kanban.schemas.tasks_schema import (
+    BulkTaskCreate,
+    BulkTaskResult,
+    MoveTasksBatch,
+    TaskView,
+)
+
+
+def create_board_tasks_router() -> APIRouter:
+    """Task operations that span the columns of a board"""
+    board_tasks_router = APIRouter(prefix="/{board_id}/tasks", tags=["Board", "Tasks"])
+
+    @board_tasks_router.post(
+        "/move:batch",
+        dependencies=[PermissionDep([RoleEnum.ADMIN, RoleEnum.MEMBER])],
+        status_code=200,
+        description="Move many tasks in one transaction. \n"
+        "Either every move is applied or none, subscribers get a single "
+        "tasks_moved event",
+    )
+    async def move_tasks(
+        board_id: int, batch: MoveTasksBatch, task_svc: TaskSvcDep
+    ) -> list[TaskView]:
+        return await task_svc.move_tasks(board_id=board_id, batch=batch)
+
+    @board_tasks_router.post(
+        "/bulk",
+        dependencies=[PermissionDep([RoleEnum.ADMIN, RoleEnum.MEMBER])],
+        status_code=200,
+        description="Create many tasks from a JSON array or an NDJSON upload "
+        f"(Content-Type: {NDJSON_MEDIA_TYPE}), each row with its column_id. \n"
+        "Rows that can not be created are reported by their index and skipped. "
+        "Uploads over the configured row limit (BULK__MAX_ROWS) get 413",
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "array",
+                            "items": BulkTaskCreate.model_json_schema(),
+                        }
+                    },
+                    NDJSON_MEDIA_TYPE: {
+                        "schema": {"type": "string", "format": "binary"}
+                    },
+                },
+            }
+        },
+    )
+    async def create_tasks(
+        board_id: int, bulk: BulkTaskRowsDep, task_svc: TaskSvcDep
+    ) -> BulkTaskResult:
+        return await task_svc.create_tasks(board_id=board_id, bulk=bulk)
+
+    return board_tasks_router
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, WebSocket, WebSocketException, status
+
+from backend.kanban.core.exceptions.exceptions import InvalidCredentialsError
+from backend.kanban.core.security.user_auth import AuthService
+from backend.kanban.dependencies.annotated_types import SettingsDep
+from backend.kanban.dependencies.auth_dep import WsAccessTokenDep
+from backend.kanban.dependencies.db_dep import SessionFactoryDep
+from backend.kanban.event_manager.board_channel import BoardChannel
+from backend.kanban.event_manager.tasks_event_manager import connection_manager
+
+
+def create_channel_router() -> APIRouter:
+    channel_router = APIRouter(tags=["Board", "Events"])
+
+    @channel_router.websocket("/ws")
+    async def board_channel(
+        websocket: WebSocket,
+        token: WsAccessTokenDep,
+        settings: SettingsDep,
+        sessions: SessionFactoryDep,
+    ) -> None:
+        """Single connection for the events of many boards. \n
+        Client sends JSON commands: subscribe / unsubscribe / move_task /
+        create_task with board_id and an optional ref, every command gets an
+        ack or error reply with the same ref. Board events arrive as
+        {"type": "event", "board_id", "id", "event", "data"}. \n
+        The socket is closed when the token expires, a board subscription
+        ends when the user is removed from the board."""
+        async with sessions() as session:
+            auth_svc = AuthService(settings, session)
+            try:
+                user = await auth_svc.get_user(token)
+                expires_at = await auth_svc.get_expiry(token)
+            except InvalidCredentialsError:
+                raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+        await websocket.accept()
+        await BoardChannel(
+            websocket, connection_manager, sessions, user, expires_at
+        ).run()
+
+    return channel_router
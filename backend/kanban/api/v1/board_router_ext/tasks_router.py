@@ -1,12 +1,12 @@
-import json
-from collections.abc import AsyncGenerator
-
-from fastapi import APIRouter, Body, Request
+from fastapi import APIRouter, Body, Header, Request, Response
 from fastapi.responses import StreamingResponse
 
+from backend.kanban.core.utility.etag import board_etag, etag_matches
 from backend.kanban.core.utility.role_enum import RoleEnum
+from backend.kanban.dependencies.annotated_types import SettingsDep
 from backend.kanban.dependencies.permission_dep import PermissionDep
 from backend.kanban.dependencies.service_dependencies.tasks_dep import TaskSvcDep
+from backend.kanban.event_manager.sse_stream import board_event_stream
 from backend.kanban.event_manager.tasks_event_manager import connection_manager
 from backend.kanban.schemas.columns_schema import ColumnGetFull
 from backend.kanban.schemas.tasks_schema import (
@@ -46,11 +46,23 @@ def create_tasks_router() -> APIRouter:
             PermissionDep([RoleEnum.ADMIN, RoleEnum.MEMBER, RoleEnum.VIEWER])
         ],
         status_code=200,
-        description="Get full info about the column",
+        description="Get full info about the column. \n"
+        "Supports If-None-Match with the ETag of the previous response",
+        response_model=ColumnGetFull,
+        responses={304: {"description": "Board has not changed"}},
     )
     async def get_tasks_for_the_column(
-        board_id: int, column_id: int, task_svc: TaskSvcDep
-    ) -> ColumnGetFull:
+        board_id: int,
+        column_id: int,
+        request: Request,
+        response: Response,
+        task_svc: TaskSvcDep,
+    ) -> ColumnGetFull | Response:
+        version = await task_svc.get_board_version(board_id=board_id)
+        etag = board_etag(board_id, version, f"c{column_id}")
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
         return await task_svc.get_column_with_tasks(
             board_id=board_id, column_id=column_id
         )
@@ -60,24 +72,24 @@ def create_tasks_router() -> APIRouter:
         dependencies=[
             PermissionDep([RoleEnum.ADMIN, RoleEnum.MEMBER, RoleEnum.VIEWER])
         ],
+        description="Server-sent board events. \n"
+        "On reconnect the events after Last-Event-ID are replayed, "
+        "resync_required is sent when they are no longer available",
     )
     async def stream_board_updates(
-        board_id: int, request: Request
+        board_id: int,
+        request: Request,
+        settings: SettingsDep,
+        last_event_id: int | None = Header(default=None, alias="Last-Event-ID"),
     ) -> StreamingResponse:
-        async def event_generator() -> AsyncGenerator:
-            queue = await connection_manager.subscribe(board_id)
-            try:
-                while True:
-                    if await request.is_disconnected():
-                        break
-                    data = await queue.get()
-                    json_data = json.dumps(data)
-                    yield f"data: {json_data}\n\n"
-            finally:
-                connection_manager.unsubscribe(board_id, queue)
-
         return StreamingResponse(
-            event_generator(),
+            board_event_stream(
+                connection_manager,
+                board_id=board_id,
+                request=request,
+                last_event_id=last_event_id,
+                heartbeat_interval=settings.events.heartbeat_interval,
+            ),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
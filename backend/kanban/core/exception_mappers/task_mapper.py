@@ -15,6 +15,9 @@ ERROR_MAP: dict[TaskErrorKeys, Callable[[], Exception]] = {
     TaskErrorKeys.CONFLICT: lambda: TaskConflict(
         "You can not add more tasks to the column"
     ),
+    TaskErrorKeys.POSITION_CONFLICT: lambda: TaskConflict(
+        "The task above must be placed before the task below"
+    ),
     TaskErrorKeys.CREATION_FAIL: lambda: TaskCreationFail("Failed to create a task"),
     TaskErrorKeys.NOT_FOUND: lambda: TaskNotFound("Task with this id is not found"),
     TaskErrorKeys.COLUMT_NOT_FOUND: lambda: ColumnNotFound(
@@ -24,3 +24,12 @@ class BoardPermissionDenied(BoardBaseException):
 
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class BoardImportInvalid(BoardBaseException):
+    status_code = 422
+    detail = "Invalid board import"
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.detail = f"{self.detail}: {message}"
@@ -32,3 +32,12 @@ class TaskCreationFail(TaskBaseException):
 
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class TaskBulkTooLarge(TaskBaseException):
+    status_code = 413
+    detail = "Too many rows in the bulk upload"
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.detail = f"{self.detail}: {message}"
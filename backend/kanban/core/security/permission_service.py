@@ -1,44 +1,130 @@
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.kanban.core.exceptions.board_exceptions import (
     BoardNotFound,
     BoardPermissionDenied,
 )
+from backend.kanban.core.exceptions.exceptions import InvalidCredentialsError
+from backend.kanban.core.security.principal_cache import principal_cache
+from backend.kanban.core.security.role_cache import role_cache
 from backend.kanban.core.utility.role_enum import RoleEnum
-from backend.kanban.models.models import BoardMembers, Boards
+from backend.kanban.models.models import BoardMembers, Boards, User
+from backend.kanban.schemas.user_schema import UserGet
+
+
+# Every board request runs one of these, so they are built once and reused.
+# See services.repositories.tasks_repo
+_USER_BOARD_ACCESS = (
+    select(
+        User.id,
+        User.email,
+        User.name,
+        Boards.id.label("board_id"),
+        Boards.owner_id,
+        BoardMembers.role,
+    )
+    .select_from(User)
+    .outerjoin(Boards, Boards.id == bindparam("board_id"))
+    .outerjoin(
+        BoardMembers,
+        and_(
+            BoardMembers.board_id == Boards.id,
+            BoardMembers.user_id == User.id,
+        ),
+    )
+    .where(User.id == bindparam("user_id"))
+)
+_BOARD_ROLE = (
+    select(Boards.owner_id, BoardMembers.role)
+    .outerjoin(
+        BoardMembers,
+        and_(
+            BoardMembers.board_id == Boards.id,
+            BoardMembers.user_id == bindparam("user_id"),
+        ),
+    )
+    .where(Boards.id == bindparam("board_id"))
+)
 
 
 class PermissionService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
+    @staticmethod
+    def _verify_role(
+        user_id: UUID,
+        owner_id: UUID | None,
+        role: RoleEnum | None,
+        required_roles: list[RoleEnum],
+    ) -> bool:
+        if owner_id == user_id:
+            return True
+        if role in required_roles:
+            return True
+        raise BoardPermissionDenied("You dont have required permission")
+
+    @staticmethod
+    def _effective_role(
+        user_id: UUID, owner_id: UUID | None, role: RoleEnum | None
+    ) -> RoleEnum | None:
+        """Owner of the board always acts as an admin"""
+        return RoleEnum.ADMIN if owner_id == user_id else role
+
     async def check_user_board_role(
         self,
         user_id: UUID,
         board_id: int,
         required_roles: list[RoleEnum],
     ) -> bool:
-        query = (
-            select(Boards.owner_id, BoardMembers.role)
-            .outerjoin(
-                BoardMembers,
-                and_(
-                    BoardMembers.board_id == Boards.id,
-                    BoardMembers.user_id == user_id,
-                ),
-            )
-            .where(Boards.id == board_id)
+        if (cached_role := await role_cache.get(board_id, user_id)) is not None:
+            return self._verify_role(user_id, None, cached_role, required_roles)
+        result = await self.session.execute(
+            _BOARD_ROLE, {"board_id": board_id, "user_id": user_id}
         )
-        result = await self.session.execute(query)
         row = result.fetchone()
         if row is None:
             raise BoardNotFound("Board with this id is not found")
         owner_id, role = row
-        if owner_id == user_id:
-            return True
-        if role in required_roles:
-            return True
-        raise BoardPermissionDenied("You dont have required permission")
+        if (effective := self._effective_role(user_id, owner_id, role)) is not None:
+            await role_cache.set(board_id, user_id, effective)
+        return self._verify_role(user_id, owner_id, role, required_roles)
+
+    async def authorize_user_on_board(
+        self,
+        user_id: UUID,
+        board_id: int,
+        required_roles: list[RoleEnum],
+    ) -> tuple[UserGet, RoleEnum | None]:
+        """Authentication and authorization in a single round trip. \n
+        Resolves the user projection together with the board owner and the
+        user's membership role, then verifies the role. With both the
+        principal and the role cached no query is issued at all.
+
+        Returns:
+            (UserGet, role of the user inside the board)
+        """
+        cached_user = principal_cache.get(user_id)
+        cached_role = await role_cache.get(board_id, user_id)
+        if cached_user is not None and cached_role is not None:
+            self._verify_role(user_id, None, cached_role, required_roles)
+            return cached_user, cached_role
+
+        result = await self.session.execute(
+            _USER_BOARD_ACCESS, {"board_id": board_id, "user_id": user_id}
+        )
+        row = result.fetchone()
+        if row is None:
+            raise InvalidCredentialsError()
+        if row.board_id is None:
+            raise BoardNotFound("Board with this id is not found")
+        user = UserGet.model_validate(row)
+        principal_cache.set(user_id, user)
+        role = self._effective_role(user_id, row.owner_id, row.role)
+        if role is not None:
+            await role_cache.set(board_id, user_id, role)
+        self._verify_role(user_id, row.owner_id, row.role, required_roles)
+        return user, role
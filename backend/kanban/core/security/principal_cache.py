@@ -0,0 +1,13 @@
+from typing import Final
+from uuid import UUID
+
+from backend.kanban.core.cache.lru_cache import LRUCache
+from backend.kanban.schemas.user_schema import UserGet
+
+
+PRINCIPAL_CACHE_SIZE: Final[int] = 10_000
+PRINCIPAL_CACHE_TTL: Final[float] = 60.0
+
+principal_cache: LRUCache[UUID, UserGet] = LRUCache(
+    maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL
+)
@@ -0,0 +1,70 @@
+from typing import Final, Protocol
+from uuid import UUID
+
+from backend.kanban.core.cache.lru_cache import LRUCache
+from backend.kanban.core.utility.role_enum import RoleEnum
+
+
+ROLE_CACHE_SIZE: Final[int] = 50_000
+ROLE_CACHE_TTL: Final[float] = 300.0
+
+MembershipKey = tuple[int, UUID]
+
+
+class RoleCacheBackend(Protocol):
+    """Storage for the (board_id, user_id) -> role mapping. \n
+    Implement this protocol to share the cache between workers
+    (f.e. on top of Redis) and plug it with role_cache.use(backend)."""
+
+    async def get(self, key: MembershipKey) -> RoleEnum | None: ...
+
+    async def set(self, key: MembershipKey, role: RoleEnum) -> None: ...
+
+    async def invalidate(self, key: MembershipKey) -> None: ...
+
+    async def invalidate_board(self, board_id: int) -> None: ...
+
+
+class InProcessRoleBackend:
+    """Default backend. Per-worker LRU with TTL, so entries changed by
+    another worker become stale for at most ROLE_CACHE_TTL seconds"""
+
+    def __init__(
+        self, maxsize: int = ROLE_CACHE_SIZE, ttl: float = ROLE_CACHE_TTL
+    ) -> None:
+        self._cache: LRUCache[MembershipKey, RoleEnum] = LRUCache(maxsize, ttl)
+
+    async def get(self, key: MembershipKey) -> RoleEnum | None:
+        return self._cache.get(key)
+
+    async def set(self, key: MembershipKey, role: RoleEnum) -> None:
+        self._cache.set(key, role)
+
+    async def invalidate(self, key: MembershipKey) -> None:
+        self._cache.invalidate(key)
+
+    async def invalidate_board(self, board_id: int) -> None:
+        self._cache.invalidate_where(lambda key: key[0] == board_id)
+
+
+class RoleCache:
+    def __init__(self, backend: RoleCacheBackend) -> None:
+        self.backend = backend
+
+    def use(self, backend: RoleCacheBackend) -> None:
+        self.backend = backend
+
+    async def get(self, board_id: int, user_id: UUID) -> RoleEnum | None:
+        return await self.backend.get((board_id, user_id))
+
+    async def set(self, board_id: int, user_id: UUID, role: RoleEnum) -> None:
+        await self.backend.set((board_id, user_id), role)
+
+    async def invalidate(self, board_id: int, user_id: UUID) -> None:
+        await self.backend.invalidate((board_id, user_id))
+
+    async def invalidate_board(self, board_id: int) -> None:
+        await self.backend.invalidate_board(board_id)
+
+
+role_cache = RoleCache(InProcessRoleBackend())
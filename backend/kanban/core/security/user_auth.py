@@ -1,11 +1,17 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
 import jwt
 from jwt import PyJWTError
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.kanban.core.exceptions.exceptions import InvalidCredentialsError
+from backend.kanban.core.security.principal_cache import principal_cache
 from backend.kanban.core.settings.settings import AppSettings
 from backend.kanban.models.models import User
 from backend.kanban.schemas.token_schema import Token
+from backend.kanban.schemas.user_schema import UserGet
 
 
 class AuthService:
@@ -23,13 +29,31 @@ class AuthService:
         except PyJWTError:
             raise credential_exception
 
-    async def get_user(self, token: str) -> User:
+    async def get_user_id(self, token: str) -> UUID:
+        """Verifies the token without touching the database"""
         credential_exception = InvalidCredentialsError()
         token_data = await self.verify_access_token(token, credential_exception)
         if token_data.sub is None:
             raise credential_exception
-        user_id = token_data.sub
-        user = await self.session.get(User, user_id)
-        if not user:
-            raise credential_exception
-        return user
+        return token_data.sub
+
+    async def get_expiry(self, token: str) -> datetime:
+        """Expiry of a valid token, for connections that outlive a request"""
+        token_data = await self.verify_access_token(token, InvalidCredentialsError())
+        return datetime.fromtimestamp(token_data.exp, tz=UTC)
+
+    def _principal_query(self, user_id: UUID) -> Select:
+        return select(User.id, User.email, User.name).where(User.id == user_id)
+
+    async def get_user(self, token: str) -> UserGet:
+        """Returns a slim projection of the user. Served from the principal
+        cache when possible, the password hash is never loaded"""
+        user_id = await self.get_user_id(token)
+        if (principal := principal_cache.get(user_id)) is not None:
+            return principal
+        result = await self.session.execute(self._principal_query(user_id))
+        if (row := result.one_or_none()) is None:
+            raise InvalidCredentialsError()
+        principal = UserGet.model_validate(row)
+        principal_cache.set(user_id, principal)
+        return principal
@@ -0,0 +1,8 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class BulkSettings(BaseSettings):
+    max_rows: int = Field(default=10_000, ge=1)
+
+    model_config = SettingsConfigDict(env_prefix="BULK__")
@@ -37,5 +37,14 @@ class SQLAlchemy(BaseSettings):
     echo_pool: bool = Field(default=False)
     pool_size: int = Field(default=5, ge=1)
     max_overflow: int = Field(default=10, ge=0)
+    query_cache_size: int = Field(
+        default=500, ge=0, description="compiled statements kept per engine"
+    )
+    prepared_statement_cache_size: int = Field(
+        default=500,
+        ge=0,
+        description="asyncpg prepared statements kept per connection, "
+        "0 disables them (for pgbouncer in transaction mode)",
+    )
 
     model_config = SettingsConfigDict(env_prefix="SQLALCHEMY__")
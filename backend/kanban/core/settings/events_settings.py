@@ -0,0 +1,26 @@
+from enum import StrEnum
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class EventsBackend(StrEnum):
+    MEMORY = "memory"
+    POSTGRES = "postgres"
+
+
+class OverflowPolicy(StrEnum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class EventsSettings(BaseSettings):
+    backend: EventsBackend = Field(default=EventsBackend.MEMORY)
+    channel: str = Field(default="kanban_board_events")
+    queue_size: int = Field(default=100, ge=1)
+    overflow_policy: OverflowPolicy = Field(default=OverflowPolicy.DROP_OLDEST)
+    replay_buffer_size: int = Field(default=256, ge=1)
+    heartbeat_interval: float = Field(default=15.0, gt=0)
+
+    model_config = SettingsConfigDict(env_prefix="EVENTS__")
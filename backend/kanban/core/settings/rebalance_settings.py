@@ -0,0 +1,11 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RebalanceSettings(BaseSettings):
+    enabled: bool = Field(default=True)
+    interval: float = Field(default=60.0, gt=0)
+    max_key_length: int = Field(default=12, ge=4)
+    batch_size: int = Field(default=100, ge=1)
+
+    model_config = SettingsConfigDict(env_prefix="REBALANCE__")
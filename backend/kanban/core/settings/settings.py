@@ -1,7 +1,11 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from backend.kanban.core.settings.bulk_settings import BulkSettings
 from backend.kanban.core.settings.db_settings import DbSettings, SQLAlchemy
+from backend.kanban.core.settings.events_settings import EventsSettings
 from backend.kanban.core.settings.log_settings import LoggingSettings
+from backend.kanban.core.settings.rebalance_settings import RebalanceSettings
 from backend.kanban.core.settings.token_settings import TokenSettings
 
 
@@ -10,6 +14,9 @@ class AppSettings(BaseSettings):
     sqlalchemy: SQLAlchemy
     token: TokenSettings
     logging: LoggingSettings
+    events: EventsSettings = Field(default_factory=EventsSettings)
+    rebalance: RebalanceSettings = Field(default_factory=RebalanceSettings)
+    bulk: BulkSettings = Field(default_factory=BulkSettings)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,10 @@
+from enum import StrEnum
+
+
+class ChangeEntity(StrEnum):
+    """Kinds of board entities tracked by the change log"""
+
+    BOARD = "board"
+    COLUMN = "column"
+    TASK = "task"
+    MEMBER = "member"
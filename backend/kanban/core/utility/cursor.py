@@ -0,0 +1,24 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque keyset cursor for the (created_at, id) ordering"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": id})
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(urlsafe_b64decode(padded))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception as exc:
+        raise ValueError("cursor.invalid") from exc
+
+
+def verify_cursor(value: str | None) -> str | None:
+    if value is not None:
+        decode_cursor(value)
+    return value
@@ -0,0 +1,13 @@
+def board_etag(board_id: int, version: int, variant: str = "") -> str:
+    """Strong ETag for the board tree at the given version"""
+    suffix = f"-{variant}" if variant else ""
+    return f'"b{board_id}.v{version}{suffix}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
@@ -3,6 +3,7 @@ from enum import StrEnum
 
 class TaskErrorKeys(StrEnum):
     CONFLICT = "Task conflict"
+    POSITION_CONFLICT = "Position conflict"
     CREATION_FAIL = "Creation failed"
     NOT_FOUND = "Task is not found"
     COLUMT_NOT_FOUND = "Column not found"
@@ -0,0 +1,42 @@
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Final
+
+from pydantic import BaseModel
+
+
+NDJSON_MEDIA_TYPE: Final[str] = "application/x-ndjson"
+
+
+def ndjson_line(kind: str, model: BaseModel) -> bytes:
+    """Frames a model as a single NDJSON record: {"type": kind, "data": {...}}"""
+    return b'{"type":"%s","data":%s}\n' % (
+        kind.encode(),
+        model.model_dump_json().encode(),
+    )
+
+
+def ndjson_chunk(kind: str, models: Iterable[BaseModel]) -> bytes:
+    return b"".join(ndjson_line(kind, model) for model in models)
+
+
+async def iter_numbered_lines(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, bytes]]:
+    """Non-empty lines of a byte stream with their 1-based line numbers,
+    without reading it whole. Empty lines are skipped but counted"""
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+    if buffer.strip():
+        yield number + 1, buffer
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Non-empty lines of a byte stream, without reading it whole"""
+    async for _, line in iter_numbered_lines(chunks):
+        yield line
@@ -0,0 +1,204 @@
+"""Variable-length base-62 ordering keys (fractional indexing).
+
+A key is an integer part followed by a fractional part. The first character
+of the integer part encodes its length: "a".."z" are non-negative integers of
+2..27 characters, "A".."Z" negative ones. Appending at either end increments
+or decrements the integer part, so keys grow only logarithmically with the
+number of appends. Inserting between two neighbours extends the fractional
+part, so there is always a key between any two distinct keys.
+
+Keys compare correctly as plain byte strings ("0" < "A" < "a"). The database
+column must therefore use a binary ("C") collation.
+"""
+
+from collections.abc import Sequence
+from typing import Final
+
+
+DIGITS: Final[str] = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE: Final[int] = len(DIGITS)
+ZERO: Final[str] = DIGITS[0]
+SMALLEST_INTEGER: Final[str] = "A" + ZERO * 26
+MAX_KEY_LENGTH: Final[int] = 255
+
+_INDEX: Final[dict[str, int]] = {digit: i for i, digit in enumerate(DIGITS)}
+
+
+def _midpoint(lower: str, upper: str | None) -> str:
+    """Fractional part strictly between lower and upper (None = 1)"""
+    if upper is not None:
+        n = 0
+        while (lower[n] if n < len(lower) else ZERO) == upper[n]:
+            n += 1
+        if n > 0:
+            return upper[:n] + _midpoint(lower[n:], upper[n:])
+    digit_lower = _INDEX[lower[0]] if lower else 0
+    digit_upper = _INDEX[upper[0]] if upper is not None else BASE
+    if digit_upper - digit_lower > 1:
+        return DIGITS[(digit_lower + digit_upper + 1) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[digit_lower] + _midpoint(lower[1:], None)
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"invalid ordering key head: {head!r}")
+
+
+def _split(key: str) -> tuple[str, str]:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"invalid ordering key: {key!r}")
+    return key[:length], key[length:]
+
+
+def _increment_integer(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        digit = _INDEX[digits[i]] + 1
+        if digit < BASE:
+            digits[i] = DIGITS[digit]
+            return head + "".join(digits)
+        digits[i] = ZERO
+    if head == "Z":
+        return "a" + ZERO
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(ZERO)
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement_integer(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        digit = _INDEX[digits[i]] - 1
+        if digit >= 0:
+            digits[i] = DIGITS[digit]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def validate_key(key: str) -> str:
+    """Raises ValueError unless key is a well-formed ordering key"""
+    if not key or any(char not in _INDEX for char in key):
+        raise ValueError(f"invalid ordering key: {key!r}")
+    if key == SMALLEST_INTEGER:
+        raise ValueError(f"invalid ordering key: {key!r}")
+    _, fraction = _split(key)
+    if fraction.endswith(ZERO):
+        raise ValueError(f"invalid ordering key: {key!r}")
+    return key
+
+
+def key_between(lower: str | None, upper: str | None) -> str:
+    """Key strictly between lower and upper. None means an open end, so
+    key_between(None, None) is the first key of an empty list."""
+    if lower is not None:
+        validate_key(lower)
+    if upper is not None:
+        validate_key(upper)
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"ordering keys out of order: {lower!r} >= {upper!r}")
+    if lower is None:
+        if upper is None:
+            return "a" + ZERO
+        integer, fraction = _split(upper)
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint("", fraction)
+        if integer < upper:
+            return integer
+        if (result := _decrement_integer(integer)) is None:
+            raise ValueError("cannot decrement the smallest ordering key")
+        return result
+    integer, fraction = _split(lower)
+    if upper is None:
+        result = _increment_integer(integer)
+        return integer + _midpoint(fraction, None) if result is None else result
+    upper_integer, upper_fraction = _split(upper)
+    if integer == upper_integer:
+        return integer + _midpoint(fraction, upper_fraction)
+    if (result := _increment_integer(integer)) is None:
+        raise ValueError("cannot increment the largest ordering key")
+    return result if result < upper else integer + _midpoint(fraction, None)
+
+
+def keys_between(lower: str | None, upper: str | None, count: int) -> list[str]:
+    """count ascending keys between lower and upper, spread evenly so that
+    a bulk insert or a renumbering does not produce long keys"""
+    if count <= 0:
+        return []
+    if count == 1:
+        return [key_between(lower, upper)]
+    if upper is None:
+        keys = [key_between(lower, None)]
+        for _ in range(count - 1):
+            keys.append(key_between(keys[-1], None))
+        return keys
+    if lower is None:
+        keys = [key_between(None, upper)]
+        for _ in range(count - 1):
+            keys.append(key_between(None, keys[-1]))
+        return keys[::-1]
+    middle = count // 2
+    key = key_between(lower, upper)
+    return [
+        *keys_between(lower, key, middle),
+        key,
+        *keys_between(key, upper, count - middle - 1),
+    ]
+
+
+def rebalance(keys: Sequence[str], max_length: int) -> dict[int, str]:
+    """New keys for the dense runs of an ascending list of keys. \n
+    A dense run is a maximal stretch of keys longer than max_length, i.e.
+    neighbours that were split so often that the gap between them is tiny.
+    Repeated keys, left by concurrent moves into the same gap, are dense too.
+    Each run is respread between the keys around it. The run is widened by
+    one neighbour on each side until the spread keys are short enough.
+    Returns {index: new key} for the keys that change."""
+    keys = list(keys)
+
+    def dense(index: int) -> bool:
+        return len(keys[index]) > max_length or (
+            index > 0 and keys[index] == keys[index - 1]
+        )
+
+    changed: dict[int, str] = {}
+    i = 0
+    while i < len(keys):
+        if not dense(i):
+            i += 1
+            continue
+        start = end = i
+        while end < len(keys) and dense(end):
+            end += 1
+        while True:
+            lower = keys[start - 1] if start > 0 else None
+            upper = keys[end] if end < len(keys) else None
+            spread = keys_between(lower, upper, end - start)
+            if max(map(len, spread)) <= max_length or (lower, upper) == (None, None):
+                break
+            start, end = max(start - 1, 0), min(end + 1, len(keys))
+        for index, key in enumerate(spread, start):
+            if keys[index] != key:
+                keys[index] = changed[index] = key
+        i = end
+    return changed
@@ -0,0 +1,26 @@
+from collections.abc import Awaitable, Callable
+from inspect import isawaitable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+AFTER_COMMIT_KEY = "after_commit_hooks"
+
+CommitHook = Callable[[], Awaitable[None] | None]
+
+
+def after_commit(session: AsyncSession, hook: CommitHook) -> None:
+    """Registers a callback that UnitOfWork runs once the current
+    transaction is committed. Hooks are discarded on rollback."""
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(hook)
+
+
+async def run_after_commit_hooks(session: AsyncSession) -> None:
+    hooks: list[CommitHook] = session.info.pop(AFTER_COMMIT_KEY, [])
+    for hook in hooks:
+        if isawaitable(result := hook()):
+            await result
+
+
+def discard_after_commit_hooks(session: AsyncSession) -> None:
+    session.info.pop(AFTER_COMMIT_KEY, None)
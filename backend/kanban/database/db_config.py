@@ -9,13 +9,21 @@ from backend.kanban.core.settings.settings import AppSettings
 
 
 def create_engine(settings: AppSettings) -> AsyncEngine:
+    connect_args: dict[str, object] = {"server_settings": {"client_encoding": "utf8"}}
+    if settings.postgres.driver == "asyncpg":
+        # prepared statements are kept per connection, keyed by their SQL.
+        # The cache has to hold every statement of the hot paths
+        connect_args["prepared_statement_cache_size"] = (
+            settings.sqlalchemy.prepared_statement_cache_size
+        )
     return create_async_engine(
         url=settings.postgres.dsn,
         echo=settings.sqlalchemy.echo,
         echo_pool=settings.sqlalchemy.echo_pool,
         pool_size=settings.sqlalchemy.pool_size,
         max_overflow=settings.sqlalchemy.max_overflow,
-        connect_args={"server_settings": {"client_encoding": "utf8"}},
+        query_cache_size=settings.sqlalchemy.query_cache_size,
+        connect_args=connect_args,
     )
 
 
@@ -1,11 +1,26 @@
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
+
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
 
 
 async def get_db(
     request: Request,
 ) -> AsyncIterator[AsyncSession]:
+    """Request-scoped session. \n
+    Resolved once per request by the FastAPI dependency cache and shared by
+    DBDep, UOWDep, AuthService and PermissionService."""
     async for session in request.app.state.db.session_generator():
         yield session
+
+
+def get_session_factory(connection: HTTPConnection) -> SessionFactory:
+    """Session factory for long-lived connections. \n
+    A WebSocket opens a short session per message instead of keeping one
+    (and its identity map) for the whole connection."""
+    return asynccontextmanager(connection.app.state.db.session_generator)
@@ -2,6 +2,10 @@ from typing import Self
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.kanban.database.commit_hooks import (
+    discard_after_commit_hooks,
+    run_after_commit_hooks,
+)
 from backend.kanban.services.repositories.board_repo import BoardRepository
 from backend.kanban.services.repositories.columns_repo import ColumnsRepo
 from backend.kanban.services.repositories.member_repo import MemberRepo
@@ -35,6 +39,8 @@ class UnitOfWork:
 
     async def commit(self) -> None:
         await self.session.commit()
+        await run_after_commit_hooks(self.session)
 
     async def rollback(self) -> None:
         await self.session.rollback()
+        discard_after_commit_hooks(self.session)
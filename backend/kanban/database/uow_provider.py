@@ -1,10 +1,13 @@
-from collections.abc import AsyncIterator
-
-from fastapi import Request
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.kanban.database.session_provider import get_db
 from backend.kanban.database.unit_of_work import UnitOfWork
 
 
-async def get_uow(request: Request) -> AsyncIterator[UnitOfWork]:
-    async for session in request.app.state.db.session_generator():
-        yield UnitOfWork(session)
+async def get_uow(session: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    """Builds the UoW on top of the request-scoped session. \n
+    FastAPI caches get_db per request, so auth, permission checks and
+    services share a single session (and a single pooled connection).
+    A coroutine, so FastAPI does not hand it to the threadpool."""
+    return UnitOfWork(session)
@@ -13,6 +13,7 @@ from backend.kanban.dependencies.states import (
     get_settings,
     get_token_svc,
 )
+from backend.kanban.schemas.board_schema import BoardReadOptions
 from backend.kanban.schemas.pagination_schema import Pagination
 from backend.kanban.services.repositories.board_repo import BoardRepository
 from backend.kanban.services.repositories.user_repo import UserRepository
@@ -50,10 +51,15 @@ PaginationDep = Annotated[
     Pagination,
     Query(),
     Doc(
-        "dependency of the Pagination. Sets limit and offset for both the request"
-        "and SQL queries"
+        "dependency of the Pagination. Sets limit and keyset cursor for both "
+        "the request and SQL queries"
     ),
 ]
+BoardReadOptionsDep = Annotated[
+    BoardReadOptions,
+    Query(),
+    Doc("dependency of the sparse fieldsets (include=, fields=) for board reads"),
+]
 BoardRepoDep = Annotated[
     BoardRepository,
     Depends(get_board_repository),
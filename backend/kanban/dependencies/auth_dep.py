@@ -1,14 +1,15 @@
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, Query, Request, WebSocket, WebSocketException, status
 from fastapi.security import APIKeyCookie, OAuth2PasswordBearer
+from fastapi.security.utils import get_authorization_scheme_param
 from typing_extensions import Doc
 
 from backend.kanban.core.exceptions.exceptions import InvalidCredentialsError
 from backend.kanban.core.security.user_auth import AuthService
 from backend.kanban.dependencies.annotated_types import SettingsDep
 from backend.kanban.dependencies.db_dep import DBDep
-from backend.kanban.models.models import User
+from backend.kanban.schemas.user_schema import UserGet
 
 
 cookie_scheme = APIKeyCookie(name="access_token", auto_error=False)
@@ -19,22 +20,70 @@ def get_auth_service(settings: SettingsDep, session: DBDep) -> AuthService:
     return AuthService(settings, session)
 
 
-async def current_user_dep(
+def get_access_token(
     request: Request,
     token_from_header: str = Depends(oauth2_scheme),
     token_from_cookie: str = Depends(cookie_scheme),
-    auth_svc: AuthService = Depends(get_auth_service),
-) -> User:
+) -> str:
     token = request.cookies.get("access_token")
     if not token:
         token = token_from_header
     if not token:
         raise InvalidCredentialsError()
-    return await auth_svc.get_user(token)
+    return token
+
+
+def get_ws_access_token(
+    websocket: WebSocket, token: str | None = Query(default=None)
+) -> str:
+    """Browsers can not set headers on the WebSocket handshake, so besides the
+    cookie and the Authorization header the token may come as ?token="""
+    scheme, header_token = get_authorization_scheme_param(
+        websocket.headers.get("authorization")
+    )
+    token = (
+        websocket.cookies.get("access_token")
+        or (header_token if scheme.lower() == "bearer" else None)
+        or token
+    )
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+    return token
+
+
+AccessTokenDep = Annotated[
+    str,
+    Depends(get_access_token),
+    Doc("Raw access token from the cookie or the Authorization header"),
+]
+WsAccessTokenDep = Annotated[
+    str,
+    Depends(get_ws_access_token),
+    Doc("Raw access token of the WebSocket handshake"),
+]
+AuthSvcDep = Annotated[
+    AuthService,
+    Depends(get_auth_service),
+    Doc("dependency of the AuthService. Depends on SettingsDep, DBDep"),
+]
+
+
+async def current_user_dep(
+    request: Request,
+    token: AccessTokenDep,
+    auth_svc: AuthSvcDep,
+) -> UserGet:
+    """Returns the user resolved earlier in the request by PermissionDep,
+    otherwise loads it from the token"""
+    if (user := getattr(request.state, "user", None)) is not None:
+        return user
+    user = await auth_svc.get_user(token)
+    request.state.user = user
+    return user
 
 
 CurrentUserDep = Annotated[
-    User,
+    UserGet,
     Depends(current_user_dep),
     Doc(
         "dependency of the AuthService to verify the current user."
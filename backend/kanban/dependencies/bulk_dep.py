@@ -0,0 +1,95 @@
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
+
+from fastapi import Depends, Request
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import Doc
+
+from backend.kanban.core.exceptions.board_exceptions import BoardImportInvalid
+from backend.kanban.core.exceptions.tasks_exception import TaskBulkTooLarge
+from backend.kanban.core.utility.ndjson import (
+    NDJSON_MEDIA_TYPE,
+    iter_lines,
+    iter_numbered_lines,
+)
+from backend.kanban.dependencies.annotated_types import SettingsDep
+from backend.kanban.schemas.board_schema import BoardExportRecord
+from backend.kanban.schemas.tasks_schema import (
+    BulkRowError,
+    BulkTaskCreate,
+    BulkTaskRows,
+)
+
+
+_records = TypeAdapter(list[dict[str, Any]])
+_export_record = TypeAdapter(BoardExportRecord)
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+        for error in exc.errors(include_url=False)
+    )
+
+
+async def get_bulk_task_rows(request: Request, settings: SettingsDep) -> BulkTaskRows:
+    """Reads a JSON array of tasks or, with Content-Type application/x-ndjson,
+    one task per line. NDJSON is parsed while it is received. Invalid rows
+    are reported by their index instead of failing the request. More than
+    bulk.max_rows rows reject the whole upload, NDJSON as soon as the row
+    past the limit arrives"""
+    max_rows = settings.bulk.max_rows
+    bulk = BulkTaskRows()
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        index = 0
+        async for line in iter_lines(request.stream()):
+            if index == max_rows:
+                raise TaskBulkTooLarge(f"at most {max_rows} rows are accepted")
+            try:
+                bulk.rows[index] = BulkTaskCreate.model_validate_json(line)
+            except ValidationError as exc:
+                bulk.errors.append(BulkRowError(row=index, detail=_describe(exc)))
+            index += 1
+        return bulk
+    records = _records.validate_json(await request.body())
+    if len(records) > max_rows:
+        raise TaskBulkTooLarge(f"at most {max_rows} rows are accepted")
+    for index, record in enumerate(records):
+        try:
+            bulk.rows[index] = BulkTaskCreate.model_validate(record)
+        except ValidationError as exc:
+            bulk.errors.append(BulkRowError(row=index, detail=_describe(exc)))
+    return bulk
+
+
+BulkTaskRowsDep = Annotated[
+    BulkTaskRows,
+    Depends(get_bulk_task_rows),
+    Doc("Rows of a bulk task upload, JSON array or NDJSON"),
+]
+
+
+async def _parse_export(
+    request: Request,
+) -> AsyncIterator[tuple[int, BoardExportRecord]]:
+    async for number, line in iter_numbered_lines(request.stream()):
+        try:
+            yield number, _export_record.validate_json(line)
+        except ValidationError as exc:
+            raise BoardImportInvalid(f"line {number}: {_describe(exc)}") from None
+
+
+def get_board_import_records(
+    request: Request,
+) -> AsyncIterator[tuple[int, BoardExportRecord]]:
+    """(line number, record) of an NDJSON board export. Lines are parsed
+    lazily while the body is received, an invalid line aborts the import
+    with its number"""
+    return _parse_export(request)
+
+
+BoardImportRecordsDep = Annotated[
+    AsyncIterator[tuple[int, BoardExportRecord]],
+    Depends(get_board_import_records),
+    Doc("Records of a board export and their lines, read while uploaded"),
+]
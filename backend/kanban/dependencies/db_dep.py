@@ -4,7 +4,11 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Doc
 
-from backend.kanban.database.session_provider import get_db
+from backend.kanban.database.session_provider import (
+    SessionFactory,
+    get_db,
+    get_session_factory,
+)
 
 
 DBDep = Annotated[
@@ -12,3 +16,8 @@ DBDep = Annotated[
     Depends(get_db),
     Doc("dependency for the database sessions. Relies on DatabaseProvider"),
 ]
+SessionFactoryDep = Annotated[
+    SessionFactory,
+    Depends(get_session_factory),
+    Doc("factory of short sessions for the WebSocket channel"),
+]
@@ -1,16 +1,25 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.params import Depends as dependencyInstance
 
 from backend.kanban.core.security.permission_service import PermissionService
 from backend.kanban.core.utility.role_enum import RoleEnum
-from backend.kanban.dependencies.auth_dep import CurrentUserDep
+from backend.kanban.dependencies.auth_dep import (
+    AccessTokenDep,
+    AuthSvcDep,
+    CurrentUserDep,
+)
 from backend.kanban.dependencies.db_dep import DBDep
 
 
+__all__ = ["CurrentUserDep", "PermissionDep"]
+
+
 def PermissionDep(required_roles: list[RoleEnum] | RoleEnum) -> dependencyInstance:
     """
     Permission dependency for the requests, related to the endpoints. \n
     Manages BoardMembers table. Checks the of the user inside the table.
+    The user and their role are resolved in one query and cached on
+    request.state, so CurrentUserDep inside the same request is free.
     It is managed inside the router like this : \n
     @router.put("/", dependencies=[PermissionDep(RoleEnum.ADMIN)])
     """
@@ -18,12 +27,19 @@ def PermissionDep(required_roles: list[RoleEnum] | RoleEnum) -> dependencyInstan
         required_roles = [required_roles]
 
     async def permission_checker(
-        board_id: int, user: CurrentUserDep, session: DBDep
+        board_id: int,
+        request: Request,
+        token: AccessTokenDep,
+        auth_svc: AuthSvcDep,
+        session: DBDep,
     ) -> bool:
+        user_id = await auth_svc.get_user_id(token)
         permission_service = PermissionService(session)
-        await permission_service.check_user_board_role(
-            user.id, board_id, required_roles
+        user, role = await permission_service.authorize_user_on_board(
+            user_id, board_id, required_roles
         )
+        request.state.user = user
+        request.state.board_role = role
         return True
 
     return Depends(permission_checker)
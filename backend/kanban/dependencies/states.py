@@ -1,12 +1,13 @@
 from fastapi import Request
+from starlette.requests import HTTPConnection
 
 from backend.kanban.core.security.password_hasher import PasswordHasher
 from backend.kanban.core.security.token_svc import TokenSvc
 from backend.kanban.core.settings.settings import AppSettings
 
 
-def get_settings(request: Request) -> AppSettings:
-    return request.app.state.settings
+def get_settings(connection: HTTPConnection) -> AppSettings:
+    return connection.app.state.settings
 
 
 def get_hasher(request: Request) -> PasswordHasher:
@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime
+from typing import Any, Final
+
+from fastapi import WebSocket, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.core.security.permission_service import PermissionService
+from backend.kanban.core.utility.role_enum import RoleEnum
+from backend.kanban.database.session_provider import SessionFactory
+from backend.kanban.database.unit_of_work import UnitOfWork
+from backend.kanban.event_manager.sse_frame import SseFrame
+from backend.kanban.event_manager.tasks_event_manager import (
+    SUBSCRIPTION_CLOSED,
+    ConnectionManager,
+)
+from backend.kanban.schemas.user_schema import UserGet
+from backend.kanban.schemas.ws_schema import (
+    WsCommand,
+    WsCreateTask,
+    WsMoveTask,
+    WsReply,
+    WsSubscribe,
+    WsUnsubscribe,
+    ws_command_adapter,
+)
+from backend.kanban.services.services.tasks_service import TasksService
+
+
+logger = logging.getLogger(__name__)
+
+READ_ROLES: Final[list[RoleEnum]] = [RoleEnum.ADMIN, RoleEnum.MEMBER, RoleEnum.VIEWER]
+WRITE_ROLES: Final[list[RoleEnum]] = [RoleEnum.ADMIN, RoleEnum.MEMBER]
+
+
+class BoardChannel:
+    """One multiplexed WebSocket connection of an authenticated user. \n
+    Every subscribed board feeds the same bounded ConnectionManager queue
+    and a single writer forwards the shared frames. Commands are handled one
+    by one, each in its own short session, so an idle connection never holds
+    a database connection. Access is re-checked while the socket lives: it
+    is closed when the token expires, and a board is dropped once the user
+    is removed from it or it is deleted."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        manager: ConnectionManager,
+        sessions: SessionFactory,
+        user: UserGet,
+        expires_at: datetime | None = None,
+    ) -> None:
+        self.websocket = websocket
+        self.manager = manager
+        self.sessions = sessions
+        self.user = user
+        self.expires_at = expires_at
+        self.queue = manager.create_queue()
+        self.boards: set[int] = set()
+        self._send_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        """Runs the command reader and the event writer until either ends.
+        A failing writer closes the socket instead of leaving the reader
+        to serve commands without events."""
+        reader = asyncio.ensure_future(self._read())
+        writer = asyncio.ensure_future(self._forward())
+        tasks = {reader, writer}
+        if self.expires_at is not None:
+            tasks.add(asyncio.ensure_future(self._expire(self.expires_at)))
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if (exc := task.exception()) is not None:
+                    logger.warning(
+                        "WebSocket channel of user %s failed: %r", self.user.id, exc
+                    )
+                    await self._close(status.WS_1011_INTERNAL_ERROR)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for board_id in self.boards:
+                await self.manager.unsubscribe(board_id, self.queue)
+            self.boards.clear()
+
+    async def _read(self) -> None:
+        async for raw in self.websocket.iter_text():
+            reply = await self._handle(raw)
+            await self._send(reply.model_dump_json(exclude_none=True))
+
+    async def _send(self, text: str) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(text)
+
+    async def _close(self, code: int, reason: str | None = None) -> None:
+        """Closes the socket, which may already be gone"""
+        async with self._send_lock:
+            with contextlib.suppress(Exception):
+                await self.websocket.close(code=code, reason=reason)
+
+    async def _expire(self, expires_at: datetime) -> None:
+        delay = (expires_at - datetime.now(tz=UTC)).total_seconds()
+        await asyncio.sleep(max(delay, 0))
+        await self._close(status.WS_1008_POLICY_VIOLATION, "token expired")
+
+    async def _forward(self) -> None:
+        while True:
+            frame = await self.queue.get()
+            if frame.board_id is not None and frame.board_id not in self.boards:
+                continue  # queued before an unsubscribe or a revoked access
+            await self._send(frame.text)
+            if frame is SUBSCRIPTION_CLOSED:
+                await self._close(status.WS_1013_TRY_AGAIN_LATER)
+                return
+            if frame.board_id is not None and self._revokes_access(frame):
+                await self.manager.unsubscribe(frame.board_id, self.queue)
+                self.boards.discard(frame.board_id)
+
+    def _revokes_access(self, frame: SseFrame) -> bool:
+        """The board is deleted or the user is no longer its member"""
+        if frame.event == "board_deleted":
+            return True
+        data = frame.message.get("data") or {}
+        return frame.event == "member_removed" and data.get("user_id") == str(
+            self.user.id
+        )
+
+    async def _handle(self, raw: str) -> WsReply:
+        try:
+            command = ws_command_adapter.validate_json(raw)
+        except ValidationError as exc:
+            return WsReply(
+                type="error",
+                status_code=422,
+                detail=exc.errors(
+                    include_url=False, include_context=False, include_input=False
+                ),
+            )
+        reply = WsReply(type="ack", action=command.action, ref=command.ref)
+        reply.board_id = command.board_id
+        try:
+            async with self.sessions() as session:
+                reply.data = await self._dispatch(session, command)
+        except Exception as exc:
+            reply.type = "error"
+            reply.status_code = getattr(exc, "status_code", 500)
+            reply.detail = getattr(exc, "detail", exc.__class__.__name__)
+            if reply.status_code == 500:
+                logger.exception("WebSocket command %s failed", command.action)
+        return reply
+
+    async def _dispatch(
+        self, session: AsyncSession, command: WsCommand
+    ) -> dict[str, Any] | None:
+        match command:
+            case WsSubscribe(board_id=board_id):
+                await self._authorize(session, board_id, READ_ROLES)
+                await self.manager.subscribe(board_id, self.queue)
+                self.boards.add(board_id)
+            case WsUnsubscribe(board_id=board_id):
+                if board_id in self.boards:
+                    await self.manager.unsubscribe(board_id, self.queue)
+                    self.boards.discard(board_id)
+            case WsMoveTask():
+                await self._authorize(session, command.board_id, WRITE_ROLES)
+                task = await TasksService(UnitOfWork(session)).move_task(
+                    board_id=command.board_id,
+                    task_id=command.task_id,
+                    move_data=command.data,
+                )
+                return task.model_dump(mode="json")
+            case WsCreateTask():
+                await self._authorize(session, command.board_id, WRITE_ROLES)
+                task = await TasksService(UnitOfWork(session)).create_task(
+                    board_id=command.board_id,
+                    column_id=command.column_id,
+                    task_data=command.data,
+                    email=command.email,
+                )
+                return task.model_dump(mode="json")
+        return None
+
+    async def _authorize(
+        self, session: AsyncSession, board_id: int, roles: list[RoleEnum]
+    ) -> None:
+        await PermissionService(session).authorize_user_on_board(
+            self.user.id, board_id, roles
+        )
@@ -0,0 +1,59 @@
+import logging
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.database.commit_hooks import AFTER_COMMIT_KEY, after_commit
+from backend.kanban.event_manager.tasks_event_manager import (
+    ConnectionManager,
+    connection_manager,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventOutbox:
+    """Board events recorded by one transaction. \n
+    Registered as an after-commit hook, so the events are published only
+    once UnitOfWork.commit succeeded, one batch per board, and are dropped
+    together with the other hooks on rollback."""
+
+    def __init__(self, manager: ConnectionManager) -> None:
+        self.manager = manager
+        self.events: dict[int, list[dict[str, Any]]] = {}
+
+    def add(self, board_id: int, message: dict[str, Any]) -> None:
+        self.events.setdefault(board_id, []).append(message)
+
+    async def __call__(self) -> None:
+        for board_id, messages in self.events.items():
+            try:
+                await self.manager.broadcast_many(board_id, messages)
+            except Exception:
+                # The transaction is already committed, clients resync
+                # through Last-Event-ID or the board ETag
+                logger.exception(f"Failed to publish events of board {board_id}")
+
+
+def _session_outbox(session: AsyncSession) -> EventOutbox:
+    for hook in session.info.get(AFTER_COMMIT_KEY, ()):
+        if isinstance(hook, EventOutbox):
+            return hook
+    outbox = EventOutbox(connection_manager)
+    after_commit(session, outbox)
+    return outbox
+
+
+def record_event(
+    session: AsyncSession,
+    board_id: int,
+    event: str,
+    data: dict[str, Any],
+    version: int | None = None,
+) -> None:
+    """Queues a board event in the current transaction. The board version
+    produced by the change is used as the event id"""
+    _session_outbox(session).add(
+        board_id, {"id": version, "event": event, "data": data}
+    )
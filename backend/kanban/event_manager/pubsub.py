@@ -0,0 +1,177 @@
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from functools import partial
+from typing import Any, Final, Protocol
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[int, list[dict[str, Any]]], None]
+
+RECONNECT_DELAY: Final[float] = 1.0
+MAX_RECONNECT_DELAY: Final[float] = 30.0
+MAX_NOTIFY_PAYLOAD: Final[int] = 7900
+
+
+class PubSubBackend(Protocol):
+    """Transport between the workers. Every published batch is handed to
+    deliver(board_id, messages) in each worker that started the backend."""
+
+    async def start(self, deliver: Deliver) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def publish(self, board_id: int, messages: list[dict[str, Any]]) -> None: ...
+
+
+class InMemoryPubSub:
+    """Single process default. Publishing delivers straight to local queues"""
+
+    def __init__(self) -> None:
+        self._deliver: Deliver | None = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, board_id: int, messages: list[dict[str, Any]]) -> None:
+        if self._deliver is not None:
+            self._deliver(board_id, messages)
+
+
+class PostgresPubSub:
+    """LISTEN/NOTIFY transport. \n
+    Each worker keeps one dedicated listener connection and multiplexes
+    notifications to its local subscribers. Messages are published through
+    the regular engine pool. NOTIFY payloads are limited to 8000 bytes, a
+    larger batch is split into several notifications sent in one
+    transaction."""
+
+    def __init__(self, engine: AsyncEngine, channel: str) -> None:
+        self.engine = engine
+        self.channel = channel
+        self._dsn = (
+            make_url(engine.url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._deliver: Deliver | None = None
+        self._listener: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopping = False
+
+    @staticmethod
+    def encode(board_id: int, messages: list[dict[str, Any]]) -> str:
+        return json.dumps({"board_id": board_id, "messages": messages})
+
+    @staticmethod
+    def decode(payload: str) -> tuple[int, list[dict[str, Any]]]:
+        data = json.loads(payload)
+        return int(data["board_id"]), list(data["messages"])
+
+    @classmethod
+    def fit(cls, board_id: int, message: dict[str, Any]) -> dict[str, Any]:
+        """The message, or a resync_required notice under the same id when the
+        message alone exceeds the NOTIFY limit. Clients refetch the board
+        instead of missing the event."""
+        if len(cls.encode(board_id, [message])) <= MAX_NOTIFY_PAYLOAD:
+            return message
+        logger.warning(
+            f"Board {board_id} event {message.get('event')} exceeds the NOTIFY "
+            "limit, sending resync_required instead"
+        )
+        return {
+            "id": message.get("id"),
+            "event": "resync_required",
+            "data": {"board_id": board_id, "event": message.get("event")},
+        }
+
+    @classmethod
+    def encode_chunks(cls, board_id: int, messages: list[dict[str, Any]]) -> list[str]:
+        """Greedily packs messages into payloads below the NOTIFY limit.
+        An oversized message is replaced, so it can not fail the whole batch"""
+        payloads: list[str] = []
+        chunk: list[dict[str, Any]] = []
+        for message in map(partial(cls.fit, board_id), messages):
+            if (
+                chunk
+                and len(cls.encode(board_id, [*chunk, message])) > MAX_NOTIFY_PAYLOAD
+            ):
+                payloads.append(cls.encode(board_id, chunk))
+                chunk = []
+            chunk.append(message)
+        if chunk:
+            payloads.append(cls.encode(board_id, chunk))
+        return payloads
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self._stopping = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._listener is not None and not self._listener.is_closed():
+            await self._listener.remove_listener(self.channel, self._on_notify)
+            await self._listener.close()
+        self._listener = None
+
+    async def publish(self, board_id: int, messages: list[dict[str, Any]]) -> None:
+        async with self.engine.begin() as conn:
+            for payload in self.encode_chunks(board_id, messages):
+                await conn.execute(select(func.pg_notify(self.channel, payload)))
+
+    async def _connect(self) -> None:
+        self._listener = await asyncpg.connect(self._dsn)
+        self._listener.add_termination_listener(self._on_terminate)
+        await self._listener.add_listener(self.channel, self._on_notify)
+        logger.info(f"Listening for board events on {self.channel}")
+
+    def _on_notify(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        if self._deliver is None:
+            return
+        try:
+            board_id, messages = self.decode(payload)
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.error(f"Malformed board event payload {payload!r}: {exc}")
+            return
+        self._deliver(board_id, messages)
+
+    def _on_terminate(self, connection: asyncpg.Connection) -> None:
+        if self._stopping:
+            return
+        logger.warning("Board events listener connection lost, reconnecting")
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = RECONNECT_DELAY
+        while not self._stopping:
+            try:
+                await self._connect()
+                return
+            except Exception as exc:
+                # any failure (timeouts, InterfaceError) is retried, giving up
+                # would leave this worker without cross-worker events
+                logger.error(f"Board events listener reconnect failed: {exc!r}")
+                await self._close_listener()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _close_listener(self) -> None:
+        """Drops a connection left half set up by a failed _connect"""
+        listener, self._listener = self._listener, None
+        if listener is not None and not listener.is_closed():
+            listener.terminate()
@@ -0,0 +1,45 @@
+from bisect import insort
+from collections import deque
+
+from backend.kanban.event_manager.sse_frame import SseFrame
+
+
+def _id(frame: SseFrame) -> int:
+    return frame.message["id"]
+
+
+class ReplayBuffer:
+    """Ring buffer of the latest sequenced events of one board, sorted by
+    id. \n
+    Sequence numbers are board versions, so they grow but are not dense.
+    floor is the highest id that may be missing: every event with a
+    greater id is still in the buffer. Transactions publish independently,
+    so a version can arrive after a newer one. A client that saw the newer
+    one live and left before the late one arrived has a Last-Event-ID above
+    it. Such ids are kept in late as (late id, newest id) ranges and get a
+    resync instead of a replay."""
+
+    def __init__(self, size: int, first_id: int) -> None:
+        self.frames: deque[SseFrame] = deque(maxlen=size)
+        self.floor = first_id - 1
+        self.late: list[tuple[int, int]] = []
+
+    def append(self, frame: SseFrame) -> None:
+        newest = _id(self.frames[-1]) if self.frames else self.floor
+        if _id(frame) < newest:
+            self.late.append((_id(frame), newest))
+        if len(self.frames) == self.frames.maxlen:
+            self.floor = max(self.floor, _id(self.frames.popleft()))
+            # ids in older ranges are below the floor, which resyncs anyway
+            self.late = [(low, high) for low, high in self.late if high >= self.floor]
+        if _id(frame) > self.floor:
+            insort(self.frames, frame, key=_id)
+
+    def since(self, last_event_id: int) -> list[SseFrame] | None:
+        """Events after last_event_id, None when some of them were evicted
+        or may have arrived after the client's last event"""
+        if last_event_id < self.floor or any(
+            low < last_event_id <= high for low, high in self.late
+        ):
+            return None
+        return [frame for frame in self.frames if _id(frame) > last_event_id]
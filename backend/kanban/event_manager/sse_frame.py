@@ -0,0 +1,57 @@
+import json
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def coalesce_key(message: dict[str, Any], board_id: int | None = None) -> Hashable:
+    """Events about the same entity of the same board replace each other when
+    coalescing. A WebSocket queue holds the events of several boards, so the
+    board is part of the key. Events without an entity id are never merged."""
+    data = message.get("data") or {}
+    for name in ("task_id", "column_id", "user_id"):
+        if name in data:
+            return board_id, message.get("event"), name, data[name]
+    return id(message)
+
+
+@dataclass(frozen=True, slots=True)
+class SseFrame:
+    """Board event encoded once per worker. \n
+    The same instance is put into every subscriber queue, SSE streams write
+    payload and WebSocket channels send text as is."""
+
+    message: dict[str, Any]
+    payload: bytes
+    text: str
+    key: Hashable = field(compare=False)
+    board_id: int | None = None
+
+    @property
+    def event(self) -> str:
+        return self.message.get("event", "message")
+
+
+def encode_frame(message: dict[str, Any], board_id: int | None = None) -> SseFrame:
+    """Frames {"id"?, "event", "data"} as a single SSE event and as a
+    WebSocket text message. The data is serialized once for both.
+    json.dumps escapes newlines, so data always fits on one line."""
+    event = message.get("event", "message")
+    data = json.dumps(message.get("data"), separators=(",", ":"))
+    lines = []
+    if message.get("id") is not None:
+        lines.append(b"id: %d\n" % message["id"])
+    lines.append(b"event: %s\n" % event.encode())
+    lines.append(b"data: %s\n\n" % data.encode())
+    text = (
+        f'{{"type":"event","board_id":{json.dumps(board_id)},'
+        f'"id":{json.dumps(message.get("id"))},"event":{json.dumps(event)},'
+        f'"data":{data}}}'
+    )
+    return SseFrame(
+        message=message,
+        payload=b"".join(lines),
+        text=text,
+        key=coalesce_key(message, board_id),
+        board_id=board_id,
+    )
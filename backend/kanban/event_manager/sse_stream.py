@@ -0,0 +1,62 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Final
+
+from fastapi import Request
+
+from backend.kanban.event_manager.tasks_event_manager import (
+    SUBSCRIPTION_CLOSED,
+    ConnectionManager,
+)
+
+
+HEARTBEAT: Final[bytes] = b": keep-alive\n\n"
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def board_event_stream(
+    manager: ConnectionManager,
+    board_id: int,
+    request: Request,
+    last_event_id: int | None,
+    heartbeat_interval: float,
+) -> AsyncGenerator[bytes]:
+    """SSE body of one subscriber. \n
+    Waiting for the next event races the client disconnect, so a closed
+    connection is released at once instead of on the next event. A comment
+    line is sent after heartbeat_interval of silence to keep proxies from
+    closing the stream and to surface dead connections on write.
+    The subscription is released in finally without suspending, so it also
+    runs when the generator is cancelled or closed."""
+    queue = await manager.subscribe(board_id)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(request))
+    next_frame: asyncio.Future | None = None
+    try:
+        if last_event_id is not None:
+            for frame in manager.replay(board_id, last_event_id):
+                yield frame.payload
+        while not disconnected.done():
+            if next_frame is None:
+                next_frame = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {next_frame, disconnected},
+                timeout=heartbeat_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if next_frame not in done:
+                if not done:
+                    yield HEARTBEAT
+                continue
+            frame, next_frame = next_frame.result(), None
+            yield frame.payload
+            if frame is SUBSCRIPTION_CLOSED:
+                break
+    finally:
+        disconnected.cancel()
+        if next_frame is not None:
+            next_frame.cancel()
+        await manager.unsubscribe(board_id, queue)
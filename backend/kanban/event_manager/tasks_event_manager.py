@@ -1,13 +1,82 @@
-from asyncio import Queue
-from typing import Any
+from asyncio import Queue, QueueEmpty, QueueFull
+from collections import Counter
+from collections.abc import Hashable
+from typing import Any, Final
+
+from backend.kanban.core.cache.lru_cache import LRUCache
+from backend.kanban.core.settings.events_settings import OverflowPolicy
+from backend.kanban.event_manager.pubsub import InMemoryPubSub, PubSubBackend
+from backend.kanban.event_manager.replay_buffer import ReplayBuffer
+from backend.kanban.event_manager.sse_frame import SseFrame, encode_frame
+from backend.kanban.schemas.events_schema import BoardEventStats
+
+
+DEFAULT_QUEUE_SIZE: Final[int] = 100
+DEFAULT_REPLAY_SIZE: Final[int] = 256
+REPLAY_BOARDS: Final[int] = 10_000
+REPLAY_TTL: Final[float] = 3600
+
+SUBSCRIPTION_CLOSED: Final[SseFrame] = encode_frame(
+    {"event": "subscription_closed", "data": {"reason": "slow consumer"}}
+)
 
 
 class ConnectionManager:
-    def __init__(self) -> None:
+    """Local SSE subscribers of this worker. \n
+    Broadcasts go through the pub/sub backend, which delivers them back to
+    every worker (including this one) via _deliver, where each event is
+    encoded once into an SseFrame shared by all local queues. Subscriber
+    queues are bounded, a full queue is handled according to the overflow
+    policy. Events with an id are also kept in a per-board replay buffer
+    so reconnecting clients can catch up from Last-Event-ID."""
+
+    def __init__(
+        self,
+        backend: PubSubBackend | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        replay_size: int = DEFAULT_REPLAY_SIZE,
+    ) -> None:
         self.active_connection: dict[int, set[Queue]] = {}
+        self.backend: PubSubBackend = backend or InMemoryPubSub()
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.replay_size = replay_size
+        self.history: LRUCache[int, ReplayBuffer] = LRUCache(
+            maxsize=REPLAY_BOARDS, ttl=REPLAY_TTL
+        )
+        self.dropped: Counter[int] = Counter()
+        self._started = False
+
+    def use(self, backend: PubSubBackend) -> None:
+        """Swaps the backend. Should be called before start()"""
+        self.backend = backend
+        self._started = False
 
-    async def subscribe(self, board_id: int) -> Queue:
-        queue: Queue = Queue()
+    def configure(
+        self, queue_size: int, overflow_policy: OverflowPolicy, replay_size: int
+    ) -> None:
+        """Applies to the subscriptions and replay buffers created afterwards"""
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.replay_size = replay_size
+
+    async def start(self) -> None:
+        await self.backend.start(self._deliver)
+        self._started = True
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+        self._started = False
+
+    def create_queue(self) -> Queue:
+        return Queue(maxsize=self.queue_size)
+
+    async def subscribe(self, board_id: int, queue: Queue | None = None) -> Queue:
+        """Registers a new queue, or an existing one when a single consumer
+        follows several boards (WebSocket channel)"""
+        if queue is None:
+            queue = self.create_queue()
         if board_id not in self.active_connection:
             self.active_connection[board_id] = set()
         self.active_connection[board_id].add(queue)
@@ -15,14 +84,134 @@ class ConnectionManager:
 
     async def unsubscribe(self, board_id: int, queue: Queue) -> None:
         if board_id in self.active_connection:
-            self.active_connection[board_id].remove(queue)
+            self.active_connection[board_id].discard(queue)
             if not self.active_connection[board_id]:
                 del self.active_connection[board_id]
 
     async def broadcast(self, board_id: int, message: dict[str, Any]) -> None:
-        if board_id in self.active_connection:
-            for queue in self.active_connection[board_id]:
-                await queue.put(message)
+        await self.broadcast_many(board_id, [message])
+
+    async def broadcast_many(
+        self, board_id: int, messages: list[dict[str, Any]]
+    ) -> None:
+        """Publishes the events of one transaction as a single batch"""
+        if not self._started:
+            await self.start()
+        await self.backend.publish(board_id, messages)
+
+    def replay(self, board_id: int, last_event_id: int) -> list[SseFrame]:
+        """Frames missed since last_event_id.
+
+        Call right after subscribe() without awaiting in between, so no event
+        is delivered to both the queue and the replay. When the missed events
+        are no longer buffered a single resync_required frame is returned and
+        the client should refetch the board."""
+        buffer = self.history.get(board_id)
+        frames = buffer.since(last_event_id) if buffer is not None else None
+        if frames is None:
+            return [
+                encode_frame(
+                    {
+                        "event": "resync_required",
+                        "data": {"board_id": board_id, "last_event_id": last_event_id},
+                    },
+                    board_id,
+                )
+            ]
+        return frames
+
+    def stats(self, board_id: int) -> BoardEventStats:
+        return BoardEventStats(
+            board_id=board_id,
+            subscribers=len(self.active_connection.get(board_id, ())),
+            dropped=self.dropped[board_id],
+        )
+
+    def _deliver(self, board_id: int, messages: list[dict[str, Any]]) -> None:
+        for message in messages:
+            self._deliver_one(board_id, message)
+
+    def _deliver_one(self, board_id: int, message: dict[str, Any]) -> None:
+        """Never awaits, so one slow subscriber can not stall the others"""
+        queues = self.active_connection.get(board_id)
+        if message.get("id") is None and not queues:
+            return
+        frame = encode_frame(message, board_id)
+        if message.get("id") is not None:
+            self._remember(board_id, frame)
+        for queue in list(queues or ()):
+            try:
+                queue.put_nowait(frame)
+            except QueueFull:
+                self._overflow(board_id, queue, frame)
+
+    def _remember(self, board_id: int, frame: SseFrame) -> None:
+        buffer = self.history.get(board_id)
+        if buffer is None:
+            buffer = ReplayBuffer(self.replay_size, frame.message["id"])
+        buffer.append(frame)
+        self.history.set(board_id, buffer)
+
+    def _overflow(self, board_id: int, queue: Queue, frame: SseFrame) -> None:
+        match self.overflow_policy:
+            case OverflowPolicy.DROP_OLDEST:
+                self._count_dropped(board_id, self._drain(queue, 1))
+                queue.put_nowait(frame)
+            case OverflowPolicy.COALESCE:
+                self._coalesce(board_id, queue, frame)
+            case OverflowPolicy.DISCONNECT:
+                self._count_dropped(
+                    board_id, [*self._drain(queue, queue.qsize()), frame]
+                )
+                queue.put_nowait(SUBSCRIPTION_CLOSED)
+                self.active_connection[board_id].discard(queue)
+                if not self.active_connection[board_id]:
+                    del self.active_connection[board_id]
+
+    def _coalesce(self, board_id: int, queue: Queue, frame: SseFrame) -> None:
+        """Keeps only the latest pending event per entity. Falls back to
+        dropping the oldest events when that is not enough"""
+        frames = [*self._drain_items(queue), frame]
+        pending: dict[Hashable, SseFrame] = {}
+        for queued in frames:
+            pending.pop(queued.key, None)
+            pending[queued.key] = queued
+        merged = list(pending.values())
+        kept = merged[max(len(merged) - self.queue_size, 0) :]
+        kept_ids = {id(queued) for queued in kept}
+        self._count_dropped(
+            board_id, [queued for queued in frames if id(queued) not in kept_ids]
+        )
+        for queued in kept:
+            queue.put_nowait(queued)
+
+    def _count_dropped(self, board_id: int, frames: list[SseFrame]) -> None:
+        """Counts each dropped frame against its own board, a WebSocket queue
+        holds the frames of several boards. board_id is the fallback for
+        frames without one"""
+        for frame in frames:
+            self.dropped[
+                frame.board_id if frame.board_id is not None else board_id
+            ] += 1
+
+    @staticmethod
+    def _drain(queue: Queue, count: int) -> list[SseFrame]:
+        drained: list[SseFrame] = []
+        for _ in range(count):
+            try:
+                drained.append(queue.get_nowait())
+            except QueueEmpty:
+                break
+        return drained
+
+    @staticmethod
+    def _drain_items(queue: Queue) -> list[SseFrame]:
+        items: list[SseFrame] = []
+        while True:
+            try:
+                items.append(queue.get_nowait())
+            except QueueEmpty:
+                return items
 
 
 connection_manager = ConnectionManager()
@@ -8,10 +8,13 @@ from fastapi.responses import JSONResponse
 from backend.kanban.api.routers import create_api_router
 from backend.kanban.core.security.password_hasher import get_hasher
 from backend.kanban.core.security.token_svc import get_token_svc
+from backend.kanban.core.settings.events_settings import EventsBackend
 from backend.kanban.core.settings.log_settings import configure_logging
 from backend.kanban.core.settings.settings import get_settings
 from backend.kanban.database.database_provider import DatabaseProvider
 from backend.kanban.database.db_config import init_db
+from backend.kanban.event_manager.pubsub import PostgresPubSub
+from backend.kanban.event_manager.tasks_event_manager import connection_manager
 from backend.kanban.exceptions_handlers.base_exception_handler import (
     base_exception_handler,
 )
@@ -36,6 +39,7 @@ from backend.kanban.exceptions_handlers.tasks_exception_handler import (
 from backend.kanban.exceptions_handlers.user_handler import (
     user_exception_handler,
 )
+from backend.kanban.services.position_rebalancer import PositionRebalancer
 
 
 logger = logging.getLogger(__name__)
@@ -81,6 +85,24 @@ async def lifespan(app: FastAPI) -> AsyncIterator:
     app.state.settings = settings
     app.state.hasher = pass_hasher
     app.state.token = token_svc
+    if settings.events.backend == EventsBackend.POSTGRES:
+        connection_manager.use(PostgresPubSub(engine, settings.events.channel))
+    connection_manager.configure(
+        queue_size=settings.events.queue_size,
+        overflow_policy=settings.events.overflow_policy,
+        replay_size=settings.events.replay_buffer_size,
+    )
+    await connection_manager.start()
+    rebalancer = PositionRebalancer(
+        async_session_maker,
+        max_key_length=settings.rebalance.max_key_length,
+        interval=settings.rebalance.interval,
+        batch_size=settings.rebalance.batch_size,
+    )
+    if settings.rebalance.enabled:
+        await rebalancer.start()
     yield
 
+    await rebalancer.stop()
+    await connection_manager.stop()
     await engine.dispose()
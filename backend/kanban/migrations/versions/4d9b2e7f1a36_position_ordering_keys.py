@@ -0,0 +1,122 @@
+"""position ordering keys
+
+Revision ID: 4d9b2e7f1a36
+Revises: e2a8f6c41b07
+Create Date: 2026-10-18 17:02:51.830417
+
+"""
+
+from collections.abc import Sequence
+from itertools import groupby
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d9b2e7f1a36"
+down_revision: str | Sequence[str] | None = "e2a8f6c41b07"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH = 1000
+# (table, ordering scope)
+SCOPES = (("tasks", "column_id"), ("columns", "board_id"))
+# frozen copy of the ordering key format, the migration must not change with
+# backend.kanban.core.utility.ordering_key
+MAX_KEY_LENGTH = 255
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def _sequential_keys(count: int) -> list[str]:
+    """count consecutive integer keys "a0", "a1", ..., "az", "b00", ... The
+    head letter gives the number of digits, so the keys sort as strings."""
+    keys = []
+    head, width, value = "a", 1, 0
+    while len(keys) < count:
+        if value == len(DIGITS) ** width:
+            head, width, value = chr(ord(head) + 1), width + 1, 0
+        digits, rest = "", value
+        for _ in range(width):
+            rest, digit = divmod(rest, len(DIGITS))
+            digits = DIGITS[digit] + digits
+        keys.append(head + digits)
+        value += 1
+    return keys
+
+
+def _backfill_keys(table: str, scope: str) -> None:
+    """Replaces the decimals by sequential keys, keeping the current order.
+    Rows with colliding decimals are ordered by id."""
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(f"SELECT id, {scope} FROM {table} ORDER BY {scope}, position, id")
+    ).all()
+    update = sa.text(f"UPDATE {table} SET position_key = :key WHERE id = :id")
+    params = []
+    for _, group in groupby(rows, key=lambda row: row[1]):
+        ids = [row[0] for row in group]
+        params.extend(
+            {"id": id, "key": key} for id, key in zip(ids, _sequential_keys(len(ids)))
+        )
+    for start in range(0, len(params), BATCH):
+        bind.execute(update, params[start : start + BATCH])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_tasks_column_id_position", table_name="tasks")
+    op.drop_constraint("uq_column_position_per_board", "columns", type_="unique")
+    for table, scope in SCOPES:
+        op.add_column(
+            table,
+            sa.Column(
+                "position_key",
+                sa.String(MAX_KEY_LENGTH, collation="C"),
+                nullable=True,
+            ),
+        )
+        _backfill_keys(table, scope)
+        op.drop_column(table, "position")
+        op.alter_column(
+            table, "position_key", new_column_name="position", nullable=False
+        )
+    op.create_unique_constraint(
+        "uq_column_position_per_board", "columns", ["board_id", "position"]
+    )
+    op.create_index(
+        "ix_tasks_column_id_position",
+        "tasks",
+        ["column_id", "position"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_column_id_position", table_name="tasks")
+    op.drop_constraint("uq_column_position_per_board", "columns", type_="unique")
+    for table, scope in SCOPES:
+        op.add_column(
+            table,
+            sa.Column("position_decimal", sa.DECIMAL(10, 2), nullable=True),
+        )
+        op.execute(
+            f"UPDATE {table} SET position_decimal = ranked.rank "
+            f"FROM (SELECT id, row_number() OVER "
+            f"(PARTITION BY {scope} ORDER BY position, id) AS rank "
+            f"FROM {table}) AS ranked WHERE {table}.id = ranked.id"
+        )
+        op.drop_column(table, "position")
+        op.alter_column(
+            table, "position_decimal", new_column_name="position", nullable=False
+        )
+    op.create_unique_constraint(
+        "uq_column_position_per_board", "columns", ["board_id", "position"]
+    )
+    op.create_index(
+        "ix_tasks_column_id_position",
+        "tasks",
+        ["column_id", "position"],
+        unique=False,
+    )
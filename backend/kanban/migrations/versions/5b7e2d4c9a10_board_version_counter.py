@@ -0,0 +1,32 @@
+"""board version counter
+
+Revision ID: 5b7e2d4c9a10
+Revises: a3f1c9d2e8b4
+Create Date: 2026-10-18 11:02:17.883190
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2d4c9a10"
+down_revision: Union[str, Sequence[str], None] = "a3f1c9d2e8b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "boards",
+        sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("boards", "version")
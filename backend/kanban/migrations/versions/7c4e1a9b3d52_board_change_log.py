@@ -0,0 +1,55 @@
+"""board change log
+
+Revision ID: 7c4e1a9b3d52
+Revises: 5b7e2d4c9a10
+Create Date: 2026-10-18 14:21:43.512064
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e1a9b3d52"
+down_revision: str | Sequence[str] | None = "5b7e2d4c9a10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "boards",
+        sa.Column(
+            "changes_floor", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    # Existing boards have no history: clients syncing from an older version
+    # get a reset and refetch the board once
+    op.execute("UPDATE boards SET changes_floor = version")
+    op.create_table(
+        "board_change_log",
+        sa.Column("board_id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["board_id"], ["boards.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("board_id", "entity", "entity_id"),
+    )
+    op.create_index(
+        "ix_board_change_log_board_id_version",
+        "board_change_log",
+        ["board_id", "version"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_board_change_log_board_id_version", table_name="board_change_log")
+    op.drop_table("board_change_log")
+    op.drop_column("boards", "changes_floor")
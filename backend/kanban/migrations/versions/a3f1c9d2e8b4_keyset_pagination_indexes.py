@@ -0,0 +1,37 @@
+"""keyset pagination indexes for the boards listing
+
+Revision ID: a3f1c9d2e8b4
+Revises: ce99803ab0dd
+Create Date: 2026-10-18 10:12:41.204517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f1c9d2e8b4"
+down_revision: Union[str, Sequence[str], None] = "ce99803ab0dd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_boards_created_at_id", "boards", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_board_members_user_id_board_id",
+        "board_members",
+        ["user_id", "board_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_board_members_user_id_board_id", table_name="board_members")
+    op.drop_index("ix_boards_created_at_id", table_name="boards")
@@ -0,0 +1,45 @@
+"""column task count
+
+Revision ID: e2a8f6c41b07
+Revises: 7c4e1a9b3d52
+Create Date: 2026-10-18 15:47:09.204518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a8f6c41b07"
+down_revision: Union[str, Sequence[str], None] = "7c4e1a9b3d52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "columns",
+        sa.Column(
+            "task_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.execute(
+        "UPDATE columns SET task_count = "
+        "(SELECT count(*) FROM tasks WHERE tasks.column_id = columns.id)"
+    )
+    op.create_index(
+        "ix_tasks_column_id_position",
+        "tasks",
+        ["column_id", "position"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_column_id_position", table_name="tasks")
+    op.drop_column("columns", "task_count")
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from decimal import Decimal
 from uuid import UUID as uuid, uuid4
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -12,8 +11,9 @@ from sqlalchemy.orm import (
     relationship,
     synonym,
 )
-from sqlalchemy.types import DECIMAL, UUID, String
+from sqlalchemy.types import UUID, String
 
+from backend.kanban.core.utility.ordering_key import MAX_KEY_LENGTH
 from backend.kanban.core.utility.role_enum import RoleEnum
 from backend.kanban.models.camel_to_snake import camel_to_snake
 from backend.kanban.models.mixins import (
@@ -24,6 +24,12 @@ from backend.kanban.models.mixins import (
 )
 
 
+# ordering keys compare as byte strings, see core.utility.ordering_key
+OrderKey = String(MAX_KEY_LENGTH).with_variant(
+    String(MAX_KEY_LENGTH, collation="C"), "postgresql"
+)
+
+
 class Base(DeclarativeBase):
     @declared_attr.directive
     def __tablename__(cls) -> str:
@@ -55,6 +61,12 @@ class User(CreatedAt, UpdatedAt, Base):
 class Boards(IdMixin, OwnedBy, CreatedAt, Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(String(200), nullable=False, default="")
+    version: Mapped[int] = mapped_column(
+        nullable=False, default=1, server_default=text("1")
+    )
+    changes_floor: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default=text("0")
+    )
     board_members: Mapped[list[BoardMembers]] = relationship(
         "BoardMembers",
         back_populates="boards",
@@ -70,6 +82,8 @@ class Boards(IdMixin, OwnedBy, CreatedAt, Base):
         "Tasks", back_populates="boards", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (Index("ix_boards_created_at_id", "created_at", "id"),)
+
 
 class BoardMembers(Base):
     """OwnedBy mixin isn't used due to the possibility of the large
@@ -89,18 +103,40 @@ class BoardMembers(Base):
 
     __table_args__ = (
         UniqueConstraint("board_id", "user_id", name="uq_member_per_board"),
+        Index("ix_board_members_user_id_board_id", "user_id", "board_id"),
     )
 
     id: Mapped[int] = synonym("board_id")
 
 
+class BoardChangeLog(Base):
+    """Latest change per board entity, compacted by key. \n
+    Every write replaces the previous row of the same entity, deletes are
+    kept as tombstones until compaction raises Boards.changes_floor."""
+
+    board_id: Mapped[int] = mapped_column(
+        ForeignKey("boards.id", ondelete="CASCADE"), primary_key=True
+    )
+    entity: Mapped[str] = mapped_column(String(16), primary_key=True)
+    entity_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False)
+    deleted: Mapped[bool] = mapped_column(nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_board_change_log_board_id_version", "board_id", "version"),
+    )
+
+
 class Columns(IdMixin, Base):
     board_id: Mapped[int] = mapped_column(
         ForeignKey("boards.id", ondelete="CASCADE"), nullable=False
     )
     name: Mapped[str] = mapped_column(String(100))
-    position: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
+    position: Mapped[str] = mapped_column(OrderKey, nullable=False)
     wip_limit: Mapped[int] = mapped_column(nullable=True)
+    task_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default=text("0")
+    )
 
     boards: Mapped[Boards] = relationship("Boards", back_populates="columns")
     tasks: Mapped[list[Tasks]] = relationship(
@@ -132,7 +168,7 @@ class Tasks(IdMixin, OwnedBy, CreatedAt, Base):
     description: Mapped[str] = mapped_column(
         String(200),
     )
-    position: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
+    position: Mapped[str] = mapped_column(OrderKey, nullable=False)
     columns: Mapped[Columns] = relationship("Columns", back_populates="tasks")
     assignee: Mapped[User] = relationship(
         "User",
@@ -146,3 +182,5 @@ class Tasks(IdMixin, OwnedBy, CreatedAt, Base):
     user: Mapped[User] = relationship(
         "User", back_populates="tasks", foreign_keys="[Tasks.owner_id]"
     )
+
+    __table_args__ = (Index("ix_tasks_column_id_position", "column_id", "position"),)
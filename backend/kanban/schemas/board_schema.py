@@ -1,13 +1,16 @@
 from datetime import datetime
-from decimal import Decimal
-from typing import Annotated
+from enum import StrEnum
+from functools import lru_cache
+from typing import Annotated, Any, Literal
 from uuid import UUID
+from zlib import crc32
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, create_model
 
 from backend.kanban.core.utility.role_enum import RoleEnum
-from backend.kanban.schemas.generic import GenericId
-from backend.kanban.schemas.tasks_schema import TaskView
+from backend.kanban.schemas.columns_schema import ColumnCreate, ColumnGet
+from backend.kanban.schemas.generic import GenericId, OrderingKey
+from backend.kanban.schemas.tasks_schema import CreateTaskBase, TaskView
 from backend.kanban.schemas.user_schema import UserGetForTotal
 
 
@@ -46,6 +49,17 @@ class BoardGet(BoardGetBase):
     owner_id: UUID
 
 
+class BoardPage(BaseModel):
+    items: list[BoardGet]
+    next_cursor: Annotated[
+        str | None,
+        Field(
+            default=None,
+            description="Cursor of the next page. None if this page is the last",
+        ),
+    ]
+
+
 class BoardUpdate(BaseModel):
     name: Annotated[str | None, Field(default=None, min_length=8)]
     description: Annotated[str | None, Field(default=None)]
@@ -60,12 +74,43 @@ class MemberView(BaseModel):
 
 class ColumnBoardView(BaseModel):
     name: str
-    position: Decimal
+    position: str
     tasks: list[TaskView] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class StreamTaskView(TaskView):
+    column_id: int
+
+
+class MemberChangeView(BaseModel):
+    user_id: UUID
+    role: RoleEnum
+    email: str
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BoardChanges(BaseModel):
+    """Changes of the board after the since version, deleted entities are
+    listed by id. When reset is set the change log no longer covers since
+    and the client has to refetch the whole board."""
+
+    board_id: int
+    since: int
+    version: int
+    reset: bool = False
+    board: BoardGetBase | None = None
+    columns: Annotated[list[ColumnGet], Field(default_factory=list)]
+    tasks: Annotated[list[StreamTaskView], Field(default_factory=list)]
+    members: Annotated[list[MemberChangeView], Field(default_factory=list)]
+    deleted_columns: Annotated[list[int], Field(default_factory=list)]
+    deleted_tasks: Annotated[list[int], Field(default_factory=list)]
+    deleted_members: Annotated[list[UUID], Field(default_factory=list)]
+
+
 class BoardFullView(GenericId[int]):
     name: str
     description: str
@@ -76,3 +121,205 @@ class BoardFullView(GenericId[int]):
     columns: Annotated[list[ColumnBoardView], Field(default_factory=list)]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ExportMember(BaseModel):
+    email: str
+    role: RoleEnum
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExportColumn(ColumnCreate):
+    id: int
+    position: OrderingKey
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExportTask(CreateTaskBase):
+    """Task of an export. The assignee is kept by email, ids are only used
+    to link the tasks to their columns and are replaced on import"""
+
+    id: int
+    column_id: int
+    position: OrderingKey
+    email: Annotated[
+        str | None,
+        Field(default=None, description="email of the assignee or skip"),
+    ]
+    created_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BoardRecord(BaseModel):
+    type: Literal["board"]
+    data: BoardCreate
+
+
+class MemberRecord(BaseModel):
+    type: Literal["member"]
+    data: ExportMember
+
+
+class ColumnRecord(BaseModel):
+    type: Literal["column"]
+    data: ExportColumn
+
+
+class TaskRecord(BaseModel):
+    type: Literal["task"]
+    data: ExportTask
+
+
+BoardExportRecord = Annotated[
+    BoardRecord | MemberRecord | ColumnRecord | TaskRecord,
+    Field(discriminator="type"),
+]
+
+
+class BoardImportResult(BaseModel):
+    board: BoardGet
+    members: int = 0
+    columns: int = 0
+    tasks: int = 0
+    skipped_members: Annotated[
+        list[str],
+        Field(
+            default_factory=list,
+            description="emails of the members without an account here",
+        ),
+    ]
+
+
+class BoardClone(BaseModel):
+    name: Annotated[
+        str | None,
+        Field(
+            default=None,
+            min_length=1,
+            max_length=100,
+            description="Name of the new board, the source name if skipped",
+        ),
+    ]
+    description: Annotated[str | None, Field(default=None, max_length=200)]
+    include_tasks: bool = True
+    include_members: Annotated[
+        bool,
+        Field(default=False, description="copy the members with their roles"),
+    ]
+    include_assignees: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="keep the assignees of the tasks that are members "
+            "of the new board",
+        ),
+    ]
+
+
+class BoardCloneResult(BaseModel):
+    board: BoardGet
+    members: int = 0
+    columns: int = 0
+    tasks: int = 0
+
+
+class BoardInclude(StrEnum):
+    MEMBERS = "members"
+    COLUMNS = "columns"
+    TASKS = "tasks"
+
+
+class TaskField(StrEnum):
+    TITLE = "title"
+    DESCRIPTION = "description"
+    POSITION = "position"
+    CREATED_AT = "created_at"
+    ASSIGNEE_ID = "assignee_id"
+
+
+def split_csv(value: object) -> object:
+    """Accepts both ?include=a,b and ?include=a&include=b"""
+    if isinstance(value, str):
+        value = [value]
+    if isinstance(value, list | tuple | set | frozenset):
+        parts = (part.strip() for item in value for part in str(item).split(","))
+        return {part for part in parts if part}
+    return value
+
+
+class BoardReadOptions(BaseModel):
+    include: Annotated[
+        frozenset[BoardInclude],
+        BeforeValidator(split_csv),
+        Field(
+            default=frozenset(BoardInclude),
+            description="Comma separated relations to load: members, columns, "
+            "tasks. Tasks imply columns. By default everything is loaded",
+            examples=["columns,tasks"],
+        ),
+    ]
+    fields: Annotated[
+        frozenset[TaskField],
+        BeforeValidator(split_csv),
+        Field(
+            default=frozenset(TaskField),
+            description="Comma separated task fields to return. Task id is "
+            "always returned. By default every field is returned",
+            examples=["title"],
+        ),
+    ]
+
+    @property
+    def is_full(self) -> bool:
+        return self.include == frozenset(BoardInclude) and self.fields == frozenset(
+            TaskField
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Short stable id of the representation, used in the ETag"""
+        if self.is_full:
+            return ""
+        key = ",".join(sorted(self.relations)) + ";" + ",".join(sorted(self.fields))
+        return f"{crc32(key.encode()):08x}"
+
+    @property
+    def relations(self) -> frozenset[BoardInclude]:
+        if BoardInclude.TASKS in self.include:
+            return self.include | {BoardInclude.COLUMNS}
+        return self.include
+
+
+SPARSE_CONFIG = ConfigDict(from_attributes=True)
+
+
+@lru_cache
+def sparse_board_view(
+    include: frozenset[BoardInclude], fields: frozenset[TaskField]
+) -> type[BaseModel]:
+    """Builds (once per combination) a BoardFullView trimmed to the
+    requested relations and task fields"""
+    board_fields: dict[str, Any] = {}
+    if BoardInclude.MEMBERS in include:
+        board_fields["board_members"] = (list[MemberView], Field(default_factory=list))
+    if BoardInclude.COLUMNS in include:
+        column_fields: dict[str, Any] = {
+            "name": (str, ...),
+            "position": (str, ...),
+        }
+        if BoardInclude.TASKS in include:
+            task_fields: dict[str, Any] = {"id": (int, ...)}
+            for name in sorted(fields):
+                task_fields[name] = (TaskView.model_fields[name].annotation, ...)
+            task_view = create_model(
+                "SparseTaskView", __config__=SPARSE_CONFIG, **task_fields
+            )
+            column_fields["tasks"] = (list[task_view], Field(default_factory=list))
+        column_view = create_model(
+            "SparseColumnView", __config__=SPARSE_CONFIG, **column_fields
+        )
+        board_fields["columns"] = (list[column_view], Field(default_factory=list))
+    return create_model("SparseBoardView", __base__=BoardGet, **board_fields)
@@ -1,9 +1,8 @@
-from decimal import Decimal
 from typing import Annotated
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from backend.kanban.schemas.generic import GenericId
+from backend.kanban.schemas.generic import GenericId, OrderingKey
 from backend.kanban.schemas.tasks_schema import TaskView
 
 
@@ -17,16 +16,7 @@ class ColumnCreate(BaseModel):
             examples=["my amazing column"],
         ),
     ]
-    position: Annotated[
-        Decimal | None,
-        Field(
-            default=None,
-            gt=0,
-            max_digits=20,
-            decimal_places=10,
-            examples=["1.0", "1.5"],
-        ),
-    ]
+    position: OrderingKey | None = None
     wip_limit: Annotated[int | None, Field(default=None, ge=1, examples=[1, 2])]
 
 
@@ -40,23 +30,14 @@ class ColumnUpdate(BaseModel):
             examples=["my new amazing column name"],
         ),
     ]
-    position: Annotated[
-        Decimal | None,
-        Field(
-            default=None,
-            gt=0,
-            max_digits=20,
-            decimal_places=10,
-            examples=["1.0", "2.0"],
-        ),
-    ]
+    position: OrderingKey | None = None
 
     wip_limit: Annotated[int | None, Field(default=None, ge=1, examples=[1])]
 
 
 class ColumnGet(GenericId[int]):
     name: str
-    position: Decimal
+    position: str
     wip_limit: int | None
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class BoardEventStats(BaseModel):
+    board_id: int
+    subscribers: int
+    dropped: int
@@ -1,4 +1,15 @@
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, Field
+
+from backend.kanban.core.utility.ordering_key import MAX_KEY_LENGTH, validate_key
+
+
+OrderingKey = Annotated[
+    str,
+    Field(min_length=2, max_length=MAX_KEY_LENGTH, examples=["a0", "a0V"]),
+    AfterValidator(validate_key),
+]
 
 
 class GenericId[T](BaseModel):
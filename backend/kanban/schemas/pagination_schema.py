@@ -1,6 +1,9 @@
+from datetime import datetime
 from typing import Annotated
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
+
+from backend.kanban.core.utility.cursor import decode_cursor, verify_cursor
 
 
 class Pagination(BaseModel):
@@ -9,17 +12,21 @@ class Pagination(BaseModel):
         Field(
             default=10,
             ge=1,
-            le=20,
+            le=100,
             description="Limit for both database queries and the endpoints. \n "
             "Dependency for the endpoints is managed by PaginationDep.",
         ),
     ]
-    offset: Annotated[
-        int,
+    cursor: Annotated[
+        str | None,
+        AfterValidator(verify_cursor),
         Field(
-            default=0,
-            ge=0,
-            description="Offset for both database queries and Endpoints. \n "
-            "Dependency for the endpoints is managed by PaginationDep",
+            default=None,
+            description="Opaque cursor from the next_cursor of the previous page. \n "
+            "Omit it to get the first page",
         ),
     ]
+
+    @property
+    def position(self) -> tuple[datetime, int] | None:
+        return decode_cursor(self.cursor) if self.cursor else None
@@ -1,17 +1,16 @@
 from datetime import datetime
-from decimal import Decimal
 from typing import Annotated
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from backend.kanban.schemas.generic import GenericId
+from backend.kanban.schemas.generic import GenericId, OrderingKey
 
 
 class TaskView(GenericId[int]):
     title: str
     description: str
-    position: Decimal
+    position: str
     created_at: datetime
     assignee_id: UUID | None
 
@@ -26,10 +25,7 @@ class CreateTaskBase(BaseModel):
         str | None,
         Field(..., min_length=1, max_length=200, examples=["Description to the test"]),
     ]
-    position: Annotated[
-        Decimal | None,
-        Field(..., gt=0, max_digits=20, decimal_places=10),
-    ]
+    position: Annotated[OrderingKey | None, Field(...)]
 
 
 class CreateTask(CreateTaskBase):
@@ -59,9 +55,7 @@ class UpdateTaskBase(BaseModel):
             examples=["Very new name of the test"],
         ),
     ]
-    position: Annotated[
-        Decimal | None, Field(default=None, gt=0, max_digits=20, decimal_places=10)
-    ]
+    position: OrderingKey | None = None
 
 
 class UpdateTask(UpdateTaskBase):
@@ -78,3 +72,51 @@ class MoveTask(BaseModel):
     target_column_id: int
     above_task_id: int | None = None
     below_task_id: int | None = None
+
+
+class MoveTaskItem(MoveTask):
+    task_id: int
+
+
+class MoveTasksBatch(BaseModel):
+    moves: Annotated[
+        list[MoveTaskItem],
+        Field(
+            min_length=1,
+            max_length=1000,
+            description="Applied in order, so a move may use tasks moved before "
+            "it as neighbours",
+        ),
+    ]
+
+
+class BulkTaskCreate(CreateTaskBase):
+    column_id: int
+    position: OrderingKey | None = None
+    email: Annotated[
+        str | None,
+        Field(default=None, description="email of the assignee or skip"),
+    ]
+
+
+class BulkRowError(BaseModel):
+    row: int
+    detail: str
+
+
+class BulkTaskRows(BaseModel):
+    """Rows of a bulk request by their 0-based index in the upload. Rows that
+    could not be parsed are already reported in errors"""
+
+    rows: dict[int, BulkTaskCreate] = Field(default_factory=dict)
+    errors: list[BulkRowError] = Field(default_factory=list)
+
+
+class BulkTaskCreated(BaseModel):
+    row: int
+    id: int
+
+
+class BulkTaskResult(BaseModel):
+    created: list[BulkTaskCreated]
+    errors: list[BulkRowError]
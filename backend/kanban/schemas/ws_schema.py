@@ -0,0 +1,51 @@
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+from backend.kanban.schemas.tasks_schema import CreateTaskBase, MoveTask
+
+
+class WsCommandBase(BaseModel):
+    board_id: int
+    ref: Annotated[
+        str | None,
+        Field(default=None, description="Echoed back in the reply to this command"),
+    ]
+
+
+class WsSubscribe(WsCommandBase):
+    action: Literal["subscribe"]
+
+
+class WsUnsubscribe(WsCommandBase):
+    action: Literal["unsubscribe"]
+
+
+class WsMoveTask(WsCommandBase):
+    action: Literal["move_task"]
+    task_id: int
+    data: MoveTask
+
+
+class WsCreateTask(WsCommandBase):
+    action: Literal["create_task"]
+    column_id: int
+    data: CreateTaskBase
+    email: str | None = None
+
+
+WsCommand = Annotated[
+    WsSubscribe | WsUnsubscribe | WsMoveTask | WsCreateTask,
+    Field(discriminator="action"),
+]
+ws_command_adapter: TypeAdapter[WsCommand] = TypeAdapter(WsCommand)
+
+
+class WsReply(BaseModel):
+    type: Literal["ack", "error"]
+    action: str | None = None
+    ref: str | None = None
+    board_id: int | None = None
+    status_code: int | None = None
+    detail: Any = None
+    data: Any = None
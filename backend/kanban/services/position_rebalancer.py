@@ -0,0 +1,88 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.kanban.database.unit_of_work import UnitOfWork
+from backend.kanban.services.services.positions_service import PositionsService
+
+
+logger = logging.getLogger(__name__)
+
+
+class PositionRebalancer:
+    """Background sweep that keeps ordering keys short. \n
+    Every interval it looks for columns and boards whose keys grew past
+    max_key_length and respreads the dense runs. Each scope is renumbered in
+    its own short transaction, with one bulk UPDATE, and publishes a single
+    positions_rebalanced event. Requests never wait for it."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_key_length: int,
+        interval: float,
+        batch_size: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_key_length = max_key_length
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def run_once(self) -> int:
+        """One sweep. Returns the number of rebalanced scopes"""
+        columns, boards = await self._call(
+            PositionsService.dense_scopes, self.max_key_length, self.batch_size
+        )
+        rebalanced = 0
+        for board_id, column_id in columns:
+            rebalanced += await self._rebalance(
+                PositionsService.rebalance_tasks,
+                board_id,
+                column_id,
+                self.max_key_length,
+            )
+        for board_id in boards:
+            rebalanced += await self._rebalance(
+                PositionsService.rebalance_columns, board_id, self.max_key_length
+            )
+        return rebalanced
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if rebalanced := await self.run_once():
+                    logger.info(f"Rebalanced positions in {rebalanced} scopes")
+            except Exception:
+                logger.exception("Position rebalancing sweep failed")
+            await asyncio.sleep(self.interval)
+
+    async def _rebalance(
+        self, method: Callable[..., Awaitable[int | None]], *args: int
+    ) -> int:
+        """One scope. A failing scope is logged and retried on the next sweep"""
+        try:
+            return int(await self._call(method, *args) is not None)
+        except Exception:
+            logger.exception(f"Position rebalancing failed for {args}")
+            return 0
+
+    async def _call[R](self, method: Callable[..., Awaitable[R]], *args: int) -> R:
+        """Runs a PositionsService method in a fresh session"""
+        async with self.session_factory() as session:
+            return await method(PositionsService(UnitOfWork(session)), *args)
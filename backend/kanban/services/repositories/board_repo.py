@@ -1,23 +1,54 @@
 import logging
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from typing import Final
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import (
+    Integer,
+    Row,
+    Select,
+    case,
+    column,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, load_only, selectinload
 
+from backend.kanban.core.security.role_cache import role_cache
+from backend.kanban.core.utility.change_entity import ChangeEntity
 from backend.kanban.core.utility.role_enum import RoleEnum
-from backend.kanban.models.models import BoardMembers, Boards, Columns
+from backend.kanban.database.commit_hooks import after_commit
+from backend.kanban.event_manager.outbox import record_event
+from backend.kanban.models.models import (
+    BoardChangeLog,
+    BoardMembers,
+    Boards,
+    Columns,
+    Tasks,
+    User,
+)
 from backend.kanban.schemas.board_schema import (
     BoardCreate,
+    BoardGetBase,
+    BoardInclude,
+    BoardReadOptions,
     BoardUpdate,
 )
 from backend.kanban.schemas.pagination_schema import Pagination
+from backend.kanban.services.repositories.board_version import record_board_change
 from backend.kanban.services.repositories.generic_repo import BaseRepository
 
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE: Final[int] = 500
+
 
 class BoardRepository(BaseRepository[Boards, BoardCreate, BoardUpdate]):
     def __init__(self, session: AsyncSession) -> None:
@@ -32,7 +63,7 @@ class BoardRepository(BaseRepository[Boards, BoardCreate, BoardUpdate]):
                 Boards.board_members,
             )
             .where(BoardMembers.user_id == user_id)
-        ).distinct()
+        )
         if id is not None:
             query = query.where(Boards.id == id)
         return query
@@ -60,13 +91,17 @@ class BoardRepository(BaseRepository[Boards, BoardCreate, BoardUpdate]):
             role=RoleEnum.ADMIN,
         )
         self.session.add(owner_membership)
+        board_id = orm_board.id
+        after_commit(self.session, lambda: role_cache.invalidate(board_id, owner_id))
         return orm_board
 
     async def get_boards(
         self, user_id: UUID, pagination: Pagination
     ) -> Sequence[Boards]:
         """
-        Get all boards, where current user represented
+        Get boards where current user represented, newest first. \n
+        Keyset pagination over (created_at, id). Fetches one extra row,
+        so the caller knows whether the next page exists.
         Args:
             user_id (UUID)
             pagination (Pagination): Pydantic Pagination schema
@@ -75,25 +110,54 @@ class BoardRepository(BaseRepository[Boards, BoardCreate, BoardUpdate]):
             Sequence[Boards] or []
         """
         query = self._select_query_builder(user_id=user_id)
-        query = query.limit(pagination.limit).offset(pagination.offset)
+        if (position := pagination.position) is not None:
+            query = query.where(tuple_(Boards.created_at, Boards.id) < position)
+        query = query.order_by(Boards.created_at.desc(), Boards.id.desc()).limit(
+            pagination.limit + 1
+        )
         result = await self.session.execute(query)
         rows: Sequence[Boards] = result.scalars().all()
         return rows
 
-    async def get_board(self, user_id: UUID, id: int) -> Boards | None:
+    def _board_loader_options(self, read_options: BoardReadOptions) -> list:
+        relations = read_options.relations
+        options: list = []
+        if BoardInclude.MEMBERS in relations:
+            options.append(
+                selectinload(Boards.board_members).joinedload(BoardMembers.user)
+            )
+        if BoardInclude.COLUMNS in relations:
+            columns_loader = selectinload(Boards.columns)
+            if BoardInclude.TASKS in relations:
+                task_columns = [
+                    getattr(Tasks, field) for field in sorted(read_options.fields)
+                ]
+                columns_loader = columns_loader.selectinload(Columns.tasks).options(
+                    load_only(Tasks.id, Tasks.column_id, *task_columns)
+                )
+            options.append(columns_loader)
+        return options
+
+    async def get_board(
+        self,
+        user_id: UUID,
+        id: int,
+        read_options: BoardReadOptions | None = None,
+    ) -> Boards | None:
         """
-        Get full info about the board
+        Get full info about the board. Relations that are not requested
+        are not loaded, task columns are limited to the requested fields
         Args:
             owner_id (UUID):
             id (int): id of the board inside the Boards table
+            read_options (BoardReadOptions | None): includes and task fields
 
         Returns:
             full info about a board
         """
         query = self._select_query_builder(user_id=user_id, id=id)
         query = query.options(
-            selectinload(Boards.board_members).joinedload(BoardMembers.user),
-            selectinload(Boards.columns).selectinload(Columns.tasks),
+            *self._board_loader_options(read_options or BoardReadOptions())
         )
         logging.info(f"DEBUG - pre-result query = {query}")
         result = await self.session.execute(query)
@@ -102,6 +166,304 @@ class BoardRepository(BaseRepository[Boards, BoardCreate, BoardUpdate]):
 
         return row
 
+    async def get_version(
+        self, board_id: int, user_id: UUID | None = None
+    ) -> int | None:
+        """Single indexed lookup of the board version. With user_id set,
+        returns None for the boards where the user is not a member"""
+        query = select(Boards.version).where(Boards.id == board_id)
+        if user_id is not None:
+            query = query.join(Boards.board_members).where(
+                BoardMembers.user_id == user_id
+            )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_board_header(self, user_id: UUID, id: int) -> Boards | None:
+        """Board row without any relationships loaded"""
+        query = self._select_query_builder(user_id=user_id, id=id)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_sync_state(self, board_id: int, user_id: UUID) -> Row | None:
+        """(version, changes_floor) of the board, None for non members"""
+        query = (
+            select(Boards.version, Boards.changes_floor)
+            .join(Boards.board_members)
+            .where(Boards.id == board_id, BoardMembers.user_id == user_id)
+        )
+        result = await self.session.execute(query)
+        return result.one_or_none()
+
+    async def get_changes(self, board_id: int, since: int) -> Sequence[Row]:
+        """(entity, entity_id, deleted) of the change log after since"""
+        query = select(
+            BoardChangeLog.entity, BoardChangeLog.entity_id, BoardChangeLog.deleted
+        ).where(BoardChangeLog.board_id == board_id, BoardChangeLog.version > since)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_columns_by_ids(
+        self, board_id: int, ids: Sequence[int]
+    ) -> Sequence[Row]:
+        query = select(
+            Columns.id, Columns.name, Columns.position, Columns.wip_limit
+        ).where(Columns.board_id == board_id, Columns.id.in_(ids))
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_tasks_by_ids(
+        self, board_id: int, ids: Sequence[int]
+    ) -> Sequence[Row]:
+        query = select(
+            Tasks.id,
+            Tasks.column_id,
+            Tasks.title,
+            Tasks.description,
+            Tasks.position,
+            Tasks.created_at,
+            Tasks.assignee_id,
+        ).where(Tasks.board_id == board_id, Tasks.id.in_(ids))
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_members_by_ids(
+        self, board_id: int, user_ids: Sequence[UUID]
+    ) -> Sequence[Row]:
+        query = (
+            select(BoardMembers.user_id, BoardMembers.role, User.email, User.name)
+            .join(User, User.id == BoardMembers.user_id)
+            .where(BoardMembers.board_id == board_id, User.id.in_(user_ids))
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def _stream(self, query: Select) -> AsyncIterator[Sequence[Row]]:
+        """Server-side cursor. Yields rows in partitions of STREAM_CHUNK_SIZE"""
+        result = await self.session.stream(
+            query.execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    def stream_members(self, board_id: int) -> AsyncIterator[Sequence[Row]]:
+        query = (
+            select(BoardMembers.role, User.email, User.name)
+            .join(User, User.id == BoardMembers.user_id)
+            .where(BoardMembers.board_id == board_id)
+        )
+        return self._stream(query)
+
+    def stream_columns(self, board_id: int) -> AsyncIterator[Sequence[Row]]:
+        query = (
+            select(Columns.id, Columns.name, Columns.position, Columns.wip_limit)
+            .where(Columns.board_id == board_id)
+            .order_by(Columns.position, Columns.id)
+        )
+        return self._stream(query)
+
+    def stream_tasks(self, board_id: int) -> AsyncIterator[Sequence[Row]]:
+        """Plain column tuples, so no ORM objects pile up in the session"""
+        query = (
+            select(
+                Tasks.id,
+                Tasks.column_id,
+                Tasks.title,
+                Tasks.description,
+                Tasks.position,
+                Tasks.created_at,
+                Tasks.assignee_id,
+            )
+            .where(Tasks.board_id == board_id)
+            .order_by(Tasks.column_id, Tasks.position, Tasks.id)
+        )
+        return self._stream(query)
+
+    def stream_export_tasks(self, board_id: int) -> AsyncIterator[Sequence[Row]]:
+        """Like stream_tasks, with the assignee email instead of the user id"""
+        query = (
+            select(
+                Tasks.id,
+                Tasks.column_id,
+                Tasks.title,
+                Tasks.description,
+                Tasks.position,
+                Tasks.created_at,
+                User.email,
+            )
+            .outerjoin(User, User.id == Tasks.assignee_id)
+            .where(Tasks.board_id == board_id)
+            .order_by(Tasks.column_id, Tasks.position, Tasks.id)
+        )
+        return self._stream(query)
+
+    async def import_members(
+        self, board_id: int, members: dict[UUID, RoleEnum]
+    ) -> None:
+        if not members:
+            return
+        await self.session.execute(
+            insert(BoardMembers),
+            [
+                {"board_id": board_id, "user_id": user_id, "role": role}
+                for user_id, role in members.items()
+            ],
+        )
+        for user_id in members:
+            after_commit(
+                self.session,
+                lambda user_id=user_id: role_cache.invalidate(board_id, user_id),
+            )
+
+    async def import_columns(
+        self, board_id: int, columns: list[dict[str, object]]
+    ) -> list[int]:
+        """Multi-row INSERT ... RETURNING, ids in the order of the rows"""
+        result = await self.session.scalars(
+            insert(Columns).returning(Columns.id, sort_by_parameter_order=True),
+            [{**row, "board_id": board_id} for row in columns],
+        )
+        return list(result)
+
+    async def import_tasks(self, board_id: int, tasks: list[dict[str, object]]) -> None:
+        """Batched multi-row INSERT without RETURNING or change log rows, the
+        imported board is published as a whole by finish_import"""
+        await self.session.execute(
+            insert(Tasks), [{**row, "board_id": board_id} for row in tasks]
+        )
+
+    async def finish_import(self, board_id: int, task_counts: dict[int, int]) -> None:
+        """Sets the task counts of the imported columns and moves the change
+        log floor to the new version, so clients load the board in full"""
+        if task_counts:
+            counts = values(
+                column("id", Integer), column("task_count", Integer), name="counts"
+            ).data(list(task_counts.items()))
+            await self.session.execute(
+                update(Columns)
+                .where(Columns.id == counts.c.id)
+                .values(task_count=counts.c.task_count)
+                .execution_options(synchronize_session=False)
+            )
+        await self.reset_changes(board_id)
+
+    async def reset_changes(self, board_id: int) -> None:
+        """Bumps the version and moves the change log floor to it. For boards
+        filled without change log rows, clients get a reset and load them
+        in full"""
+        await self.session.execute(
+            update(Boards)
+            .where(Boards.id == board_id)
+            .values(version=Boards.version + 1, changes_floor=Boards.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def clone_members(self, source_id: int, target_id: int) -> int:
+        """INSERT ... SELECT of the source members that are not on the target
+        yet, with their roles. Returns the number of members added"""
+        query = (
+            insert(BoardMembers)
+            .from_select(
+                ["board_id", "user_id", "role"],
+                select(
+                    literal(target_id), BoardMembers.user_id, BoardMembers.role
+                ).where(
+                    BoardMembers.board_id == source_id,
+                    BoardMembers.user_id.not_in(
+                        select(BoardMembers.user_id).where(
+                            BoardMembers.board_id == target_id
+                        )
+                    ),
+                ),
+            )
+            .returning(BoardMembers.user_id)
+        )
+        user_ids = (await self.session.scalars(query)).all()
+        for user_id in user_ids:
+            after_commit(
+                self.session,
+                lambda user_id=user_id: role_cache.invalidate(target_id, user_id),
+            )
+        return len(user_ids)
+
+    async def clone_columns(self, source_id: int, target_id: int) -> int:
+        """INSERT ... SELECT of the columns with their positions and limits.
+        The columns start empty, see count_tasks"""
+        query = insert(Columns).from_select(
+            ["board_id", "name", "position", "wip_limit"],
+            select(
+                literal(target_id),
+                Columns.name,
+                Columns.position,
+                Columns.wip_limit,
+            ).where(Columns.board_id == source_id),
+        )
+        return (await self.session.execute(query)).rowcount
+
+    async def count_tasks(self, board_id: int) -> None:
+        """Sets the task counts of the board columns from their task rows.
+        Used after a clone, where the source may change between the column
+        and the task copies"""
+        await self.session.execute(
+            update(Columns)
+            .where(Columns.board_id == board_id)
+            .values(
+                task_count=select(func.count(Tasks.id))
+                .where(Tasks.column_id == Columns.id)
+                .scalar_subquery()
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def clone_tasks(
+        self, source_id: int, target_id: int, with_assignees: bool
+    ) -> int:
+        """INSERT ... SELECT of the tasks into the cloned columns. Columns
+        are matched by position, which is unique per board. Assignees are
+        kept only if they are members of the target board"""
+        source = aliased(Columns)
+        target = aliased(Columns)
+        assignee = literal(None, Tasks.assignee_id.type)
+        if with_assignees:
+            assignee = case(
+                (
+                    Tasks.assignee_id.in_(
+                        select(BoardMembers.user_id).where(
+                            BoardMembers.board_id == target_id
+                        )
+                    ),
+                    Tasks.assignee_id,
+                ),
+                else_=None,
+            )
+        query = insert(Tasks).from_select(
+            [
+                "board_id",
+                "column_id",
+                "title",
+                "description",
+                "position",
+                "assignee_id",
+                "created_at",
+            ],
+            select(
+                literal(target_id),
+                target.id,
+                Tasks.title,
+                Tasks.description,
+                Tasks.position,
+                assignee,
+                func.now(),
+            )
+            .join(source, source.id == Tasks.column_id)
+            .join(
+                target,
+                (target.board_id == target_id) & (target.position == source.position),
+            )
+            .where(Tasks.board_id == source_id),
+        )
+        return (await self.session.execute(query)).rowcount
+
     async def update_board(
         self, board_id: int, data_to_update: BoardUpdate
     ) -> Boards | None:
@@ -119,6 +481,14 @@ class BoardRepository(BaseRepository[Boards, BoardCreate, BoardUpdate]):
             board := await super().update(data_to_update=data_to_update, id=board_id)
         ):
             return None
+        await record_board_change(
+            self.session,
+            board_id,
+            "board_updated",
+            BoardGetBase.model_validate(board).model_dump(mode="json"),
+            entity=ChangeEntity.BOARD,
+            entity_ids=[board_id],
+        )
         return board
 
     async def delete_board(self, id: int) -> None | bool:
@@ -134,6 +504,8 @@ class BoardRepository(BaseRepository[Boards, BoardCreate, BoardUpdate]):
 
         if not (board := await super().delete(id=id)):
             return None
+        after_commit(self.session, lambda: role_cache.invalidate_board(id))
+        record_event(self.session, id, "board_deleted", {"board_id": id})
 
         logging.info(f"DEBUG - board = {board}")
 
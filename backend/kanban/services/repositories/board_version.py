@@ -0,0 +1,80 @@
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.core.utility.change_entity import ChangeEntity
+from backend.kanban.event_manager.outbox import record_event
+from backend.kanban.event_manager.pubsub import MAX_NOTIFY_PAYLOAD
+from backend.kanban.models.models import Boards
+from backend.kanban.services.repositories.change_log import log_changes
+
+
+async def bump_board_version(session: AsyncSession, board_id: int) -> int | None:
+    """Increments Boards.version inside the current transaction. \n
+    Called by every repository method that changes the board tree, so the
+    version can be used as a strong ETag. Returns the new version."""
+    result = await session.execute(
+        update(Boards)
+        .where(Boards.id == board_id)
+        .values(version=Boards.version + 1)
+        .returning(Boards.version)
+    )
+    return result.scalar_one_or_none()
+
+
+async def record_board_change(
+    session: AsyncSession,
+    board_id: int,
+    event: str,
+    data: dict[str, Any],
+    entity: ChangeEntity,
+    entity_ids: Sequence[object],
+    deleted: bool = False,
+) -> int | None:
+    """Bumps the board version, writes the changed entities to the change
+    log and queues the event under the new version. The event is published
+    after the transaction commits."""
+    version = await bump_board_version(session, board_id)
+    if version is None:
+        return None
+    await log_changes(session, board_id, version, entity, entity_ids, deleted)
+    record_event(session, board_id, event, data, version)
+    return version
+
+
+def split_event_data(
+    board_id: int, event: str, data: dict[str, Any], field: str
+) -> list[dict[str, Any]]:
+    """data split on the list or mapping under field, so that every part,
+    published as one event, fits into a NOTIFY payload. The other fields are
+    repeated in each part. Parts are recorded as separate board changes"""
+    items = data[field]
+    pairs = items.items() if isinstance(items, dict) else enumerate(items)
+    envelope = json.dumps(
+        {
+            "board_id": board_id,
+            "messages": [{"id": 2**63, "event": event, "data": {**data, field: []}}],
+        }
+    )
+    budget = MAX_NOTIFY_PAYLOAD - len(envelope)
+    parts: list[dict[str, Any]] = []
+    part: dict[Any, Any] = {}
+    size = 0
+    for key, item in pairs:
+        # the brackets of the wrapped entry stand in for its ", " separator
+        entry = {key: item} if isinstance(items, dict) else [item]
+        entry_size = len(json.dumps(entry))
+        if part and size + entry_size > budget:
+            parts.append(part)
+            part, size = {}, 0
+        part[key] = item
+        size += entry_size
+    if part or not parts:
+        parts.append(part)
+    return [
+        {**data, field: part if isinstance(items, dict) else list(part.values())}
+        for part in parts
+    ]
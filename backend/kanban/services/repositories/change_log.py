@@ -0,0 +1,70 @@
+from collections.abc import Sequence
+from typing import Final
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.core.utility.change_entity import ChangeEntity
+from backend.kanban.models.models import BoardChangeLog, Boards
+
+
+COMPACT_EVERY: Final[int] = 256
+CHUNK: Final[int] = 1000
+TOMBSTONE_RETENTION: Final[int] = 1024
+
+
+async def log_changes(
+    session: AsyncSession,
+    board_id: int,
+    version: int,
+    entity: ChangeEntity,
+    entity_ids: Sequence[object],
+    deleted: bool = False,
+) -> None:
+    """Replaces the change log rows of the entities with this version, so the
+    log holds at most one row per entity. Every COMPACT_EVERY versions the
+    old tombstones of the board are purged."""
+    keys = [str(entity_id) for entity_id in entity_ids]
+    if not keys:
+        return
+    # chunked, bulk changes can exceed the bind parameter limit
+    for start in range(0, len(keys), CHUNK):
+        await session.execute(
+            delete(BoardChangeLog).where(
+                BoardChangeLog.board_id == board_id,
+                BoardChangeLog.entity == entity,
+                BoardChangeLog.entity_id.in_(keys[start : start + CHUNK]),
+            )
+        )
+    await session.execute(
+        insert(BoardChangeLog),
+        [
+            {
+                "board_id": board_id,
+                "entity": entity,
+                "entity_id": key,
+                "version": version,
+                "deleted": deleted,
+            }
+            for key in keys
+        ],
+    )
+    if version % COMPACT_EVERY == 0 and version > TOMBSTONE_RETENTION:
+        await compact_change_log(session, board_id, version - TOMBSTONE_RETENTION)
+
+
+async def compact_change_log(session: AsyncSession, board_id: int, floor: int) -> None:
+    """Drops tombstones up to floor. Clients that synced before the floor
+    can no longer learn about those deletes and get a reset instead."""
+    await session.execute(
+        delete(BoardChangeLog).where(
+            BoardChangeLog.board_id == board_id,
+            BoardChangeLog.deleted.is_(True),
+            BoardChangeLog.version <= floor,
+        )
+    )
+    await session.execute(
+        update(Boards)
+        .where(Boards.id == board_id, Boards.changes_floor < floor)
+        .values(changes_floor=floor)
+    )
@@ -1,52 +1,173 @@
-from decimal import Decimal
+from typing import Any
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import bindparam, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from backend.kanban.models.models import Columns
-from backend.kanban.schemas.columns_schema import ColumnCreate, ColumnUpdate
+from backend.kanban.core.utility.change_entity import ChangeEntity
+from backend.kanban.core.utility.ordering_key import key_between, rebalance
+from backend.kanban.models.models import Columns, Tasks
+from backend.kanban.schemas.columns_schema import (
+    ColumnCreate,
+    ColumnGet,
+    ColumnUpdate,
+)
+from backend.kanban.services.repositories.board_version import record_board_change
+from backend.kanban.services.repositories.change_log import log_changes
 from backend.kanban.services.repositories.generic_repo import BaseRepository
+from backend.kanban.services.repositories.positions import (
+    record_rebalanced,
+    renumber_positions,
+)
+
+
+# built once, see tasks_repo
+_COLUMN = select(Columns).where(
+    Columns.id == bindparam("column_id"), Columns.board_id == bindparam("board_id")
+)
+_COLUMN_WITH_TASKS = _COLUMN.options(selectinload(Columns.tasks))
+_LAST_POSITION = select(func.max(Columns.position)).where(
+    Columns.board_id == bindparam("board_id")
+)
 
 
 class ColumnsRepo(BaseRepository[Columns, ColumnCreate, ColumnUpdate]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Columns)
 
-    def _query_builder(self, column_id: int, board_id: int) -> Select[tuple[Columns]]:
-        return select(Columns).where(
-            Columns.id == column_id, Columns.board_id == board_id
-        )
+    @staticmethod
+    def _column_payload(column: Columns) -> dict[str, Any]:
+        return {
+            "column_id": column.id,
+            "column": ColumnGet.model_validate(column).model_dump(mode="json"),
+        }
 
-    async def _new_column_position(self, board_id: int) -> Decimal:
-        query = select(func.max(Columns.position)).where(Columns.board_id == board_id)
-        result = await self.session.execute(query)
-        max_position = result.scalar()
-        if not max_position:
-            return Decimal("1.0")
-        return max_position + Decimal("1.0")
+    async def _new_column_position(self, board_id: int) -> str:
+        last = await self.session.scalar(_LAST_POSITION, {"board_id": board_id})
+        return key_between(last, None)
 
     async def _get_column(self, column_id: int, board_id: int) -> Columns | None:
-        query = self._query_builder(column_id=column_id, board_id=board_id)
+        result = await self.session.execute(
+            _COLUMN, {"column_id": column_id, "board_id": board_id}
+        )
+        return result.scalar_one_or_none()
+
+    async def get_column(self, column_id: int, board_id: int) -> Columns | None:
+        """Column row only, without the tasks"""
+        return await self._get_column(column_id=column_id, board_id=board_id)
+
+    async def board_column_ids(self, board_id: int, column_ids: set[int]) -> set[int]:
+        """The given column ids that belong to the board"""
+        query = select(Columns.id).where(
+            Columns.board_id == board_id, Columns.id.in_(column_ids)
+        )
+        return set(await self.session.scalars(query))
+
+    async def free_slots(
+        self, board_id: int, column_ids: set[int]
+    ) -> dict[int, int | None]:
+        """{column_id: free WIP slots, None without a limit} of the board
+        columns. The columns stay locked until commit"""
+        query = (
+            select(Columns.id, Columns.wip_limit, Columns.task_count)
+            .where(Columns.board_id == board_id, Columns.id.in_(column_ids))
+            .order_by(Columns.id)
+            .with_for_update()
+        )
         result = await self.session.execute(query)
+        return {
+            row.id: None
+            if row.wip_limit is None
+            else max(row.wip_limit - row.task_count, 0)
+            for row in result.all()
+        }
 
-        return result.scalar_one_or_none()
+    async def reserve_slots(
+        self, column_id: int, board_id: int, count: int = 1
+    ) -> bool:
+        """WIP admission: conditional in-database increment of task_count.
+        The UPDATE takes the column row lock, so concurrent admissions to the
+        same column are serialized until commit and can never overshoot
+        wip_limit. False when the column is full or does not exist."""
+        result = await self.session.execute(
+            update(Columns)
+            .where(
+                Columns.id == column_id,
+                Columns.board_id == board_id,
+                or_(
+                    Columns.wip_limit.is_(None),
+                    Columns.task_count + count <= Columns.wip_limit,
+                ),
+            )
+            .values(task_count=Columns.task_count + count)
+            .returning(Columns.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def release_slots(self, column_id: int, count: int = 1) -> None:
+        """Counterpart of reserve_slots for tasks leaving the column: atomic
+        in-database decrement of task_count"""
+        await self.session.execute(
+            update(Columns)
+            .where(Columns.id == column_id)
+            .values(task_count=Columns.task_count - count)
+        )
+
+    async def dense_boards(self, max_length: int, limit: int) -> list[int]:
+        """Boards holding column keys longer than max_length. Column keys are
+        unique per board, so unlike tasks they can not repeat"""
+        query = (
+            select(Columns.board_id)
+            .group_by(Columns.board_id)
+            .having(func.max(func.length(Columns.position)) > max_length)
+            .limit(limit)
+        )
+        return list(await self.session.scalars(query))
+
+    async def rebalance_positions(self, board_id: int, max_length: int) -> int | None:
+        """Respreads the dense runs of the board columns, see
+        TasksRepo.rebalance_positions"""
+        query = (
+            select(Columns.id, Columns.position)
+            .where(Columns.board_id == board_id)
+            .order_by(Columns.position, Columns.id)
+            .with_for_update()
+        )
+        rows = (await self.session.execute(query)).all()
+        changed = rebalance([row.position for row in rows], max_length)
+        if not changed:
+            return None
+        positions = {rows[index].id: key for index, key in changed.items()}
+        await renumber_positions(
+            self.session, Columns, {row.id: row.position for row in rows}, positions
+        )
+        return await record_rebalanced(
+            self.session, board_id, ChangeEntity.COLUMN, board_id, positions
+        )
 
     async def get_column_with_tasks(
         self, column_id: int, board_id: int
     ) -> Columns | None:
         """Get full info about the column(tasks and column info)"""
-        query = self._query_builder(column_id=column_id, board_id=board_id)
-        query = query.options(selectinload(Columns.tasks))
-        result = await self.session.execute(query)
+        result = await self.session.execute(
+            _COLUMN_WITH_TASKS, {"column_id": column_id, "board_id": board_id}
+        )
         return result.scalar_one_or_none()
 
     async def add_column(self, board_id: int, column_data: ColumnCreate) -> Columns:
-        """Creates a new column. If position is not set, sets max position + 1"""
+        """Creates a new column. If position is not set, appends it after the
+        last column"""
         if not column_data.position:
             column_data.position = await self._new_column_position(board_id=board_id)
         new_column = await super().create(column_data, board_id=board_id)
-
+        await record_board_change(
+            self.session,
+            board_id,
+            "column_created",
+            self._column_payload(new_column),
+            entity=ChangeEntity.COLUMN,
+            entity_ids=[new_column.id],
+        )
         return new_column
 
     async def update_column(
@@ -58,11 +179,45 @@ class ColumnsRepo(BaseRepository[Columns, ColumnCreate, ColumnUpdate]):
         result: None | Columns = await super().update(
             new_data, board_id=board_id, id=column_id
         )
+        if result is not None:
+            await record_board_change(
+                self.session,
+                board_id,
+                "column_updated",
+                self._column_payload(result),
+                entity=ChangeEntity.COLUMN,
+                entity_ids=[column_id],
+            )
         return result
 
     async def drop_column(self, column_id: int, board_id: int) -> None | bool:
-        """Tries to delete the column. If column not found, returns None"""
-
+        """Tries to delete the column. If column not found, returns None.
+        Its tasks are deleted by the cascade and get tombstones as well"""
+        task_ids = (
+            await self.session.scalars(
+                select(Tasks.id).where(
+                    Tasks.column_id == column_id, Tasks.board_id == board_id
+                )
+            )
+        ).all()
         column: None | bool = await super().delete(id=column_id, board_id=board_id)
-
+        if column:
+            version = await record_board_change(
+                self.session,
+                board_id,
+                "column_deleted",
+                {"column_id": column_id},
+                entity=ChangeEntity.COLUMN,
+                entity_ids=[column_id],
+                deleted=True,
+            )
+            if version is not None:
+                await log_changes(
+                    self.session,
+                    board_id,
+                    version,
+                    ChangeEntity.TASK,
+                    task_ids,
+                    deleted=True,
+                )
         return column
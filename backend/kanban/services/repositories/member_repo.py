@@ -1,40 +1,45 @@
 from uuid import UUID
 
-from sqlalchemy import Select, exists, func, select
+from sqlalchemy import bindparam, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.kanban.core.security.role_cache import role_cache
+from backend.kanban.core.utility.change_entity import ChangeEntity
 from backend.kanban.core.utility.role_enum import RoleEnum
+from backend.kanban.database.commit_hooks import after_commit
 from backend.kanban.models.models import BoardMembers
 from backend.kanban.schemas.member_schema import (
     AddBoardMemberUUID,
     UpdateMemberWithId,
 )
+from backend.kanban.services.repositories.board_version import record_board_change
 from backend.kanban.services.repositories.generic_repo import BaseRepository
 
 
+# built once, see tasks_repo
+_MEMBERSHIP = select(BoardMembers).where(
+    BoardMembers.user_id == bindparam("user_id"),
+    BoardMembers.board_id == bindparam("board_id"),
+)
+_IS_MEMBER = select(
+    exists().where(
+        BoardMembers.board_id == bindparam("board_id"),
+        BoardMembers.user_id == bindparam("user_id"),
+    )
+)
+
+
 class MemberRepo(BaseRepository[BoardMembers, AddBoardMemberUUID, UpdateMemberWithId]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, BoardMembers)
 
-    def _query_builder(
-        self, board_id: int, user_id: UUID
-    ) -> Select[tuple[BoardMembers]]:
-        return select(BoardMembers).where(
-            BoardMembers.user_id == user_id,
-            BoardMembers.board_id == board_id,
-        )
-
-    def _membership_record_builder(self, board_id: int, user_id: UUID) -> Select:
-        return select(
-            exists().where(
-                BoardMembers.board_id == board_id,
-                BoardMembers.user_id == user_id,
-            )
-        )
+    def _invalidate_role(self, board_id: int, user_id: UUID) -> None:
+        """Drops the cached role once the membership change is committed"""
+        after_commit(self.session, lambda: role_cache.invalidate(board_id, user_id))
 
     async def _existing_user(self, board_id: int, user_id: UUID) -> bool:
         result = await self.session.execute(
-            self._membership_record_builder(board_id=board_id, user_id=user_id)
+            _IS_MEMBER, {"board_id": board_id, "user_id": user_id}
         )
         return bool(result.scalar())
 
@@ -51,8 +56,9 @@ class MemberRepo(BaseRepository[BoardMembers, AddBoardMemberUUID, UpdateMemberWi
         Returns:
             scalar result | None
         """
-        query = self._query_builder(board_id=board_id, user_id=user_id)
-        result = await self.session.execute(query)
+        result = await self.session.execute(
+            _MEMBERSHIP, {"board_id": board_id, "user_id": user_id}
+        )
         return result.scalar_one_or_none()
 
     async def _get_admin_count(self, board_id: int) -> int:
@@ -83,6 +89,15 @@ class MemberRepo(BaseRepository[BoardMembers, AddBoardMemberUUID, UpdateMemberWi
         if new_user_data.role == RoleEnum.ADMIN:
             return "conflict"
         await super().create(new_user_data, board_id=board_id)
+        await record_board_change(
+            self.session,
+            board_id,
+            "member_added",
+            {"user_id": str(new_user_data.user_id), "role": new_user_data.role.value},
+            entity=ChangeEntity.MEMBER,
+            entity_ids=[new_user_data.user_id],
+        )
+        self._invalidate_role(board_id, new_user_data.user_id)
         return True
 
     async def update_member_role(
@@ -115,6 +130,15 @@ class MemberRepo(BaseRepository[BoardMembers, AddBoardMemberUUID, UpdateMemberWi
         )
         if await self._get_admin_count(board_id=member_data.id) < 1:
             return None
+        await record_board_change(
+            self.session,
+            member_data.id,
+            "member_updated",
+            {"user_id": str(member_data.user_id), "role": member_data.role.value},
+            entity=ChangeEntity.MEMBER,
+            entity_ids=[member_data.user_id],
+        )
+        self._invalidate_role(member_data.id, member_data.user_id)
         return new_value
 
     async def delete_member_from_the_board(
@@ -143,4 +167,14 @@ class MemberRepo(BaseRepository[BoardMembers, AddBoardMemberUUID, UpdateMemberWi
                 return "last admin"
         if not (await super().delete(board_id=board_id, user_id=user_id)):
             return None
+        await record_board_change(
+            self.session,
+            board_id,
+            "member_removed",
+            {"user_id": str(user_id)},
+            entity=ChangeEntity.MEMBER,
+            entity_ids=[user_id],
+            deleted=True,
+        )
+        self._invalidate_role(board_id, user_id)
         return True
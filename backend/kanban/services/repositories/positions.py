@@ -0,0 +1,65 @@
+from sqlalchemy import Integer, String, column, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.core.utility.change_entity import ChangeEntity
+from backend.kanban.models.models import Columns, Tasks
+from backend.kanban.services.repositories.board_version import (
+    record_board_change,
+    split_event_data,
+)
+
+
+async def renumber_positions(
+    session: AsyncSession,
+    model: type[Columns | Tasks],
+    current: dict[int, str],
+    positions: dict[int, str],
+) -> None:
+    """Writes new ordering keys in a single UPDATE ... FROM (VALUES ...). \n
+    Unique constraints are checked row by row. If a new key is the old key
+    of another renumbered row, the rows are moved aside first. The "~" suffix
+    sorts after every key digit and never reaches the clients."""
+    if set(positions.values()) & {current[id] for id in positions}:
+        await session.execute(
+            update(model)
+            .where(model.id.in_(positions))
+            .values(position=model.position + "~")
+            .execution_options(synchronize_session=False)
+        )
+    renumbered = values(
+        column("id", Integer), column("position", String), name="renumbered"
+    ).data(list(positions.items()))
+    await session.execute(
+        update(model)
+        .where(model.id == renumbered.c.id)
+        .values(position=renumbered.c.position)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def record_rebalanced(
+    session: AsyncSession,
+    board_id: int,
+    entity: ChangeEntity,
+    parent_id: int,
+    positions: dict[int, str],
+) -> int | None:
+    """Records the positions_rebalanced event of a renumbering. A large
+    renumbering is split into several events, each below the NOTIFY limit.
+    Returns the last board version"""
+    data = {
+        "entity": entity.value,
+        "parent_id": parent_id,
+        "positions": {str(id): key for id, key in positions.items()},
+    }
+    version = None
+    for part in split_event_data(board_id, "positions_rebalanced", data, "positions"):
+        version = await record_board_change(
+            session,
+            board_id,
+            "positions_rebalanced",
+            part,
+            entity=entity,
+            entity_ids=[int(id) for id in part["positions"]],
+        )
+    return version
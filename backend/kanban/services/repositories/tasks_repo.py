@@ -1,47 +1,88 @@
-from decimal import Decimal
-from uuid import UUID
+from typing import Any
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import (
+    Integer,
+    String,
+    bindparam,
+    column,
+    distinct,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from backend.kanban.core.utility.change_entity import ChangeEntity
+from backend.kanban.core.utility.ordering_key import key_between, rebalance
 from backend.kanban.models.models import Columns, Tasks
-from backend.kanban.schemas.tasks_schema import CreateTask, UpdateTask
+from backend.kanban.schemas.tasks_schema import CreateTask, TaskView, UpdateTask
+from backend.kanban.services.repositories.board_version import (
+    record_board_change,
+    split_event_data,
+)
 from backend.kanban.services.repositories.generic_repo import BaseRepository
+from backend.kanban.services.repositories.positions import (
+    record_rebalanced,
+    renumber_positions,
+)
+
+
+# Statements of the per-request paths are built once. A reused statement keeps
+# its cache key, so SQLAlchemy finds the compiled SQL (and asyncpg the
+# prepared statement) without rebuilding and re-hashing the construct.
+_TASK_IN_COLUMN = select(Tasks).where(
+    Tasks.board_id == bindparam("board_id"),
+    Tasks.column_id == bindparam("column_id"),
+    Tasks.id == bindparam("task_id"),
+)
+_TASK_BY_ID = select(Tasks).where(Tasks.id == bindparam("task_id"))
+_LOCKED_TASK = _TASK_BY_ID.with_for_update().execution_options(populate_existing=True)
+_LAST_POSITION = select(func.max(Tasks.position)).where(
+    Tasks.column_id == bindparam("column_id")
+)
 
 
 class TasksRepo(BaseRepository[Tasks, CreateTask, UpdateTask]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Tasks)
 
-    def _query_builder(
-        self,
-        board_id: int,
-        column_id: int,
-        task_id: int | None = None,
-        assignee_id: UUID | None = None,
-    ) -> Select:
-        query = select(Tasks).filter_by(board_id=board_id, column_id=column_id)
-        if assignee_id:
-            query = query.filter_by(assignee_id=assignee_id)
-        if task_id:
-            query = query.filter_by(id=task_id)
-        return query
+    @staticmethod
+    def _task_payload(task: Tasks) -> dict[str, Any]:
+        return {
+            "task_id": task.id,
+            "column_id": task.column_id,
+            "task": TaskView.model_validate(task).model_dump(mode="json"),
+        }
 
     async def _get_task_by_id(self, task_id: int) -> Tasks | None:
-        query = select(Tasks).where(Tasks.id == task_id)
-        result = await self.session.execute(query)
+        result = await self.session.execute(_TASK_BY_ID, {"task_id": task_id})
+        return result.scalar_one_or_none()
+
+    async def lock_task(self, task_id: int) -> Tasks | None:
+        """The task row locked until commit, refreshed from the database.
+        Concurrent moves of the task wait here and then see its new column"""
+        result = await self.session.execute(_LOCKED_TASK, {"task_id": task_id})
         return result.scalar_one_or_none()
 
-    async def _get_position(self, column_id: int) -> Decimal:
-        query = select(func.max(Tasks.position)).filter_by(column_id=column_id)
-        current_max = await self.session.scalar(query) or Decimal("1.0")
-        return current_max
+    async def _get_position(self, column_id: int) -> str:
+        """Ordering key after the last task. Read after the slot reservation,
+        so concurrent creations see each other's tasks"""
+        last = await self.session.scalar(_LAST_POSITION, {"column_id": column_id})
+        return key_between(last, None)
 
-    async def _position_map(self, task_ids: list[int]) -> dict[int, Decimal]:
+    async def _position_map(
+        self, task_ids: list[int], column_id: int
+    ) -> dict[int, str]:
+        """Ordering keys of the given tasks of the column"""
         if not task_ids:
             return {}
-        query = select(Tasks.id, Tasks.position).where(Tasks.id.in_(task_ids))
+        query = select(Tasks.id, Tasks.position).where(
+            Tasks.id.in_(task_ids), Tasks.column_id == column_id
+        )
         result = await self.session.execute(query)
         return {row.id: row.position for row in result.all()}
 
@@ -62,13 +103,20 @@ class TasksRepo(BaseRepository[Tasks, CreateTask, UpdateTask]):
             Tasks | None
         """
         if new_task.position is None:
-            current_max: Decimal = await self._get_position(column_id)
-            new_task.position: Decimal = current_max
+            new_task.position = await self._get_position(column_id)
         result: Tasks = await super().create(
             new_task,
             board_id=board_id,
             column_id=column_id,
         )
+        await record_board_change(
+            self.session,
+            board_id,
+            "task_created",
+            self._task_payload(result),
+            entity=ChangeEntity.TASK,
+            entity_ids=[result.id],
+        )
         return result
 
     async def get_tasks_for_the_board(
@@ -103,10 +151,10 @@ class TasksRepo(BaseRepository[Tasks, CreateTask, UpdateTask]):
         Returns:
             Tasks | None
         """
-        query = self._query_builder(
-            board_id=board_id, column_id=column_id, task_id=task_id
+        result = await self.session.execute(
+            _TASK_IN_COLUMN,
+            {"board_id": board_id, "column_id": column_id, "task_id": task_id},
         )
-        result = await self.session.execute(query)
         row: Tasks | None = result.scalar_one_or_none()
         return row
 
@@ -126,12 +174,22 @@ class TasksRepo(BaseRepository[Tasks, CreateTask, UpdateTask]):
         result: Tasks | None = await super().update(
             data_to_update, board_id=board_id, column_id=column_id, id=task_id
         )
+        if result is not None:
+            await record_board_change(
+                self.session,
+                board_id,
+                "task_updated",
+                self._task_payload(result),
+                entity=ChangeEntity.TASK,
+                entity_ids=[task_id],
+            )
         return result
 
     async def delete_task(
         self, board_id: int, column_id: int, task_id: int
     ) -> bool | None:
-        """Tries to delete a task from the column. If fails, returns None
+        """Tries to delete a task from the column. If fails, returns None.
+        The task count is adjusted by the caller
 
         Args:
             board_id (int)
@@ -144,4 +202,171 @@ class TasksRepo(BaseRepository[Tasks, CreateTask, UpdateTask]):
         result = await super().delete(
             board_id=board_id, column_id=column_id, id=task_id
         )
+        if result:
+            await record_board_change(
+                self.session,
+                board_id,
+                "task_deleted",
+                {"task_id": task_id, "column_id": column_id},
+                entity=ChangeEntity.TASK,
+                entity_ids=[task_id],
+                deleted=True,
+            )
         return result
+
+    async def bulk_create(
+        self, board_id: int, tasks: list[dict[str, Any]]
+    ) -> list[int]:
+        """Inserts the task rows in batched multi-row INSERT ... RETURNING
+        statements. Returns the ids in the order of the rows. Records one
+        tasks_imported event instead of an event per task. Task counts are
+        adjusted by the caller"""
+        if not tasks:
+            return []
+        result = await self.session.scalars(
+            insert(Tasks).returning(Tasks.id, sort_by_parameter_order=True),
+            [{**task, "board_id": board_id} for task in tasks],
+        )
+        ids = list(result)
+        columns: dict[int, int] = {}
+        for task in tasks:
+            columns[task["column_id"]] = columns.get(task["column_id"], 0) + 1
+        await record_board_change(
+            self.session,
+            board_id,
+            "tasks_imported",
+            {
+                "count": len(ids),
+                "columns": {str(id): count for id, count in columns.items()},
+            },
+            entity=ChangeEntity.TASK,
+            entity_ids=ids,
+        )
+        return ids
+
+    async def task_placements(
+        self, board_id: int, task_ids: set[int]
+    ) -> dict[int, tuple[int, str]]:
+        """{task_id: (column_id, position)} of the board tasks, locked until
+        commit"""
+        query = (
+            select(Tasks.id, Tasks.column_id, Tasks.position)
+            .where(Tasks.board_id == board_id, Tasks.id.in_(task_ids))
+            .order_by(Tasks.id)
+            .with_for_update()
+        )
+        result = await self.session.execute(query)
+        return {row.id: (row.column_id, row.position) for row in result.all()}
+
+    async def last_positions(self, column_ids: set[int]) -> dict[int, str]:
+        """Largest ordering key of each non-empty column"""
+        query = (
+            select(Tasks.column_id, func.max(Tasks.position).label("position"))
+            .where(Tasks.column_id.in_(column_ids))
+            .group_by(Tasks.column_id)
+        )
+        result = await self.session.execute(query)
+        return {row.column_id: row.position for row in result.all()}
+
+    async def move_tasks(
+        self, board_id: int, placements: dict[int, tuple[int, str]]
+    ) -> list[Tasks]:
+        """Applies {task_id: (column_id, position)} in one bulk UPDATE and
+        records a tasks_moved event for the whole batch, split into several
+        when it would exceed the NOTIFY limit. Task counts are adjusted by the
+        caller"""
+        moved = values(
+            column("id", Integer),
+            column("column_id", Integer),
+            column("position", String),
+            name="moved",
+        ).data([(id, *placement) for id, placement in placements.items()])
+        result = await self.session.scalars(
+            update(Tasks)
+            .where(Tasks.id == moved.c.id)
+            .values(column_id=moved.c.column_id, position=moved.c.position)
+            .returning(Tasks)
+            .execution_options(synchronize_session=False)
+        )
+        tasks = sorted(result, key=lambda task: task.id)
+        data = {
+            "moves": [
+                {
+                    "task_id": task.id,
+                    "new_column_id": task.column_id,
+                    "new_position": task.position,
+                }
+                for task in tasks
+            ]
+        }
+        for part in split_event_data(board_id, "tasks_moved", data, "moves"):
+            await record_board_change(
+                self.session,
+                board_id,
+                "tasks_moved",
+                part,
+                entity=ChangeEntity.TASK,
+                entity_ids=[move["task_id"] for move in part["moves"]],
+            )
+        return tasks
+
+    async def dense_columns(self, max_length: int, limit: int) -> list[tuple[int, int]]:
+        """(board_id, column_id) of the columns holding task keys longer than
+        max_length, or the same key more than once"""
+        query = (
+            select(Tasks.board_id, Tasks.column_id)
+            .group_by(Tasks.board_id, Tasks.column_id)
+            .having(
+                or_(
+                    func.max(func.length(Tasks.position)) > max_length,
+                    func.count() > func.count(distinct(Tasks.position)),
+                )
+            )
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [(row.board_id, row.column_id) for row in result.all()]
+
+    async def rebalance_positions(
+        self, board_id: int, column_id: int, max_length: int
+    ) -> int | None:
+        """Respreads the dense runs of the column. The tasks stay locked until
+        commit, so concurrent moves in the column wait for the new keys.
+        Returns the board version, None when the column needed nothing"""
+        query = (
+            select(Tasks.id, Tasks.position)
+            .where(Tasks.board_id == board_id, Tasks.column_id == column_id)
+            .order_by(Tasks.position, Tasks.id)
+            .with_for_update()
+        )
+        rows = (await self.session.execute(query)).all()
+        changed = rebalance([row.position for row in rows], max_length)
+        if not changed:
+            return None
+        positions = {rows[index].id: key for index, key in changed.items()}
+        await renumber_positions(
+            self.session, Tasks, {row.id: row.position for row in rows}, positions
+        )
+        return await record_rebalanced(
+            self.session, board_id, ChangeEntity.TASK, column_id, positions
+        )
+
+    async def move_task(self, task: Tasks, column_id: int, position: str) -> int | None:
+        """Moves the task to the column/position. Task counts are adjusted by
+        the caller. Returns the new board version, used as the event sequence
+        number"""
+        task.column_id = column_id
+        task.position = position
+        await self.session.flush()
+        return await record_board_change(
+            self.session,
+            task.board_id,
+            "task_moved",
+            {
+                "task_id": task.id,
+                "new_column_id": task.column_id,
+                "new_position": task.position,
+            },
+            entity=ChangeEntity.TASK,
+            entity_ids=[task.id],
+        )
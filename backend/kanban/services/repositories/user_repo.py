@@ -1,9 +1,13 @@
 import logging
+from uuid import UUID
 
+from pydantic import BaseModel
 from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import load_only
 
+from backend.kanban.core.security.principal_cache import principal_cache
+from backend.kanban.database.commit_hooks import after_commit
 from backend.kanban.models.models import User
 from backend.kanban.schemas.user_schema import UserCredentials
 from backend.kanban.services.repositories.generic_repo import BaseRepository
@@ -16,9 +20,39 @@ class UserRepository(BaseRepository[User, UserCredentials]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, User)
 
+    def _invalidate_principal(self, user: User) -> None:
+        """Drops the cached principal once the change is committed"""
+        user_id = user.id
+        after_commit(self.session, lambda: principal_cache.invalidate(user_id))
+
+    async def update(
+        self,
+        data_to_update: BaseModel,
+        **filters: object,
+    ) -> None | User:
+        if (user := await super().update(data_to_update, **filters)) is not None:
+            self._invalidate_principal(user)
+        return user
+
+    async def delete(self, **filters: object) -> None | bool:
+        if not (user := await self.get_entity(**filters)):
+            return None
+        self._invalidate_principal(user)
+        await self.session.delete(user)
+        await self.session.flush()
+        return True
+
     def _get_user_by_email_helper(self, email: str) -> Select[tuple[User]]:
         return select(User).where(User.email == email)
 
+    async def get_ids_by_emails(self, emails: set[str]) -> dict[str, UUID]:
+        """{email: user id} of the existing users, in one query"""
+        if not emails:
+            return {}
+        query = select(User.email, User.id).where(User.email.in_(emails))
+        result = await self.session.execute(query)
+        return {row.email: row.id for row in result.all()}
+
     async def _check_if_email_exists(self, email: str) -> bool:
         """method to check if email is taken or not \n
         True if exists, False if not
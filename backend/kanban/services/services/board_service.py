@@ -1,19 +1,69 @@
-from collections.abc import Sequence
+from collections import Counter
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Final
 from uuid import UUID
 
+from pydantic import BaseModel
+
 from backend.kanban.core.decorators.read_only import read_only
 from backend.kanban.core.decorators.transactional import transactional
 from backend.kanban.core.exception_mappers.board_mapper import ERROR_MAP
+from backend.kanban.core.exceptions.board_exceptions import BoardImportInvalid
+from backend.kanban.core.utility.change_entity import ChangeEntity
+from backend.kanban.core.utility.cursor import encode_cursor
 from backend.kanban.core.utility.exception_map_keys import BoardErrorKeys
+from backend.kanban.core.utility.ndjson import ndjson_chunk, ndjson_line
+from backend.kanban.core.utility.role_enum import RoleEnum
 from backend.kanban.database.unit_of_work import UnitOfWork
 from backend.kanban.models.models import Boards
 from backend.kanban.schemas.board_schema import (
+    BoardChanges,
+    BoardClone,
+    BoardCloneResult,
     BoardCreate,
+    BoardExportRecord,
     BoardFullView,
     BoardGet,
+    BoardGetBase,
+    BoardImportResult,
+    BoardPage,
+    BoardReadOptions,
+    BoardRecord,
     BoardUpdate,
+    ColumnRecord,
+    ExportColumn,
+    ExportMember,
+    ExportTask,
+    MemberChangeView,
+    MemberView,
+    StreamTaskView,
+    TaskRecord,
+    sparse_board_view,
 )
+from backend.kanban.schemas.columns_schema import ColumnGet
 from backend.kanban.schemas.pagination_schema import Pagination
+from backend.kanban.schemas.user_schema import UserGetForTotal
+
+
+IMPORT_CHUNK_SIZE: Final[int] = 1000
+
+
+@dataclass
+class _BoardImport:
+    """What an import keeps between chunks. Only the per-column maps and the
+    assignee emails grow with the board, the tasks themselves do not"""
+
+    board_id: int
+    result: BoardImportResult
+    members: set[UUID]
+    columns: dict[int, int] = field(default_factory=dict)  # exported id: new id
+    # by exported column id, filled while the records are read
+    wip_limits: dict[int, int | None] = field(default_factory=dict)
+    positions: set[str] = field(default_factory=set)
+    task_counts: Counter[int] = field(default_factory=Counter)
+    assignees: dict[str, UUID | None] = field(default_factory=dict)
 
 
 class BoardService:
@@ -31,17 +81,318 @@ class BoardService:
         return BoardGet.model_validate(result)
 
     @read_only
-    async def get_boards(self, user_id: UUID, pagination: Pagination) -> list[BoardGet]:
+    async def get_boards(self, user_id: UUID, pagination: Pagination) -> BoardPage:
         result: Sequence[Boards] = await self.uow.boards.get_boards(
             user_id=user_id, pagination=pagination
         )
-        return [BoardGet.model_validate(values) for values in result]
+        page = result[: pagination.limit]
+        next_cursor: str | None = None
+        if len(result) > pagination.limit:
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+        return BoardPage(
+            items=[BoardGet.model_validate(values) for values in page],
+            next_cursor=next_cursor,
+        )
 
     @read_only
-    async def get_board(self, user_id: UUID, id: int) -> BoardFullView:
-        if not (result := await self.uow.boards.get_board(user_id=user_id, id=id)):
+    async def get_board(
+        self,
+        user_id: UUID,
+        id: int,
+        read_options: BoardReadOptions | None = None,
+    ) -> BoardFullView | BaseModel:
+        """Full board view, or a trimmed one when read_options narrow it"""
+        read_options = read_options or BoardReadOptions()
+        if not (
+            result := await self.uow.boards.get_board(
+                user_id=user_id, id=id, read_options=read_options
+            )
+        ):
+            raise ERROR_MAP[BoardErrorKeys.NOT_FOUND]()
+        if read_options.is_full:
+            return BoardFullView.model_validate(result)
+        view = sparse_board_view(read_options.relations, read_options.fields)
+        return view.model_validate(result)
+
+    @read_only
+    async def get_board_version(self, user_id: UUID, id: int) -> int:
+        if (
+            version := await self.uow.boards.get_version(board_id=id, user_id=user_id)
+        ) is None:
+            raise ERROR_MAP[BoardErrorKeys.NOT_FOUND]()
+        return version
+
+    @read_only
+    async def get_changes(self, user_id: UUID, id: int, since: int) -> BoardChanges:
+        """Delta of the board after the since version, read from the change
+        log. A since below the compaction floor or ahead of the board gives
+        a reset instead."""
+        if (state := await self.uow.boards.get_sync_state(id, user_id)) is None:
+            raise ERROR_MAP[BoardErrorKeys.NOT_FOUND]()
+        changes = BoardChanges(board_id=id, since=since, version=state.version)
+        if since < state.changes_floor or since > state.version:
+            changes.reset = True
+            return changes
+        changed: dict[str, list[str]] = {}
+        for row in await self.uow.boards.get_changes(id, since):
+            if row.deleted:
+                match row.entity:
+                    case ChangeEntity.COLUMN:
+                        changes.deleted_columns.append(int(row.entity_id))
+                    case ChangeEntity.TASK:
+                        changes.deleted_tasks.append(int(row.entity_id))
+                    case ChangeEntity.MEMBER:
+                        changes.deleted_members.append(UUID(row.entity_id))
+            else:
+                changed.setdefault(row.entity, []).append(row.entity_id)
+        if ChangeEntity.BOARD in changed:
+            header = await self.uow.boards.get_board_header(user_id=user_id, id=id)
+            changes.board = BoardGetBase.model_validate(header)
+        if column_ids := changed.get(ChangeEntity.COLUMN):
+            rows = await self.uow.boards.get_columns_by_ids(
+                id, list(map(int, column_ids))
+            )
+            changes.columns = [ColumnGet.model_validate(row) for row in rows]
+        if task_ids := changed.get(ChangeEntity.TASK):
+            rows = await self.uow.boards.get_tasks_by_ids(id, list(map(int, task_ids)))
+            changes.tasks = [StreamTaskView.model_validate(row) for row in rows]
+        if member_ids := changed.get(ChangeEntity.MEMBER):
+            rows = await self.uow.boards.get_members_by_ids(
+                id, list(map(UUID, member_ids))
+            )
+            changes.members = [MemberChangeView.model_validate(row) for row in rows]
+        return changes
+
+    @read_only
+    async def get_board_header(self, user_id: UUID, id: int) -> BoardGet:
+        if not (
+            result := await self.uow.boards.get_board_header(user_id=user_id, id=id)
+        ):
             raise ERROR_MAP[BoardErrorKeys.NOT_FOUND]()
-        return BoardFullView.model_validate(result)
+        return BoardGet.model_validate(result)
+
+    async def stream_board(self, board: BoardGet) -> AsyncIterator[bytes]:
+        """NDJSON view of the board: board, members, columns, then tasks
+        ordered by column and position. Rows are read through a server-side
+        cursor, so memory does not grow with the board size.
+        Access is checked beforehand with get_board_header."""
+        async with self.uow:
+            yield ndjson_line("board", board)
+            async for members in self.uow.boards.stream_members(board.id):
+                yield ndjson_chunk(
+                    "member",
+                    (
+                        MemberView(
+                            role=row.role,
+                            user=UserGetForTotal(email=row.email, name=row.name),
+                        )
+                        for row in members
+                    ),
+                )
+            async for columns in self.uow.boards.stream_columns(board.id):
+                yield ndjson_chunk(
+                    "column", (ColumnGet.model_validate(row) for row in columns)
+                )
+            async for tasks in self.uow.boards.stream_tasks(board.id):
+                yield ndjson_chunk(
+                    "task", (StreamTaskView.model_validate(row) for row in tasks)
+                )
+
+    async def export_board(self, board: BoardGet) -> AsyncIterator[bytes]:
+        """NDJSON export in the format import_board reads: the board, members
+        by email, columns, then tasks with the email of their assignee. Read
+        through server-side cursors like stream_board"""
+        async with self.uow:
+            yield ndjson_line("board", BoardCreate.model_validate(board.model_dump()))
+            async for members in self.uow.boards.stream_members(board.id):
+                yield ndjson_chunk(
+                    "member", (ExportMember.model_validate(row) for row in members)
+                )
+            async for columns in self.uow.boards.stream_columns(board.id):
+                yield ndjson_chunk(
+                    "column", (ExportColumn.model_validate(row) for row in columns)
+                )
+            async for tasks in self.uow.boards.stream_export_tasks(board.id):
+                yield ndjson_chunk(
+                    "task", (ExportTask.model_validate(row) for row in tasks)
+                )
+
+    @transactional
+    async def import_board(
+        self, owner_id: UUID, records: AsyncIterator[tuple[int, BoardExportRecord]]
+    ) -> BoardImportResult:
+        """Creates a new board owned by owner_id from an export. \n
+        Records are written in chunks of IMPORT_CHUNK_SIZE with multi-row
+        INSERTs while the upload is still read, columns and tasks get new
+        ids. Members and assignees are matched by email, unknown members are
+        skipped and unknown assignees left out. Every record is checked
+        against the ones before it as it is read, errors name its line. All
+        or nothing: the import is a single transaction."""
+        number, first = await anext(records, (1, None))
+        if not isinstance(first, BoardRecord):
+            raise BoardImportInvalid(f"line {number}: the export starts with the board")
+        board = await self.uow.boards.create_board(
+            owner_id=owner_id, board_data=first.data
+        )
+        state = _BoardImport(
+            board_id=board.id,
+            result=BoardImportResult(board=BoardGet.model_validate(board)),
+            members={owner_id},
+        )
+        kind, chunk = "", []
+        async for number, record in records:
+            self._check_record(state, number, record)
+            if chunk and (record.type != kind or len(chunk) == IMPORT_CHUNK_SIZE):
+                await self._import_chunk(state, kind, chunk)
+                chunk = []
+            kind = record.type
+            chunk.append(record.data)
+        if chunk:
+            await self._import_chunk(state, kind, chunk)
+        await self.uow.boards.finish_import(
+            board.id,
+            {state.columns[id]: count for id, count in state.task_counts.items()},
+        )
+        return state.result
+
+    @staticmethod
+    def _check_record(
+        state: _BoardImport, number: int, record: BoardExportRecord
+    ) -> None:
+        """Checks what the database would reject only at the end, or not at
+        all: column ids and positions are unique, tasks belong to an exported
+        column and no column gets more tasks than its WIP limit"""
+        match record:
+            case BoardRecord():
+                raise BoardImportInvalid(
+                    f"line {number}: the export has more than one board"
+                )
+            case ColumnRecord(data=column):
+                if column.id in state.wip_limits:
+                    raise BoardImportInvalid(
+                        f"line {number}: column {column.id} is exported more than once"
+                    )
+                if column.position in state.positions:
+                    raise BoardImportInvalid(
+                        f"line {number}: column position {column.position} is "
+                        "already taken"
+                    )
+                state.wip_limits[column.id] = column.wip_limit
+                state.positions.add(column.position)
+            case TaskRecord(data=task):
+                if task.column_id not in state.wip_limits:
+                    raise BoardImportInvalid(
+                        f"line {number}: column {task.column_id} of task {task.id} "
+                        "is not in the export"
+                    )
+                state.task_counts[task.column_id] += 1
+                limit = state.wip_limits[task.column_id]
+                if limit is not None and state.task_counts[task.column_id] > limit:
+                    raise BoardImportInvalid(
+                        f"line {number}: column {task.column_id} has more tasks "
+                        f"than its WIP limit of {limit}"
+                    )
+
+    async def _import_chunk(
+        self,
+        state: _BoardImport,
+        kind: str,
+        chunk: list[ExportMember] | list[ExportColumn] | list[ExportTask],
+    ) -> None:
+        """Writes a chunk of records of one kind"""
+        match kind:
+            case "member":
+                await self._import_members(state, chunk)
+            case "column":
+                await self._import_columns(state, chunk)
+            case "task":
+                await self._import_tasks(state, chunk)
+
+    async def _import_members(
+        self, state: _BoardImport, members: list[ExportMember]
+    ) -> None:
+        users = await self.uow.users.get_ids_by_emails(
+            {member.email for member in members}
+        )
+        added: dict[UUID, RoleEnum] = {}
+        for member in members:
+            if (user_id := users.get(member.email)) is None:
+                state.result.skipped_members.append(member.email)
+            elif user_id not in state.members:
+                state.members.add(user_id)
+                added[user_id] = member.role
+        await self.uow.boards.import_members(state.board_id, added)
+        state.result.members += len(added)
+
+    async def _import_columns(
+        self, state: _BoardImport, columns: list[ExportColumn]
+    ) -> None:
+        ids = await self.uow.boards.import_columns(
+            state.board_id,
+            [column.model_dump(exclude={"id"}) for column in columns],
+        )
+        state.columns.update(
+            (column.id, id) for column, id in zip(columns, ids, strict=True)
+        )
+        state.result.columns += len(ids)
+
+    async def _import_tasks(self, state: _BoardImport, tasks: list[ExportTask]) -> None:
+        emails = {
+            task.email
+            for task in tasks
+            if task.email and task.email not in state.assignees
+        }
+        users = await self.uow.users.get_ids_by_emails(emails)
+        state.assignees.update((email, users.get(email)) for email in emails)
+        now = datetime.now(tz=UTC)
+        rows: list[dict[str, object]] = [
+            {
+                "column_id": state.columns[task.column_id],
+                "title": task.title,
+                "description": task.description,
+                "position": task.position,
+                "assignee_id": state.assignees[task.email] if task.email else None,
+                "created_at": task.created_at or now,
+            }
+            for task in tasks
+        ]
+        await self.uow.boards.import_tasks(state.board_id, rows)
+        state.result.tasks += len(rows)
+
+    @transactional
+    async def clone_board(
+        self, user_id: UUID, id: int, options: BoardClone
+    ) -> BoardCloneResult:
+        """Copies a board the user is a member of into a new board owned by
+        the user. Everything is copied inside the database with INSERT ...
+        SELECT, one statement per table, so the time hardly depends on the
+        number of tasks"""
+        if not (
+            source := await self.uow.boards.get_board_header(user_id=user_id, id=id)
+        ):
+            raise ERROR_MAP[BoardErrorKeys.NOT_FOUND]()
+        board = await self.uow.boards.create_board(
+            owner_id=user_id,
+            board_data=BoardCreate(
+                name=options.name or source.name,
+                description=(
+                    source.description
+                    if options.description is None
+                    else options.description
+                ),
+            ),
+        )
+        result = BoardCloneResult(board=BoardGet.model_validate(board))
+        if options.include_members:
+            result.members = await self.uow.boards.clone_members(id, board.id)
+        result.columns = await self.uow.boards.clone_columns(id, board.id)
+        if options.include_tasks:
+            result.tasks = await self.uow.boards.clone_tasks(
+                id, board.id, with_assignees=options.include_assignees
+            )
+            await self.uow.boards.count_tasks(board.id)
+        await self.uow.boards.reset_changes(board.id)
+        return result
 
     @transactional
     async def update_board(
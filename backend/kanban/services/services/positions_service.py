@@ -0,0 +1,28 @@
+from backend.kanban.core.decorators.read_only import read_only
+from backend.kanban.core.decorators.transactional import transactional
+from backend.kanban.database.unit_of_work import UnitOfWork
+
+
+class PositionsService:
+    def __init__(self, uow: UnitOfWork) -> None:
+        self.uow = uow
+
+    @read_only
+    async def dense_scopes(
+        self, max_length: int, limit: int
+    ) -> tuple[list[tuple[int, int]], list[int]]:
+        """(board_id, column_id) pairs with dense task keys and board ids with
+        dense column keys"""
+        columns = await self.uow.tasks.dense_columns(max_length, limit)
+        boards = await self.uow.columns.dense_boards(max_length, limit)
+        return columns, boards
+
+    @transactional
+    async def rebalance_tasks(
+        self, board_id: int, column_id: int, max_length: int
+    ) -> int | None:
+        return await self.uow.tasks.rebalance_positions(board_id, column_id, max_length)
+
+    @transactional
+    async def rebalance_columns(self, board_id: int, max_length: int) -> int | None:
+        return await self.uow.columns.rebalance_positions(board_id, max_length)
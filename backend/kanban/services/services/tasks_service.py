@@ -1,18 +1,24 @@
-from decimal import Decimal
+from collections import Counter
 from uuid import UUID
 
 from backend.kanban.core.decorators.read_only import read_only
 from backend.kanban.core.decorators.transactional import transactional
 from backend.kanban.core.exception_mappers.task_mapper import ERROR_MAP
 from backend.kanban.core.utility.exception_map_keys import TaskErrorKeys
+from backend.kanban.core.utility.ordering_key import key_between, keys_between
 from backend.kanban.database.unit_of_work import UnitOfWork
-from backend.kanban.event_manager.tasks_event_manager import ConnectionManager
 from backend.kanban.models.models import User
 from backend.kanban.schemas.columns_schema import ColumnGetFull
 from backend.kanban.schemas.tasks_schema import (
+    BulkRowError,
+    BulkTaskCreated,
+    BulkTaskResult,
+    BulkTaskRows,
     CreateTask,
     CreateTaskBase,
     MoveTask,
+    MoveTaskItem,
+    MoveTasksBatch,
     TaskView,
     UpdateTask,
     UpdateTaskBase,
@@ -20,9 +26,8 @@ from backend.kanban.schemas.tasks_schema import (
 
 
 class TasksService:
-    def __init__(self, uow: UnitOfWork, sse: ConnectionManager) -> None:
+    def __init__(self, uow: UnitOfWork) -> None:
         self.uow = uow
-        self.sse = sse
 
     async def _get_user_id(self, email: str) -> UUID:
         result: User | None = await self.uow.users.get_user_by_email(email=email)
@@ -38,17 +43,9 @@ class TasksService:
         task_data: CreateTaskBase,
         email: str | None = None,
     ) -> TaskView:
-        if not (
-            columns_limit_checker := await self.uow.columns.get_column_with_tasks(
-                column_id=column_id, board_id=board_id
-            )
-        ):
-            raise ERROR_MAP[TaskErrorKeys.COLUMT_NOT_FOUND]()
-        if (
-            columns_limit_checker.wip_limit is not None
-            and len(columns_limit_checker.tasks) >= columns_limit_checker.wip_limit
-        ):
-            raise ERROR_MAP[TaskErrorKeys.CONFLICT]()
+        await self._reserve_slots(
+            board_id, column_id, not_found=TaskErrorKeys.COLUMT_NOT_FOUND
+        )
         user_id: UUID | None = await self._get_user_id(email=email) if email else None
         full_task_data = CreateTask(**task_data.model_dump(), assignee_id=user_id)
         if not (
@@ -61,6 +58,66 @@ class TasksService:
             raise ERROR_MAP[TaskErrorKeys.CREATION_FAIL]()
         return TaskView.model_validate(result)
 
+    @transactional
+    async def create_tasks(self, board_id: int, bulk: BulkTaskRows) -> BulkTaskResult:
+        """Creates many tasks at once. Assignee emails are resolved with one
+        query, WIP slots are taken once per column, positions are generated in
+        one pass and the rows are inserted in batches. A row that cannot be
+        created is reported and skipped, it never aborts the others."""
+        errors = list(bulk.errors)
+        rows = dict(sorted(bulk.rows.items()))
+        users = await self.uow.users.get_ids_by_emails(
+            {row.email for row in rows.values() if row.email}
+        )
+        free = await self.uow.columns.free_slots(
+            board_id, {row.column_id for row in rows.values()}
+        )
+        admitted: dict[int, list[int]] = {}
+        for index, row in rows.items():
+            if row.email and row.email not in users:
+                errors.append(BulkRowError(row=index, detail="User is not found"))
+            elif row.column_id not in free:
+                errors.append(BulkRowError(row=index, detail="Column is not found"))
+            elif (slots := free[row.column_id]) is not None and slots <= 0:
+                errors.append(BulkRowError(row=index, detail="WIP limit reached"))
+            else:
+                if slots is not None:
+                    free[row.column_id] = slots - 1
+                admitted.setdefault(row.column_id, []).append(index)
+
+        last = await self.uow.tasks.last_positions(set(admitted))
+        tasks: list[dict] = []
+        indexes: list[int] = []
+        for column_id, column_rows in admitted.items():
+            if not await self.uow.columns.reserve_slots(
+                column_id, board_id, len(column_rows)
+            ):
+                raise ERROR_MAP[TaskErrorKeys.CONFLICT]()
+            # rows without a position go after everything in the column
+            given = [rows[i].position for i in column_rows if rows[i].position]
+            after = max([*given, last.get(column_id) or ""]) or None
+            appended = iter(keys_between(after, None, len(column_rows) - len(given)))
+            for index in column_rows:
+                row = rows[index]
+                tasks.append(
+                    {
+                        "column_id": column_id,
+                        "title": row.title,
+                        "description": row.description,
+                        "position": row.position or next(appended),
+                        "assignee_id": users.get(row.email) if row.email else None,
+                    }
+                )
+                indexes.append(index)
+
+        ids = await self.uow.tasks.bulk_create(board_id, tasks)
+        return BulkTaskResult(
+            created=[
+                BulkTaskCreated(row=index, id=id) for index, id in zip(indexes, ids)
+            ],
+            errors=sorted(errors, key=lambda error: error.row),
+        )
+
     @read_only
     async def get_column_with_tasks(
         self, board_id: int, column_id: int
@@ -73,6 +130,12 @@ class TasksService:
             raise ERROR_MAP[TaskErrorKeys.BOARD_NOT_FOUND]()
         return ColumnGetFull.model_validate(result)
 
+    @read_only
+    async def get_board_version(self, board_id: int) -> int:
+        if (version := await self.uow.boards.get_version(board_id)) is None:
+            raise ERROR_MAP[TaskErrorKeys.BOARD_NOT_FOUND]()
+        return version
+
     @read_only
     async def get_task(self, board_id: int, column_id: int, task_id: int) -> TaskView:
         if not (
@@ -116,50 +179,139 @@ class TasksService:
             board_id=board_id, column_id=column_id, task_id=task_id
         ):
             raise ERROR_MAP[TaskErrorKeys.NOT_FOUND]()
+        await self.uow.columns.release_slots(column_id)
 
     @transactional
     async def move_task(
         self, board_id: int, task_id: int, move_data: MoveTask
     ) -> TaskView:
-        task = await self.uow.tasks._get_task_by_id(task_id)
-        target_col = await self.uow.columns.get_column_with_tasks(
-            board_id=board_id, column_id=move_data.target_column_id
-        )
-        if not task or target_col:
+        """The task row is locked before its column is read, so a concurrent
+        move of the same task waits and then starts from the column this one
+        moved it to. Like move_tasks, task rows are locked before columns and
+        the columns in id order"""
+        task = await self.uow.tasks.lock_task(task_id)
+        if not task or task.board_id != board_id:
+            raise ERROR_MAP[TaskErrorKeys.NOT_FOUND]()
+        origin, target = task.column_id, move_data.target_column_id
+        if origin != target:
+            for column_id in sorted((origin, target)):
+                if column_id == target:
+                    await self._reserve_slots(board_id, target)
+                else:
+                    await self.uow.columns.release_slots(origin)
+        elif not await self.uow.columns.get_column(board_id=board_id, column_id=target):
             raise ERROR_MAP[TaskErrorKeys.NOT_FOUND]()
-        if task.column_id != move_data.target_column_id:
-            if not hasattr(target_col, "wip_limit") or not hasattr(target_col, "task"):
-                raise
-            if (
-                target_col.wip_limit is not None
-                and len(target_col.task)  # ty:ignore[invalid-argument-type]
-                >= task.wip_limit  # invalid-argument-type]  # ty:ignore[unresolved-attribute]  # noqa: E501
-            ):
-                raise ERROR_MAP[TaskErrorKeys.CONFLICT]()
         new_position = await self._calculate_new_position(move_data)
-        task.column_id = move_data.target_column_id
-        task.position = new_position
-        await self.sse.broadcast(
-            board_id,
-            {
-                "event": "task_moved",
-                "data": {
-                    "task_id": str(task.id),
-                    "new_column_id": task.column_id,
-                    "new_position": float(task.position),
-                },
-            },
+        await self.uow.tasks.move_task(
+            task, column_id=move_data.target_column_id, position=new_position
         )
         return TaskView.model_validate(task)
 
-    async def _calculate_new_position(self, move_data: MoveTask) -> Decimal:
+    @transactional
+    async def move_tasks(self, board_id: int, batch: MoveTasksBatch) -> list[TaskView]:
+        """Moves many tasks in one transaction. Positions are computed in
+        memory from a single read, WIP limits are checked once per column
+        with the net number of arriving tasks, and the moves are written
+        with one bulk UPDATE."""
+        task_ids = {move.task_id for move in batch.moves}
+        neighbor_ids = {
+            id
+            for move in batch.moves
+            for id in (move.above_task_id, move.below_task_id)
+            if id is not None
+        }
+        placements = await self.uow.tasks.task_placements(
+            board_id, task_ids | neighbor_ids
+        )
+        if not task_ids <= placements.keys():
+            raise ERROR_MAP[TaskErrorKeys.NOT_FOUND]()
+        targets = {move.target_column_id for move in batch.moves}
+        if await self.uow.columns.board_column_ids(board_id, targets) != targets:
+            raise ERROR_MAP[TaskErrorKeys.COLUMT_NOT_FOUND]()
+
+        origins = {id: placements[id][0] for id in task_ids}
+        last = await self.uow.tasks.last_positions(targets)
+        for move in batch.moves:
+            placements[move.task_id] = self._place(move, placements, last)
+
+        arrivals: Counter[int] = Counter()
+        for id, origin in origins.items():
+            if (target := placements[id][0]) != origin:
+                arrivals[target] += 1
+                arrivals[origin] -= 1
+        # the task rows are locked, the columns follow in id order as in
+        # move_task, so concurrent moves take their locks the same way
+        for column_id, count in sorted(arrivals.items()):
+            if count > 0:
+                await self._reserve_slots(board_id, column_id, count)
+            elif count < 0:
+                await self.uow.columns.release_slots(column_id, -count)
+
+        tasks = await self.uow.tasks.move_tasks(
+            board_id, {id: placements[id] for id in task_ids}
+        )
+        return [TaskView.model_validate(task) for task in tasks]
+
+    @staticmethod
+    def _place(
+        move: MoveTaskItem,
+        placements: dict[int, tuple[int, str]],
+        last: dict[int, str],
+    ) -> tuple[int, str]:
+        """In-memory counterpart of _calculate_new_position. Neighbours are
+        looked up in the placements updated by the earlier moves"""
+        column_id = move.target_column_id
+
+        def neighbor_position(task_id: int | None) -> str | None:
+            if task_id is None or task_id == move.task_id:
+                return None
+            placement = placements.get(task_id)
+            return placement[1] if placement and placement[0] == column_id else None
+
+        pos_above = neighbor_position(move.above_task_id)
+        pos_below = neighbor_position(move.below_task_id)
+        if pos_above is None and pos_below is None:
+            pos_above = last.get(column_id)
+        try:
+            position = key_between(pos_above, pos_below)
+        except ValueError:
+            raise ERROR_MAP[TaskErrorKeys.POSITION_CONFLICT]() from None
+        if column_id not in last or position > last[column_id]:
+            last[column_id] = position
+        return column_id, position
+
+    async def _reserve_slots(
+        self,
+        board_id: int,
+        column_id: int,
+        count: int = 1,
+        not_found: TaskErrorKeys = TaskErrorKeys.NOT_FOUND,
+    ) -> None:
+        """Admits count tasks into the column or raises. The reservation is a
+        single conditional UPDATE, so the check and the increment cannot be
+        interleaved by a concurrent request. The slower lookup only runs on
+        rejection, to tell a full column from a missing one."""
+        if await self.uow.columns.reserve_slots(column_id, board_id, count):
+            return
+        if not await self.uow.columns.get_column(
+            column_id=column_id, board_id=board_id
+        ):
+            raise ERROR_MAP[not_found]()
+        raise ERROR_MAP[TaskErrorKeys.CONFLICT]()
+
+    async def _calculate_new_position(self, move_data: MoveTask) -> str:
+        """Ordering key between the neighbours in the target column. Without
+        neighbours the task goes after the last one. Only the moved row is
+        updated, the neighbours keep their keys."""
         neighbor_ids = [
             id
             for id in [move_data.above_task_id, move_data.below_task_id]
             if id is not None
         ]
 
-        positions = await self.uow.tasks._position_map(neighbor_ids)
+        positions = await self.uow.tasks._position_map(
+            neighbor_ids, column_id=move_data.target_column_id
+        )
 
         pos_above = (
             positions.get(move_data.above_task_id) if move_data.above_task_id else None
@@ -167,13 +319,9 @@ class TasksService:
         pos_below = (
             positions.get(move_data.below_task_id) if move_data.below_task_id else None
         )
-        if pos_below is not None and pos_above is None:
-            return pos_below / 2
-
-        if pos_above is not None and pos_below is None:
-            return pos_above + Decimal("1.0")
-
-        if pos_above is not None and pos_below is not None:
-            return (pos_above + pos_below) / 2
-
-        return Decimal("1.0")
+        if pos_above is None and pos_below is None:
+            return await self.uow.tasks._get_position(move_data.target_column_id)
+        try:
+            return key_between(pos_above, pos_below)
+        except ValueError:
+            raise ERROR_MAP[TaskErrorKeys.POSITION_CONFLICT]() from None
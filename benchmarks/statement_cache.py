@@ -0,0 +1,259 @@
+"""Python CPU of the repository hot paths, per-call statements vs prebuilt ones.
+
+Runs every hot-path query many times in one session, once with the statement
+constructed on each call (as the repositories used to) and once with the
+module-level statement and bound parameters. CPU time is measured with
+time.process_time, so waiting for the database is not counted. The build
+column is the cost of constructing a statement and its cache key alone.
+Run against the database configured for the app (POSTGRES__*):
+
+    python -m benchmarks.statement_cache --calls 5000
+
+The throwaway user, board, column and task are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import Executable, and_, delete, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.core.security.permission_service import (
+    _BOARD_ROLE,
+    _USER_BOARD_ACCESS,
+)
+from backend.kanban.core.utility.role_enum import RoleEnum
+from backend.kanban.models.models import BoardMembers, Boards, Columns, Tasks, User
+from backend.kanban.services.repositories.columns_repo import _COLUMN
+from backend.kanban.services.repositories.member_repo import _IS_MEMBER
+from backend.kanban.services.repositories.tasks_repo import _TASK_IN_COLUMN
+
+
+@dataclass(frozen=True)
+class Fixture:
+    user_id: uuid.UUID
+    board_id: int
+    column_id: int
+    task_id: int
+
+
+@dataclass(frozen=True)
+class HotPath:
+    name: str
+    build: Callable[[Fixture], Executable]
+    prebuilt: Executable
+    params: Callable[[Fixture], dict[str, object]]
+
+
+# build reproduces the statement the repositories constructed per call
+HOT_PATHS = (
+    HotPath(
+        "TasksRepo.get_task",
+        lambda fx: (
+            select(Tasks)
+            .filter_by(board_id=fx.board_id, column_id=fx.column_id)
+            .filter_by(id=fx.task_id)
+        ),
+        _TASK_IN_COLUMN,
+        lambda fx: {
+            "board_id": fx.board_id,
+            "column_id": fx.column_id,
+            "task_id": fx.task_id,
+        },
+    ),
+    HotPath(
+        "ColumnsRepo.get_column",
+        lambda fx: select(Columns).where(
+            Columns.id == fx.column_id, Columns.board_id == fx.board_id
+        ),
+        _COLUMN,
+        lambda fx: {"column_id": fx.column_id, "board_id": fx.board_id},
+    ),
+    HotPath(
+        "MemberRepo._existing_user",
+        lambda fx: select(
+            exists().where(
+                BoardMembers.board_id == fx.board_id,
+                BoardMembers.user_id == fx.user_id,
+            )
+        ),
+        _IS_MEMBER,
+        lambda fx: {"board_id": fx.board_id, "user_id": fx.user_id},
+    ),
+    HotPath(
+        "PermissionService.check_user_board_role",
+        lambda fx: (
+            select(Boards.owner_id, BoardMembers.role)
+            .outerjoin(
+                BoardMembers,
+                and_(
+                    BoardMembers.board_id == Boards.id,
+                    BoardMembers.user_id == fx.user_id,
+                ),
+            )
+            .where(Boards.id == fx.board_id)
+        ),
+        _BOARD_ROLE,
+        lambda fx: {"board_id": fx.board_id, "user_id": fx.user_id},
+    ),
+    HotPath(
+        "PermissionService.authorize_user_on_board",
+        lambda fx: (
+            select(
+                User.id,
+                User.email,
+                User.name,
+                Boards.id.label("board_id"),
+                Boards.owner_id,
+                BoardMembers.role,
+            )
+            .select_from(User)
+            .outerjoin(Boards, Boards.id == fx.board_id)
+            .outerjoin(
+                BoardMembers,
+                and_(
+                    BoardMembers.board_id == Boards.id,
+                    BoardMembers.user_id == User.id,
+                ),
+            )
+            .where(User.id == fx.user_id)
+        ),
+        _USER_BOARD_ACCESS,
+        lambda fx: {"board_id": fx.board_id, "user_id": fx.user_id},
+    ),
+)
+
+
+@dataclass
+class PathResult:
+    name: str
+    built: float
+    prebuilt: float
+    build: float
+
+    @property
+    def saved(self) -> float:
+        return self.built - self.prebuilt
+
+
+async def create_fixture(session_factory: Callable[[], AsyncSession]) -> Fixture:
+    """User, board with the user as a member, a column and a task"""
+    async with session_factory() as session:
+        user = User(
+            email=f"bench_{uuid.uuid4().hex}@example.com",
+            name="bench",
+            password="-",
+        )
+        session.add(user)
+        await session.flush()
+        board = Boards(name="statement benchmark", owner_id=user.id)
+        session.add(board)
+        await session.flush()
+        session.add(
+            BoardMembers(board_id=board.id, user_id=user.id, role=RoleEnum.ADMIN)
+        )
+        column = Columns(board_id=board.id, name="bench", position="a0")
+        session.add(column)
+        await session.flush()
+        task = Tasks(
+            board_id=board.id,
+            column_id=column.id,
+            title="bench",
+            description="bench",
+            position="a0",
+        )
+        session.add(task)
+        await session.commit()
+        return Fixture(user.id, board.id, column.id, task.id)
+
+
+async def drop_fixture(
+    session_factory: Callable[[], AsyncSession], fixture: Fixture
+) -> None:
+    async with session_factory() as session:
+        await session.execute(delete(Boards).where(Boards.id == fixture.board_id))
+        await session.execute(delete(User).where(User.id == fixture.user_id))
+        await session.commit()
+
+
+async def _cpu_per_call(
+    session: AsyncSession,
+    statement: Callable[[], Executable],
+    params: dict[str, object],
+    calls: int,
+) -> float:
+    (await session.execute(statement(), params)).all()  # warm the caches
+    began = time.process_time()
+    for _ in range(calls):
+        (await session.execute(statement(), params)).all()
+    return (time.process_time() - began) / calls
+
+
+def _build_per_call(path: HotPath, fixture: Fixture, calls: int) -> float:
+    began = time.process_time()
+    for _ in range(calls):
+        path.build(fixture)._generate_cache_key()
+    return (time.process_time() - began) / calls
+
+
+async def run_paths(
+    session_factory: Callable[[], AsyncSession], fixture: Fixture, calls: int
+) -> list[PathResult]:
+    results = []
+    async with session_factory() as session:
+        for path in HOT_PATHS:
+            built = await _cpu_per_call(
+                session, lambda path=path: path.build(fixture), {}, calls
+            )
+            prebuilt = await _cpu_per_call(
+                session,
+                lambda path=path: path.prebuilt,
+                path.params(fixture),
+                calls,
+            )
+            results.append(
+                PathResult(
+                    path.name, built, prebuilt, _build_per_call(path, fixture, calls)
+                )
+            )
+    return results
+
+
+async def main(args: argparse.Namespace) -> int:
+    from backend.kanban.core.settings.settings import get_settings
+    from backend.kanban.database.db_config import init_db
+
+    engine, session_factory = init_db(get_settings())
+    try:
+        fixture = await create_fixture(session_factory)
+        try:
+            results = await run_paths(session_factory, fixture, args.calls)
+        finally:
+            await drop_fixture(session_factory, fixture)
+    finally:
+        await engine.dispose()
+    print(f"{'hot path':<44}{'built':>10}{'prebuilt':>10}{'saved':>10}{'build':>10}")
+    for result in results:
+        print(
+            f"{result.name:<44}"
+            + "".join(
+                f"{value * 1e6:>8.1f}us"
+                for value in (
+                    result.built,
+                    result.prebuilt,
+                    result.saved,
+                    result.build,
+                )
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000)
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,160 @@
+"""WIP-limit admission under concurrent task creation.
+
+Fires many create_task calls at one column at the same time, each in its own
+session and transaction, and checks that exactly wip_limit of them are
+admitted. Run against the database configured for the app (POSTGRES__*):
+
+    python -m benchmarks.wip_admission --parallel 200 --wip-limit 10 --rounds 5
+
+The throwaway user, board and column are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.core.exceptions.tasks_exception import TaskConflict
+from backend.kanban.database.unit_of_work import UnitOfWork
+from backend.kanban.models.models import Boards, Columns, Tasks, User
+from backend.kanban.schemas.tasks_schema import CreateTaskBase
+from backend.kanban.services.services.tasks_service import TasksService
+
+
+@dataclass
+class AdmissionResult:
+    wip_limit: int
+    admitted: int = 0
+    rejected: int = 0
+    failed: int = 0
+    task_count: int = 0
+    rows: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    @property
+    def overshoot(self) -> int:
+        return max(self.rows, self.task_count) - self.wip_limit
+
+
+async def create_fixture(
+    session_factory: Callable[[], AsyncSession], wip_limit: int
+) -> tuple[uuid.UUID, int, int]:
+    """User, board and an empty column with the given limit"""
+    async with session_factory() as session:
+        user = User(
+            email=f"bench_{uuid.uuid4().hex}@example.com",
+            name="bench",
+            password="-",
+        )
+        session.add(user)
+        await session.flush()
+        board = Boards(name="wip benchmark", owner_id=user.id)
+        session.add(board)
+        await session.flush()
+        column = Columns(
+            board_id=board.id, name="bench", position=1, wip_limit=wip_limit
+        )
+        session.add(column)
+        await session.commit()
+        return user.id, board.id, column.id
+
+
+async def drop_fixture(
+    session_factory: Callable[[], AsyncSession], user_id: uuid.UUID, board_id: int
+) -> None:
+    async with session_factory() as session:
+        await session.execute(delete(Boards).where(Boards.id == board_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def run_admission(
+    session_factory: Callable[[], AsyncSession],
+    board_id: int,
+    column_id: int,
+    wip_limit: int,
+    parallel: int,
+) -> AdmissionResult:
+    """parallel concurrent creations against one column"""
+    result = AdmissionResult(wip_limit=wip_limit)
+    start = asyncio.Event()
+
+    async def create(n: int) -> None:
+        await start.wait()
+        began = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                await TasksService(UnitOfWork(session)).create_task(
+                    board_id=board_id,
+                    column_id=column_id,
+                    task_data=CreateTaskBase(
+                        title=f"task {n}", description="bench", position=None
+                    ),
+                )
+            result.admitted += 1
+        except TaskConflict:
+            result.rejected += 1
+        except Exception:  # pool timeouts, lock errors
+            result.failed += 1
+        result.latencies.append(time.perf_counter() - began)
+
+    workers = [asyncio.create_task(create(n)) for n in range(parallel)]
+    await asyncio.sleep(0)
+    start.set()
+    await asyncio.gather(*workers)
+
+    async with session_factory() as session:
+        result.task_count = await session.scalar(
+            select(Columns.task_count).where(Columns.id == column_id)
+        )
+        result.rows = await session.scalar(
+            select(func.count(Tasks.id)).where(Tasks.column_id == column_id)
+        )
+    return result
+
+
+async def main(args: argparse.Namespace) -> int:
+    from backend.kanban.core.settings.settings import get_settings
+    from backend.kanban.database.db_config import init_db
+
+    engine, session_factory = init_db(get_settings())
+    exit_code = 0
+    try:
+        for n in range(1, args.rounds + 1):
+            user_id, board_id, column_id = await create_fixture(
+                session_factory, args.wip_limit
+            )
+            began = time.perf_counter()
+            result = await run_admission(
+                session_factory, board_id, column_id, args.wip_limit, args.parallel
+            )
+            elapsed = time.perf_counter() - began
+            await drop_fixture(session_factory, user_id, board_id)
+            latencies = sorted(result.latencies)
+            print(
+                f"round {n}: admitted={result.admitted} rejected={result.rejected} "
+                f"failed={result.failed} rows={result.rows} "
+                f"task_count={result.task_count} elapsed={elapsed:.3f}s "
+                f"p50={statistics.median(latencies) * 1000:.1f}ms "
+                f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms"
+            )
+            if result.overshoot > 0 or result.rows != result.task_count:
+                print(f"round {n}: WIP limit exceeded")
+                exit_code = 1
+    finally:
+        await engine.dispose()
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parallel", type=int, default=200)
+    parser.add_argument("--wip-limit", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
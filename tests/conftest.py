@@ -1,5 +1,6 @@
 import uuid
 from collections.abc import AsyncGenerator, Callable
+from contextlib import nullcontext
 
 import pytest
 from fastapi import FastAPI
@@ -8,9 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.kanban.core.security.token_svc import get_token_svc
 from backend.kanban.core.settings.settings import get_settings
-from backend.kanban.database.session_provider import get_db
-from backend.kanban.database.unit_of_work import UnitOfWork
-from backend.kanban.database.uow_provider import get_uow
+from backend.kanban.database.session_provider import get_db, get_session_factory
 from backend.kanban.main import create_app
 from backend.kanban.models.models import Base
 from tests.db import AsyncSessionTest, test_engine
@@ -54,7 +53,9 @@ def app_factory(session: AsyncSession) -> Callable[[], FastAPI]:
         app.state.hasher = hasher
         app.state.token = get_token_svc(settings)
         app.dependency_overrides[get_db] = lambda: session
-        app.dependency_overrides[get_uow] = lambda: UnitOfWork(session)
+        app.dependency_overrides[get_session_factory] = lambda: (
+            lambda: nullcontext(session)
+        )
         return app
 
     return create_conf_app
@@ -1,9 +1,14 @@
+from sqlalchemy import Connection, event, literal
+from sqlalchemy.engine.interfaces import DBAPICursor, ExecutionContext
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import Values
 
 
 test_db_url = "sqlite+aiosqlite:///./test.db"
@@ -11,3 +16,48 @@ test_engine = create_async_engine(url=test_db_url, poolclass=NullPool)
 AsyncSessionTest = async_sessionmaker(
     bind=test_engine, class_=AsyncSession, expire_on_commit=False
 )
+
+
+@compiles(Values, "sqlite")
+def _sqlite_values(element: Values, compiler: SQLCompiler, **kw: object) -> str:
+    """SQLite cannot name the columns of a VALUES list, which Postgres uses
+    in UPDATE ... FROM (VALUES ...). Selects the rows under the column names
+    from SQLite's own column1, column2, ..."""
+    rows = ", ".join(
+        "("
+        + ", ".join(
+            compiler.process(literal(value, type_=column.type))
+            for column, value in zip(element.columns, row)
+        )
+        + ")"
+        for data in element._data
+        for row in data
+    )
+    names = ", ".join(
+        f"column{number} AS {compiler.preparer.quote(column.name)}"
+        for number, column in enumerate(element.columns, 1)
+    )
+    if (linter := kw.pop("from_linter", None)) is not None:
+        linter.froms[element] = element.name
+    return f"(SELECT {names} FROM (VALUES {rows})) AS {element.name}"
+
+
+@event.listens_for(test_engine.sync_engine, "before_cursor_execute")
+def _sqlite_for_update(
+    conn: Connection,
+    cursor: DBAPICursor,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """SQLite has no row locks and reads outside of a transaction. A SELECT
+    ... FOR UPDATE starts a write transaction instead, which serializes the
+    lockers until commit like the row lock does on Postgres"""
+    compiled = getattr(context, "compiled", None)
+    if (
+        compiled is not None
+        and getattr(compiled.statement, "_for_update_arg", None) is not None
+        and not conn.connection.dbapi_connection._connection.in_transaction
+    ):
+        cursor.execute("BEGIN IMMEDIATE")
@@ -1,5 +1,14 @@
+import json
+from typing import Any
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.models.models import Columns
+from backend.kanban.services.repositories.change_log import compact_change_log
+from tests.db import AsyncSessionTest
 
 
 @pytest.mark.parametrize(
@@ -57,7 +66,7 @@ async def test_get_board(auth_client: AsyncClient) -> None:
         },
     )
     result = await auth_client.get("/api/v1/board/all")
-    data = result.json()
+    data = result.json()["items"]
     assert result.status_code == 200
     assert len(data) > 0
 
@@ -71,7 +80,7 @@ async def test_unathoreized_get(client: AsyncClient, auth_client: AsyncClient) -
         },
     )
     result = await auth_client.get("/api/v1/board/all")
-    data = result.json()
+    data = result.json()["items"]
     id = data[0]["id"]
     response = await client.get(f"/api/v1/board/{id}")
     assert response.status_code == 401
@@ -79,7 +88,7 @@ async def test_unathoreized_get(client: AsyncClient, auth_client: AsyncClient) -
 
 async def test_board_without_creation(auth_client: AsyncClient) -> None:
     result = await auth_client.get("/api/v1/board/all")
-    data = result.json()
+    data = result.json()["items"]
     assert result.status_code == 200
     assert len(data) == 0
 
@@ -93,7 +102,7 @@ async def test_get_single_board(auth_client: AsyncClient) -> None:
         },
     )
     result = await auth_client.get("/api/v1/board/all")
-    data = result.json()
+    data = result.json()["items"]
     id = data[0]["id"]
     single_record = await auth_client.get(f"/api/v1/board/{id}")
     data = single_record.json()
@@ -110,7 +119,7 @@ async def test_update_board(auth_client: AsyncClient) -> None:
         },
     )
     result = await auth_client.get("/api/v1/board/all")
-    data = result.json()
+    data = result.json()["items"]
     board_id = data[0]["id"]
     update = await auth_client.put(
         f"/api/v1/board/{board_id}", json={"name": " New name"}
@@ -134,7 +143,7 @@ async def test_delete_board(auth_client: AsyncClient) -> None:
         },
     )
     result = await auth_client.get("/api/v1/board/all")
-    data = result.json()
+    data = result.json()["items"]
     board_id = data[0]["id"]
     delete = await auth_client.delete(f"/api/v1/board/{board_id}")
     assert delete.status_code == 204
@@ -143,3 +152,455 @@ async def test_delete_board(auth_client: AsyncClient) -> None:
 async def test_board_delete_fail(auth_client: AsyncClient) -> None:
     delete = await auth_client.delete("/api/v1/board/10000")
     assert delete.status_code == 404
+
+
+async def test_get_boards_with_cursor(auth_client: AsyncClient) -> None:
+    for name in ("First board", "Second board", "Third board"):
+        await auth_client.post("/api/v1/board/", json={"name": name})
+    first_page = await auth_client.get("/api/v1/board/all", params={"limit": 2})
+    data = first_page.json()
+    assert first_page.status_code == 200
+    assert [board["name"] for board in data["items"]] == [
+        "Third board",
+        "Second board",
+    ]
+    assert data["next_cursor"] is not None
+    second_page = await auth_client.get(
+        "/api/v1/board/all", params={"limit": 2, "cursor": data["next_cursor"]}
+    )
+    data = second_page.json()
+    assert [board["name"] for board in data["items"]] == ["First board"]
+    assert data["next_cursor"] is None
+
+
+async def test_get_boards_invalid_cursor(auth_client: AsyncClient) -> None:
+    result = await auth_client.get("/api/v1/board/all", params={"cursor": "nope"})
+    assert result.status_code == 422
+
+
+async def test_stream_board(auth_client: AsyncClient) -> None:
+    board = await auth_client.post("/api/v1/board/", json={"name": "Stream board"})
+    board_id = board.json()["id"]
+    column = await auth_client.post(
+        f"/api/v1/board/{board_id}/columns/add", json={"name": "Todo"}
+    )
+    column_id = column.json()["id"]
+    await auth_client.post(
+        f"/api/v1/board/{board_id}/columns/{column_id}/tasks/add_task",
+        json={
+            "task_data": {
+                "title": "Streamed task",
+                "description": "Description",
+                "position": "a1",
+            }
+        },
+    )
+    result = await auth_client.get(f"/api/v1/board/{board_id}/stream")
+    assert result.status_code == 200
+    assert result.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in result.text.splitlines()]
+    assert [record["type"] for record in records] == [
+        "board",
+        "member",
+        "column",
+        "task",
+    ]
+    assert records[0]["data"]["id"] == board_id
+    assert records[-1]["data"]["column_id"] == column_id
+    assert records[-1]["data"]["title"] == "Streamed task"
+
+
+async def test_stream_board_not_found(auth_client: AsyncClient) -> None:
+    result = await auth_client.get("/api/v1/board/10000/stream")
+    assert result.status_code == 404
+
+
+async def test_get_board_sparse(auth_client: AsyncClient) -> None:
+    board = await auth_client.post("/api/v1/board/", json={"name": "Sparse board"})
+    board_id = board.json()["id"]
+    column = await auth_client.post(
+        f"/api/v1/board/{board_id}/columns/add", json={"name": "Todo"}
+    )
+    await auth_client.post(
+        f"/api/v1/board/{board_id}/columns/{column.json()['id']}/tasks/add_task",
+        json={
+            "task_data": {
+                "title": "Sparse task",
+                "description": "Description",
+                "position": "a1",
+            }
+        },
+    )
+    result = await auth_client.get(
+        f"/api/v1/board/{board_id}",
+        params={"include": "columns,tasks", "fields": "title"},
+    )
+    data = result.json()
+    assert result.status_code == 200
+    assert "board_members" not in data
+    assert data["columns"][0]["name"] == "Todo"
+    assert data["columns"][0]["tasks"] == [
+        {"id": data["columns"][0]["tasks"][0]["id"], "title": "Sparse task"}
+    ]
+
+    headers_only = await auth_client.get(
+        f"/api/v1/board/{board_id}", params={"include": "columns"}
+    )
+    assert "tasks" not in headers_only.json()["columns"][0]
+
+
+async def test_get_board_sparse_invalid(auth_client: AsyncClient) -> None:
+    board = await auth_client.post("/api/v1/board/", json={"name": "Sparse board"})
+    result = await auth_client.get(
+        f"/api/v1/board/{board.json()['id']}", params={"include": "comments"}
+    )
+    assert result.status_code == 422
+
+
+async def test_get_board_etag(auth_client: AsyncClient) -> None:
+    board = await auth_client.post("/api/v1/board/", json={"name": "Polled board"})
+    board_id = board.json()["id"]
+    first = await auth_client.get(f"/api/v1/board/{board_id}")
+    etag = first.headers["ETag"]
+    not_modified = await auth_client.get(
+        f"/api/v1/board/{board_id}", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    await auth_client.post(
+        f"/api/v1/board/{board_id}/columns/add", json={"name": "New column"}
+    )
+    changed = await auth_client.get(
+        f"/api/v1/board/{board_id}", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["columns"][0]["name"] == "New column"
+
+
+async def test_board_changes_with_tombstones(auth_client: AsyncClient) -> None:
+    board = await auth_client.post(
+        "/api/v1/board/", json={"name": "Delta board", "description": ""}
+    )
+    board_id = board.json()["id"]
+    column = await auth_client.post(
+        f"/api/v1/board/{board_id}/columns/add", json={"name": "Todo", "position": "a1"}
+    )
+    column_id = column.json()["id"]
+    tasks_url = f"/api/v1/board/{board_id}/columns/{column_id}/tasks"
+    task_ids = []
+    for title in ("first", "second"):
+        task = await auth_client.post(
+            f"{tasks_url}/add_task",
+            json={"task_data": {"title": title, "description": "d", "position": "a1"}},
+        )
+        task_ids.append(task.json()["id"])
+
+    synced = (await auth_client.get(f"/api/v1/board/{board_id}/changes?since=0")).json()
+    assert {task["id"] for task in synced["tasks"]} == set(task_ids)
+    assert [column["id"] for column in synced["columns"]] == [column_id]
+
+    await auth_client.delete(f"{tasks_url}/{task_ids[0]}")
+    await auth_client.put(
+        f"{tasks_url}/{task_ids[1]}", json={"new_data": {"title": "new"}}
+    )
+    delta = (
+        await auth_client.get(
+            f"/api/v1/board/{board_id}/changes?since={synced['version']}"
+        )
+    ).json()
+    assert delta["deleted_tasks"] == [task_ids[0]]
+    assert [task["title"] for task in delta["tasks"]] == ["new"]
+    assert delta["columns"] == []
+
+    await auth_client.delete(f"/api/v1/board/{board_id}/columns/{column_id}")
+    delta = (
+        await auth_client.get(
+            f"/api/v1/board/{board_id}/changes?since={delta['version']}"
+        )
+    ).json()
+    assert delta["deleted_columns"] == [column_id]
+    assert delta["deleted_tasks"] == [task_ids[1]]
+
+    ahead = await auth_client.get(
+        f"/api/v1/board/{board_id}/changes?since={delta['version'] + 1}"
+    )
+    assert ahead.json()["reset"] is True
+
+
+async def test_board_changes_reset_below_floor(
+    auth_client: AsyncClient, session: AsyncSession
+) -> None:
+    board = await auth_client.post(
+        "/api/v1/board/", json={"name": "Compacted board", "description": ""}
+    )
+    board_id = board.json()["id"]
+    await auth_client.post(
+        f"/api/v1/board/{board_id}/columns/add", json={"name": "Todo", "position": "a1"}
+    )
+    await compact_change_log(session, board_id, floor=2)
+    await session.commit()
+    result = await auth_client.get(f"/api/v1/board/{board_id}/changes?since=1")
+    assert result.json()["reset"] is True
+    result = await auth_client.get(f"/api/v1/board/{board_id}/changes?since=2")
+    assert result.json()["reset"] is False
+
+
+async def test_export_and_import_board(auth_client: AsyncClient) -> None:
+    board = await auth_client.post("/api/v1/board/", json={"name": "Export board"})
+    board_id = board.json()["id"]
+    column_ids = [
+        (
+            await auth_client.post(
+                f"/api/v1/board/{board_id}/columns/add",
+                json={"name": name, "wip_limit": 5},
+            )
+        ).json()["id"]
+        for name in ("Todo", "Done")
+    ]
+    stream = await auth_client.get(f"/api/v1/board/{board_id}/stream")
+    email = json.loads(stream.text.splitlines()[1])["data"]["user"]["email"]
+    await auth_client.post(
+        f"/api/v1/board/{board_id}/tasks/bulk",
+        json=[
+            {
+                "column_id": column_ids[n % 2],
+                "title": f"task {n}",
+                "description": "Description",
+                "email": email if n == 0 else None,
+            }
+            for n in range(5)
+        ],
+    )
+
+    exported = await auth_client.get(f"/api/v1/board/{board_id}/export")
+    assert exported.status_code == 200
+    assert exported.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in exported.text.splitlines()]
+    assert [record["type"] for record in records] == [
+        "board",
+        "member",
+        "column",
+        "column",
+        *["task"] * 5,
+    ]
+    assert records[1]["data"] == {"email": email, "role": "admin"}
+    assert records[4]["data"]["email"] == email
+
+    upload = exported.text + json.dumps(
+        {"type": "member", "data": {"email": "nobody@example.com", "role": "member"}}
+    )
+    result = await auth_client.post(
+        "/api/v1/board/import",
+        content=upload,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert result.status_code == 201
+    imported = result.json()
+    assert imported["board"]["name"] == "Export board"
+    assert (imported["members"], imported["columns"], imported["tasks"]) == (0, 2, 5)
+    assert imported["skipped_members"] == ["nobody@example.com"]
+
+    new_id = imported["board"]["id"]
+    copy = await auth_client.get(f"/api/v1/board/{new_id}/export")
+    copied = [json.loads(line) for line in copy.text.splitlines()]
+    new_columns = [record["data"]["id"] for record in copied[2:4]]
+    assert set(new_columns).isdisjoint(column_ids)
+    for original, task in zip(records[4:], copied[4:], strict=True):
+        assert (
+            task["data"]["column_id"]
+            == new_columns[column_ids.index(original["data"]["column_id"])]
+        )
+        for name in ("title", "position", "email"):
+            assert task["data"][name] == original["data"][name]
+
+    full = (await auth_client.get(f"/api/v1/board/{new_id}")).json()
+    assert {column["name"]: len(column["tasks"]) for column in full["columns"]} == {
+        "Todo": 3,
+        "Done": 2,
+    }
+    # task counts are restored, so the WIP limit of 5 still holds
+    extra = await auth_client.post(
+        f"/api/v1/board/{new_id}/tasks/bulk",
+        json=[{"column_id": new_columns[0], "title": "extra", "description": "d"}] * 3,
+    )
+    assert [len(extra.json()[key]) for key in ("created", "errors")] == [2, 1]
+    changes = await auth_client.get(f"/api/v1/board/{new_id}/changes?since=0")
+    assert changes.json()["reset"] is True
+
+
+async def test_import_board_is_all_or_nothing(auth_client: AsyncClient) -> None:
+    lines = [
+        {"type": "board", "data": {"name": "Broken import"}},
+        {
+            "type": "task",
+            "data": {
+                "id": 1,
+                "column_id": 7,
+                "title": "orphan",
+                "description": "Description",
+                "position": "a0",
+            },
+        },
+    ]
+    result = await auth_client.post(
+        "/api/v1/board/import",
+        content="\n".join(map(json.dumps, lines)),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert result.status_code == 422
+    assert "column 7" in result.json()["detail"]
+    boards = await auth_client.get("/api/v1/board/all")
+    assert "Broken import" not in [board["name"] for board in boards.json()["items"]]
+
+    result = await auth_client.post(
+        "/api/v1/board/import",
+        content='{"type": "column", "data": {}}',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert result.status_code == 422
+    assert result.json()["detail"].startswith("Invalid board import: line 1:")
+
+
+async def test_import_board_checks_wip_limits_and_positions(
+    auth_client: AsyncClient,
+) -> None:
+    board = {"type": "board", "data": {"name": "Checked import"}}
+
+    def column(id: int, position: str) -> dict[str, Any]:
+        return {
+            "type": "column",
+            "data": {"id": id, "name": f"column {id}", "position": position},
+        }
+
+    def task(id: int, column_id: int) -> dict[str, Any]:
+        return {
+            "type": "task",
+            "data": {
+                "id": id,
+                "column_id": column_id,
+                "title": f"task {id}",
+                "description": "Description",
+                "position": f"a{id}",
+            },
+        }
+
+    limited = column(1, "a0")
+    limited["data"]["wip_limit"] = 1
+    uploads = {
+        # the empty line is counted
+        "line 4: column position a0": [board, column(1, "a0"), None, column(2, "a0")],
+        "line 4: column 1 has more tasks than its WIP limit of 1": [
+            board,
+            limited,
+            task(1, 1),
+            task(2, 1),
+        ],
+    }
+    for detail, lines in uploads.items():
+        result = await auth_client.post(
+            "/api/v1/board/import",
+            content="\n".join(json.dumps(line) if line else "" for line in lines),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert result.status_code == 422
+        assert result.json()["detail"].startswith(f"Invalid board import: {detail}")
+    boards = await auth_client.get("/api/v1/board/all")
+    assert "Checked import" not in [b["name"] for b in boards.json()["items"]]
+
+
+async def test_clone_board(
+    auth_client: AsyncClient, second_auth_client: AsyncClient
+) -> None:
+    board = await auth_client.post(
+        "/api/v1/board/", json={"name": "Sprint template", "description": "tpl"}
+    )
+    board_id = board.json()["id"]
+    email = (await second_auth_client.get("/api/v1/auth/me")).json()["email"]
+    await auth_client.post(
+        f"/api/v1/board/{board_id}/members/add",
+        json={"email": email, "role": "member"},
+    )
+    column_ids = [
+        (
+            await auth_client.post(
+                f"/api/v1/board/{board_id}/columns/add",
+                json={"name": name, "wip_limit": 3},
+            )
+        ).json()["id"]
+        for name in ("Todo", "Done")
+    ]
+    await auth_client.post(
+        f"/api/v1/board/{board_id}/tasks/bulk",
+        json=[
+            {
+                "column_id": column_ids[n // 2],
+                "title": f"task {n}",
+                "description": "Description",
+                "email": email,
+            }
+            for n in range(3)
+        ],
+    )
+    source = (await auth_client.get(f"/api/v1/board/{board_id}/export")).text
+    # a stale count of the source must not be copied
+    async with AsyncSessionTest() as session:
+        await session.execute(
+            update(Columns).where(Columns.id == column_ids[0]).values(task_count=0)
+        )
+        await session.commit()
+
+    result = await second_auth_client.post(
+        f"/api/v1/board/{board_id}/clone",
+        json={"name": "Sprint 1", "include_members": True, "include_assignees": True},
+    )
+    assert result.status_code == 201
+    cloned = result.json()
+    assert cloned["board"]["name"] == "Sprint 1"
+    assert cloned["board"]["description"] == "tpl"
+    assert (cloned["members"], cloned["columns"], cloned["tasks"]) == (1, 2, 3)
+    new_id = cloned["board"]["id"]
+    copy = (await second_auth_client.get(f"/api/v1/board/{new_id}/export")).text
+    original = [json.loads(line) for line in source.splitlines()]
+    copied = [json.loads(line) for line in copy.splitlines()]
+    assert sorted(record["data"]["role"] for record in copied[1:3]) == [
+        "admin",
+        "admin",
+    ]
+
+    def tasks(records: list[dict]) -> set[tuple]:
+        names = {r["data"]["id"]: r["data"]["name"] for r in records[3:5]}
+        return {
+            (names[task["column_id"]], task["title"], task["position"], task["email"])
+            for task in (r["data"] for r in records[5:])
+        }
+
+    assert [r["data"]["name"] for r in copied[3:5]] == ["Todo", "Done"]
+    assert tasks(copied) == tasks(original)
+    changes = await second_auth_client.get(f"/api/v1/board/{new_id}/changes?since=0")
+    assert changes.json()["reset"] is True
+    # task counts follow the copied rows, "Todo" is at its limit of 3 after
+    # one more task
+    new_todo = copied[3]["data"]["id"]
+    extra = await second_auth_client.post(
+        f"/api/v1/board/{new_id}/tasks/bulk",
+        json=[{"column_id": new_todo, "title": "extra", "description": "d"}] * 2,
+    )
+    assert [len(extra.json()[key]) for key in ("created", "errors")] == [1, 1]
+
+    result = await auth_client.post(f"/api/v1/board/{board_id}/clone")
+    plain = result.json()
+    assert plain["board"]["name"] == "Sprint template"
+    assert (plain["members"], plain["columns"], plain["tasks"]) == (0, 2, 3)
+    copy = (await auth_client.get(f"/api/v1/board/{plain['board']['id']}/export")).text
+    assert [
+        json.loads(line)["data"].get("email") for line in copy.splitlines()[4:]
+    ] == [None] * 3
+
+    result = await auth_client.post(
+        f"/api/v1/board/{board_id}/clone", json={"include_tasks": False}
+    )
+    assert (result.json()["columns"], result.json()["tasks"]) == (2, 0)
+    result = await auth_client.post("/api/v1/board/10000/clone")
+    assert result.status_code == 404
@@ -19,7 +19,7 @@ async def columns(auth_client: AsyncClient) -> dict[str, Any]:
         f"/api/v1/board/{board_id}/columns/add",
         json={
             "name": "my amazing zzz",
-            "position": 2.5,
+            "position": "a2V",
             "wip_limit": 1,
         },
     )
@@ -46,7 +46,7 @@ async def test_creation_column(auth_client: AsyncClient) -> None:
         f"/api/v1/board/{board_id}/columns/add",
         json={
             "name": "my amazing zzz",
-            "position": 2.5,
+            "position": "a2V",
             "wip_limit": 1,
         },
     )
@@ -69,7 +69,7 @@ async def test_creation_column_violation(auth_client: AsyncClient) -> None:
         f"/api/v1/board/{board_id}/columns/add",
         json={
             "name": "my amazing zzz",
-            "position": 2.5,
+            "position": "a2V",
             "wip_limit": 1,
         },
     )
@@ -77,7 +77,7 @@ async def test_creation_column_violation(auth_client: AsyncClient) -> None:
         f"/api/v1/board/{board_id}/columns/add",
         json={
             "name": "my amazing zzz",
-            "position": 2.5,
+            "position": "a2V",
             "wip_limit": 1,
         },
     )
@@ -102,7 +102,7 @@ async def test_update_column_violation(columns: dict[str, Any]) -> None:
         f"/api/v1/board/{columns['board_id']}/columns/add",
         json={
             "name": "very new column",
-            "position": 3,
+            "position": "a3",
             "wip_limit": 1,
         },
     )
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncGenerator, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import jwt
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from backend.kanban.core.settings.settings import get_settings
+from backend.kanban.event_manager.board_channel import BoardChannel
+from backend.kanban.event_manager.tasks_event_manager import (
+    ConnectionManager,
+    connection_manager,
+)
+from backend.kanban.schemas.user_schema import UserGet
+from tests.conftest import register_and_login
+
+
+class WsSession:
+    """Minimal in-process WebSocket client speaking raw ASGI"""
+
+    def __init__(self, app: FastAPI, token: str) -> None:
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "path": "/api/v1/board/ws",
+            "query_string": f"token={token}".encode(),
+            "headers": [],
+        }
+        self.task = asyncio.ensure_future(app(scope, self.inbox.get, self.outbox.put))
+
+    async def connect(self) -> dict[str, Any]:
+        await self.inbox.put({"type": "websocket.connect"})
+        return await asyncio.wait_for(self.outbox.get(), timeout=5)
+
+    async def send(self, message: dict[str, Any]) -> None:
+        await self.inbox.put({"type": "websocket.receive", "text": json.dumps(message)})
+
+    async def receive(self) -> dict[str, Any]:
+        message = await asyncio.wait_for(self.outbox.get(), timeout=5)
+        return json.loads(message["text"])
+
+    async def close(self) -> None:
+        await self.inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, timeout=5)
+
+
+@pytest.fixture
+async def channel_app(
+    app_factory: Callable[[], FastAPI],
+) -> AsyncGenerator[tuple[FastAPI, AsyncClient, str]]:
+    app = app_factory()
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        client = await register_and_login(client)
+        board = await client.post(
+            "/api/v1/board/", json={"name": "Channel board", "description": "WS"}
+        )
+        yield app, client, board.json()["id"]
+
+
+async def test_ws_rejects_anonymous(channel_app: tuple) -> None:
+    app, _, _ = channel_app
+    ws = WsSession(app, token="broken")
+    assert (await ws.connect())["type"] == "websocket.close"
+
+
+async def test_ws_subscribe_create_and_receive_events(channel_app: tuple) -> None:
+    app, client, board_id = channel_app
+    column = await client.post(
+        f"/api/v1/board/{board_id}/columns/add",
+        json={"name": "column", "position": "a1", "wip_limit": 3},
+    )
+    token = client.headers["Authorization"].removeprefix("Bearer ")
+    ws = WsSession(app, token)
+    assert (await ws.connect())["type"] == "websocket.accept"
+
+    await ws.send({"action": "subscribe", "board_id": board_id, "ref": "1"})
+    assert await ws.receive() == {
+        "type": "ack",
+        "action": "subscribe",
+        "ref": "1",
+        "board_id": board_id,
+    }
+    assert connection_manager.stats(board_id).subscribers == 1
+
+    await ws.send(
+        {
+            "action": "create_task",
+            "board_id": board_id,
+            "column_id": column.json()["id"],
+            "data": {"title": "WS task", "description": "via ws", "position": "a1"},
+        }
+    )
+    messages = [await ws.receive(), await ws.receive()]
+    received = {message["type"]: message for message in messages}
+    assert received["ack"]["data"]["title"] == "WS task"
+    assert received["event"]["event"] == "task_created"
+    assert received["event"]["id"] is not None
+
+    await connection_manager.broadcast(board_id, {"event": "ping", "data": None})
+    assert await ws.receive() == {
+        "type": "event",
+        "board_id": board_id,
+        "id": None,
+        "event": "ping",
+        "data": None,
+    }
+
+    await ws.send({"action": "subscribe", "board_id": board_id + 1000})
+    error = await ws.receive()
+    assert error["type"] == "error"
+    assert error["status_code"] == 404
+
+    await ws.close()
+    assert connection_manager.stats(board_id).subscribers == 0
+
+
+async def test_ws_drops_board_of_removed_member(
+    channel_app: tuple, app_factory: Callable[[], FastAPI]
+) -> None:
+    app, owner, board_id = channel_app
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as member:
+        member = await register_and_login(member)
+        me = (await member.get("/api/v1/auth/me")).json()
+        await owner.post(
+            f"/api/v1/board/{board_id}/members/add",
+            json={"email": me["email"], "role": "viewer"},
+        )
+        token = member.headers["Authorization"].removeprefix("Bearer ")
+    ws = WsSession(app, token)
+    await ws.connect()
+    await ws.send({"action": "subscribe", "board_id": board_id})
+    assert (await ws.receive())["type"] == "ack"
+
+    removed = await owner.delete(
+        f"/api/v1/board/{board_id}/members/delete_member/{me['email']}"
+    )
+    assert removed.status_code == 204
+    event = await ws.receive()
+    assert (event["event"], event["data"]["user_id"]) == ("member_removed", me["id"])
+    assert connection_manager.stats(board_id).subscribers == 0
+    await ws.close()
+
+
+async def test_ws_closes_when_token_expires(channel_app: tuple) -> None:
+    app, client, _ = channel_app
+    settings = get_settings()
+    user_id = (await client.get("/api/v1/auth/me")).json()["id"]
+    token = jwt.encode(
+        {"sub": user_id, "exp": datetime.now(tz=UTC) + timedelta(seconds=1)},
+        key=settings.token.secret,
+        algorithm=settings.token.algorithm,
+    )
+    ws = WsSession(app, token)
+    assert (await ws.connect())["type"] == "websocket.accept"
+    closed = await asyncio.wait_for(ws.outbox.get(), timeout=5)
+    assert closed["type"] == "websocket.close"
+    assert closed["code"] == status.WS_1008_POLICY_VIOLATION
+    await ws.close()
+
+
+async def test_channel_stops_when_writer_fails() -> None:
+    class BrokenSocket:
+        closed_with: int | None = None
+
+        async def iter_text(self) -> AsyncGenerator[str]:
+            await asyncio.Event().wait()
+            yield ""
+
+        async def send_text(self, text: str) -> None:
+            raise RuntimeError("socket already closed")
+
+        async def close(self, code: int, reason: str | None = None) -> None:
+            self.closed_with = code
+
+    manager = ConnectionManager()
+    socket = BrokenSocket()
+    channel = BoardChannel(
+        socket,  # ty:ignore[invalid-argument-type]
+        manager,
+        sessions=None,  # ty:ignore[invalid-argument-type]
+        user=UserGet(id=uuid.uuid4(), email="ws@example.com", name="ws"),
+    )
+    await manager.subscribe(1, channel.queue)
+    channel.boards.add(1)
+    manager._deliver(1, [{"event": "ping", "data": None}])
+    await asyncio.wait_for(channel.run(), timeout=5)
+    assert socket.closed_with == status.WS_1011_INTERNAL_ERROR
+    assert manager.stats(1).subscribers == 0
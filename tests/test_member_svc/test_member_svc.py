@@ -1,8 +1,13 @@
 from typing import Any
+from uuid import UUID
 
 import pytest
 from httpx import AsyncClient
 
+from backend.kanban.core.security.role_cache import role_cache
+from backend.kanban.core.utility.role_enum import RoleEnum
+from backend.kanban.event_manager.tasks_event_manager import connection_manager
+
 
 @pytest.fixture
 async def two_members(
@@ -116,3 +121,48 @@ async def test_unknown_user(two_members: dict[str, Any]) -> None:
         f"/api/v1/board/{two_members['board_id']}/members/delete_member/unknown@example.com",
     )
     assert result.status_code == 404
+
+
+async def test_viewer_permission_denied(two_members: dict[str, Any]) -> None:
+    client = two_members["member_client"]
+    result = await client.post(
+        f"/api/v1/board/{two_members['board_id']}/members/add",
+        json={"email": two_members["member_email"], "role": "member"},
+    )
+    assert result.status_code == 403
+
+
+async def test_role_cache_invalidated_on_update(two_members: dict[str, Any]) -> None:
+    board_id = two_members["board_id"]
+    member_client = two_members["member_client"]
+    member = await member_client.get("/api/v1/auth/me")
+    member_id = UUID(member.json()["id"])
+    denied = await member_client.post(
+        f"/api/v1/board/{board_id}/members/add",
+        json={"email": two_members["member_email"], "role": "member"},
+    )
+    assert denied.status_code == 403
+    assert await role_cache.get(board_id, member_id) == RoleEnum.VIEWER
+
+    result = await two_members["owner_client"].put(
+        f"/api/v1/board/{board_id}/members/update",
+        json={"email": two_members["member_email"], "role": "member"},
+    )
+    assert result.status_code == 200
+    assert await role_cache.get(board_id, member_id) is None
+
+
+async def test_member_update_publishes_event(two_members: dict[str, Any]) -> None:
+    board_id = two_members["board_id"]
+    queue = await connection_manager.subscribe(board_id)
+    try:
+        result = await two_members["owner_client"].put(
+            f"/api/v1/board/{board_id}/members/update",
+            json={"email": two_members["member_email"], "role": "member"},
+        )
+        assert result.status_code == 200
+        frame = queue.get_nowait()
+        assert frame.event == "member_updated"
+        assert frame.message["data"]["role"] == "member"
+    finally:
+        await connection_manager.unsubscribe(board_id, queue)
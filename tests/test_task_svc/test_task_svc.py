@@ -1,7 +1,22 @@
+import asyncio
+import json
 from typing import Any
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.kanban.core.utility.ordering_key import keys_between
+from backend.kanban.database.unit_of_work import UnitOfWork
+from backend.kanban.event_manager.pubsub import MAX_NOTIFY_PAYLOAD, PostgresPubSub
+from backend.kanban.event_manager.tasks_event_manager import connection_manager
+from backend.kanban.models.models import Columns, Tasks
+from backend.kanban.schemas.tasks_schema import MoveTask
+from backend.kanban.services.position_rebalancer import PositionRebalancer
+from backend.kanban.services.services.tasks_service import TasksService
+from benchmarks.wip_admission import create_fixture, drop_fixture, run_admission
+from tests.db import AsyncSessionTest
 
 
 @pytest.fixture
@@ -18,7 +33,7 @@ async def task_fixture(auth_client: AsyncClient) -> dict[str, Any]:
     assert board_id == data_board.json()["id"]
     create_column = await auth_client.post(
         f"/api/v1/board/{board_id}/columns/add",
-        json={"name": "my amazing column", "position": 1, "wip_limit": 3},
+        json={"name": "my amazing column", "position": "a1", "wip_limit": 3},
     )
     column_id: int = create_column.json()["id"]
     assert create_column.status_code in (200, 201)
@@ -62,7 +77,7 @@ async def test_task_creation(task_fixture: dict[str, Any]) -> None:
             "task_data": {
                 "title": "Add test",
                 "description": "Description to the test",
-                "position": 1,
+                "position": "a1",
             }
         },
     )
@@ -81,7 +96,7 @@ async def bulk_creation(task_fixture: dict[str, Any]) -> AsyncClient:
             "task_data": {
                 "title": "Add test",
                 "description": "Description to the test",
-                "position": 1,
+                "position": "a1",
             }
         },
     )
@@ -91,7 +106,7 @@ async def bulk_creation(task_fixture: dict[str, Any]) -> AsyncClient:
             "task_data": {
                 "title": "Add test2",
                 "description": "Description to the test",
-                "position": 2,
+                "position": "a2",
             }
         },
     )
@@ -101,7 +116,7 @@ async def bulk_creation(task_fixture: dict[str, Any]) -> AsyncClient:
             "task_data": {
                 "title": "Add test2",
                 "description": "Description to the test",
-                "position": 3,
+                "position": "a3",
             }
         },
     )
@@ -118,7 +133,7 @@ async def test_task_creation_fail(
             "task_data": {
                 "title": "Add test2",
                 "description": "Description to the test",
-                "position": 4,
+                "position": "a4",
             }
         },
     )
@@ -155,7 +170,7 @@ async def test_put_task(
             "new_data": {
                 "title": "Super new test name",
                 "description": "Very new name of the test",
-                "position": 5,
+                "position": "a5",
             }
         },
     )
@@ -180,3 +195,552 @@ async def test_assign_user_to_the_task(
         json={"new_data": {}, "email": member_email},
     )
     assert result.status_code == 200
+
+
+async def test_events_published_after_commit(task_fixture: dict[str, Any]) -> None:
+    client: AsyncClient = task_fixture["client"]
+    board_id = task_fixture["board_id"]
+    queue = await connection_manager.subscribe(board_id)
+    try:
+        failed = await client.post(
+            f"/api/v1/board/{board_id}/columns/0/tasks/add_task",
+            json={"task_data": {"title": "x", "description": "y", "position": "a1"}},
+        )
+        assert failed.status_code == 404
+        assert queue.empty()
+        created = await client.post(
+            f"/api/v1/board/{board_id}/columns/{task_fixture['column_id']}/tasks/add_task",
+            json={"task_data": {"title": "x", "description": "y", "position": "a1"}},
+        )
+        assert created.status_code == 201
+        frame = queue.get_nowait()
+        assert frame.event == "task_created"
+        assert frame.message["data"]["task_id"] == created.json()["id"]
+        assert queue.empty()
+    finally:
+        await connection_manager.unsubscribe(board_id, queue)
+
+
+async def test_move_task_respects_wip_limit(
+    task_fixture: dict[str, Any], bulk_creation: AsyncClient
+) -> None:
+    client = bulk_creation
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    target = await client.post(
+        f"/api/v1/board/{board_id}/columns/add",
+        json={"name": "Doing", "position": "a2", "wip_limit": 1},
+    )
+    target_id = target.json()["id"]
+    column = await client.get(f"/api/v1/board/{board_id}/columns/{column_id}/tasks/")
+    first, second = [task["id"] for task in column.json()["tasks"][:2]]
+    tasks_url = f"/api/v1/board/{board_id}/columns/{column_id}/tasks"
+
+    moved = await client.patch(
+        f"{tasks_url}/{first}/move", json={"target_column_id": target_id}
+    )
+    assert moved.status_code == 200
+    blocked = await client.patch(
+        f"{tasks_url}/{second}/move", json={"target_column_id": target_id}
+    )
+    assert blocked.status_code == 409
+
+    # the source column has room again after the move
+    created = await client.post(
+        f"{tasks_url}/add_task",
+        json={"task_data": {"title": "again", "description": "d", "position": "a5"}},
+    )
+    assert created.status_code == 201
+
+
+async def test_concurrent_moves_of_one_task_keep_task_counts(
+    task_fixture: dict[str, Any], bulk_creation: AsyncClient
+) -> None:
+    client = bulk_creation
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    targets = []
+    for name in ("Doing", "Done"):
+        target = await client.post(
+            f"/api/v1/board/{board_id}/columns/add", json={"name": name}
+        )
+        targets.append(target.json()["id"])
+    column = await client.get(f"/api/v1/board/{board_id}/columns/{column_id}/tasks/")
+    task_id = column.json()["tasks"][0]["id"]
+
+    async def move(target_id: int) -> None:
+        async with AsyncSessionTest() as session:
+            await TasksService(UnitOfWork(session)).move_task(
+                board_id, task_id, MoveTask(target_column_id=target_id)
+            )
+
+    await asyncio.gather(*(move(target_id) for target_id in targets))
+
+    async with AsyncSessionTest() as check:
+        counts = dict(
+            (
+                await check.execute(
+                    select(Columns.id, Columns.task_count).where(
+                        Columns.board_id == board_id
+                    )
+                )
+            ).all()
+        )
+        rows = dict(
+            (
+                await check.execute(
+                    select(Tasks.column_id, func.count(Tasks.id))
+                    .where(Tasks.board_id == board_id)
+                    .group_by(Tasks.column_id)
+                )
+            ).all()
+        )
+        moved_to = await check.scalar(
+            select(Tasks.column_id).where(Tasks.id == task_id)
+        )
+    assert moved_to in targets
+    assert counts == {id: rows.get(id, 0) for id in counts}
+    assert counts[column_id] == 2
+
+
+async def test_concurrent_creation_never_overshoots_wip_limit(
+    session: AsyncSession,
+) -> None:
+    user_id, board_id, column_id = await create_fixture(AsyncSessionTest, 3)
+    result = await run_admission(
+        AsyncSessionTest, board_id, column_id, wip_limit=3, parallel=12
+    )
+    assert result.admitted == 3
+    assert result.rejected == 9
+    assert result.rows == result.task_count == 3
+    async with AsyncSessionTest() as check:
+        positions = await check.scalars(
+            select(Tasks.position).where(Tasks.column_id == column_id)
+        )
+        assert len(set(positions)) == 3
+    await drop_fixture(AsyncSessionTest, user_id, board_id)
+
+
+async def test_repeated_moves_into_one_gap_keep_order(
+    task_fixture: dict[str, Any], bulk_creation: AsyncClient
+) -> None:
+    client = bulk_creation
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    column_url = f"/api/v1/board/{board_id}/columns/{column_id}/tasks"
+    column = await client.get(f"{column_url}/")
+    first, middle, last = [task["id"] for task in column.json()["tasks"]]
+
+    # every drag lands right after the first task, halving the same gap
+    for _ in range(30):
+        moved = await client.patch(
+            f"{column_url}/{last}/move",
+            json={
+                "target_column_id": column_id,
+                "above_task_id": first,
+                "below_task_id": middle,
+            },
+        )
+        assert moved.status_code == 200
+        column = await client.get(f"{column_url}/")
+        assert [task["id"] for task in column.json()["tasks"]] == [first, last, middle]
+        middle, last = last, middle
+
+    out_of_order = await client.patch(
+        f"{column_url}/{last}/move",
+        json={
+            "target_column_id": column_id,
+            "above_task_id": middle,
+            "below_task_id": first,
+        },
+    )
+    assert out_of_order.status_code == 409
+
+
+async def test_task_position_must_be_ordering_key(
+    task_fixture: dict[str, Any],
+) -> None:
+    client: AsyncClient = task_fixture["client"]
+    result = await client.post(
+        f"/api/v1/board/{task_fixture['board_id']}/columns/{task_fixture['column_id']}/tasks/add_task",
+        json={"task_data": {"title": "x", "description": "y", "position": "a10"}},
+    )
+    assert result.status_code == 422
+
+
+async def test_rebalancer_respreads_dense_keys(
+    task_fixture: dict[str, Any], bulk_creation: AsyncClient
+) -> None:
+    client = bulk_creation
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    column_url = f"/api/v1/board/{board_id}/columns/{column_id}/tasks"
+    column = await client.get(f"{column_url}/")
+    first, middle, last = [task["id"] for task in column.json()["tasks"]]
+    for _ in range(20):
+        await client.patch(
+            f"{column_url}/{last}/move",
+            json={
+                "target_column_id": column_id,
+                "above_task_id": first,
+                "below_task_id": middle,
+            },
+        )
+        middle, last = last, middle
+    before = (await client.get(f"{column_url}/")).json()["tasks"]
+    assert max(len(task["position"]) for task in before) > 4
+
+    queue = await connection_manager.subscribe(board_id)
+    try:
+        rebalancer = PositionRebalancer(
+            AsyncSessionTest, max_key_length=4, interval=60, batch_size=10
+        )
+        assert await rebalancer.run_once() == 1
+        assert await rebalancer.run_once() == 0
+
+        after = (await client.get(f"{column_url}/")).json()["tasks"]
+        assert [task["id"] for task in after] == [task["id"] for task in before]
+        assert max(len(task["position"]) for task in after) <= 4
+        frame = await asyncio.wait_for(queue.get(), timeout=1)
+        assert frame.event == "positions_rebalanced"
+        assert frame.message["data"]["parent_id"] == column_id
+        old = {task["id"]: task["position"] for task in before}
+        assert frame.message["data"]["positions"] == {
+            str(task["id"]): task["position"]
+            for task in after
+            if task["position"] != old[task["id"]]
+        }
+    finally:
+        await connection_manager.unsubscribe(board_id, queue)
+
+
+async def test_rebalancer_separates_repeated_keys(
+    task_fixture: dict[str, Any], bulk_creation: AsyncClient
+) -> None:
+    client = bulk_creation
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    column_url = f"/api/v1/board/{board_id}/columns/{column_id}/tasks"
+    first, second, third = [
+        task["id"] for task in (await client.get(f"{column_url}/")).json()["tasks"]
+    ]
+    async with AsyncSessionTest() as session:
+        await session.execute(
+            update(Tasks).where(Tasks.id.in_([second, third])).values(position="a2")
+        )
+        await session.commit()
+
+    rebalancer = PositionRebalancer(
+        AsyncSessionTest, max_key_length=4, interval=60, batch_size=10
+    )
+    assert await rebalancer.run_once() == 1
+    assert await rebalancer.run_once() == 0
+    after = (await client.get(f"{column_url}/")).json()["tasks"]
+    assert [task["id"] for task in after] == [first, second, third]
+    assert len({task["position"] for task in after}) == 3
+
+
+async def test_rebalancer_splits_large_events(task_fixture: dict[str, Any]) -> None:
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    # long keys in ascending order, all of them dense
+    positions = [key + "V" * 20 for key in keys_between(None, None, 1000)]
+    async with AsyncSessionTest() as session:
+        await session.execute(
+            insert(Tasks),
+            [
+                {
+                    "board_id": board_id,
+                    "column_id": column_id,
+                    "title": f"task {n}",
+                    "description": "d",
+                    "position": position,
+                }
+                for n, position in enumerate(positions)
+            ],
+        )
+        await session.commit()
+
+    queue = await connection_manager.subscribe(board_id)
+    try:
+        rebalancer = PositionRebalancer(
+            AsyncSessionTest, max_key_length=10, interval=60, batch_size=10
+        )
+        assert await rebalancer.run_once() == 1
+        frames = []
+        while not queue.empty():
+            frames.append(queue.get_nowait())
+        assert len(frames) > 1
+        assert {frame.event for frame in frames} == {"positions_rebalanced"}
+        assert all(
+            len(PostgresPubSub.encode(board_id, [frame.message])) <= MAX_NOTIFY_PAYLOAD
+            for frame in frames
+        )
+        assert len({frame.message["id"] for frame in frames}) == len(frames)
+        rebalanced = {
+            id: key
+            for frame in frames
+            for id, key in frame.message["data"]["positions"].items()
+        }
+        async with AsyncSessionTest() as session:
+            stored = dict(
+                (
+                    await session.execute(
+                        select(Tasks.id, Tasks.position).where(
+                            Tasks.column_id == column_id
+                        )
+                    )
+                ).all()
+            )
+        assert rebalanced == {str(id): key for id, key in stored.items()}
+    finally:
+        await connection_manager.unsubscribe(board_id, queue)
+
+
+async def test_batch_move_reorders_in_one_event(
+    task_fixture: dict[str, Any], bulk_creation: AsyncClient
+) -> None:
+    client = bulk_creation
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    column_url = f"/api/v1/board/{board_id}/columns/{column_id}/tasks"
+    column = await client.get(f"{column_url}/")
+    first, second, third = [task["id"] for task in column.json()["tasks"]]
+
+    queue = await connection_manager.subscribe(board_id)
+    try:
+        result = await client.post(
+            f"/api/v1/board/{board_id}/tasks/move:batch",
+            json={
+                "moves": [
+                    {
+                        "task_id": third,
+                        "target_column_id": column_id,
+                        "below_task_id": first,
+                    },
+                    {
+                        "task_id": second,
+                        "target_column_id": column_id,
+                        "above_task_id": third,
+                        "below_task_id": first,
+                    },
+                ]
+            },
+        )
+        assert result.status_code == 200
+        assert {task["id"] for task in result.json()} == {second, third}
+        column = await client.get(f"{column_url}/")
+        assert [task["id"] for task in column.json()["tasks"]] == [
+            third,
+            second,
+            first,
+        ]
+        frame = await asyncio.wait_for(queue.get(), timeout=1)
+        assert frame.event == "tasks_moved"
+        moves = frame.message["data"]["moves"]
+        assert {move["task_id"] for move in moves} == {second, third}
+        assert queue.empty()
+    finally:
+        await connection_manager.unsubscribe(board_id, queue)
+
+
+async def test_batch_move_splits_large_events(task_fixture: dict[str, Any]) -> None:
+    client: AsyncClient = task_fixture["client"]
+    board_id = task_fixture["board_id"]
+    source, target = [
+        (
+            await client.post(
+                f"/api/v1/board/{board_id}/columns/add", json={"name": name}
+            )
+        ).json()["id"]
+        for name in ("Backlog", "Doing")
+    ]
+    async with AsyncSessionTest() as session:
+        task_ids = list(
+            await session.scalars(
+                insert(Tasks).returning(Tasks.id),
+                [
+                    {
+                        "board_id": board_id,
+                        "column_id": source,
+                        "title": f"task {n}",
+                        "description": "d",
+                        "position": position,
+                    }
+                    for n, position in enumerate(keys_between(None, None, 1000))
+                ],
+            )
+        )
+        await session.execute(
+            update(Columns).where(Columns.id == source).values(task_count=1000)
+        )
+        await session.commit()
+
+    queue = await connection_manager.subscribe(board_id)
+    try:
+        result = await client.post(
+            f"/api/v1/board/{board_id}/tasks/move:batch",
+            json={
+                "moves": [
+                    {"task_id": id, "target_column_id": target} for id in task_ids
+                ]
+            },
+        )
+        assert result.status_code == 200
+        frames = []
+        while not queue.empty():
+            frames.append(queue.get_nowait())
+        assert len(frames) > 1
+        assert {frame.event for frame in frames} == {"tasks_moved"}
+        assert all(
+            len(PostgresPubSub.encode(board_id, [frame.message])) <= MAX_NOTIFY_PAYLOAD
+            for frame in frames
+        )
+        moves = [move for frame in frames for move in frame.message["data"]["moves"]]
+        assert sorted(move["task_id"] for move in moves) == sorted(task_ids)
+        assert {move["new_column_id"] for move in moves} == {target}
+    finally:
+        await connection_manager.unsubscribe(board_id, queue)
+
+
+async def test_batch_move_checks_wip_limit_for_the_whole_batch(
+    task_fixture: dict[str, Any], bulk_creation: AsyncClient
+) -> None:
+    client = bulk_creation
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    target = await client.post(
+        f"/api/v1/board/{board_id}/columns/add",
+        json={"name": "Doing", "wip_limit": 2},
+    )
+    target_id = target.json()["id"]
+    column_url = f"/api/v1/board/{board_id}/columns/{column_id}/tasks"
+    task_ids = [
+        task["id"] for task in (await client.get(f"{column_url}/")).json()["tasks"]
+    ]
+    batch_url = f"/api/v1/board/{board_id}/tasks/move:batch"
+
+    blocked = await client.post(
+        batch_url,
+        json={
+            "moves": [{"task_id": id, "target_column_id": target_id} for id in task_ids]
+        },
+    )
+    assert blocked.status_code == 409
+    column = await client.get(f"{column_url}/")
+    assert [task["id"] for task in column.json()["tasks"]] == task_ids
+
+    moved = await client.post(
+        batch_url,
+        json={
+            "moves": [
+                {"task_id": id, "target_column_id": target_id} for id in task_ids[:2]
+            ]
+        },
+    )
+    assert moved.status_code == 200
+    target_tasks = await client.get(
+        f"/api/v1/board/{board_id}/columns/{target_id}/tasks/"
+    )
+    assert [task["id"] for task in target_tasks.json()["tasks"]] == task_ids[:2]
+    # the two freed slots of the source column can be used again
+    for title in ("again", "and again"):
+        created = await client.post(
+            f"{column_url}/add_task",
+            json={"task_data": {"title": title, "description": "d", "position": None}},
+        )
+        assert created.status_code == 201
+
+
+async def test_bulk_create_from_ndjson_reports_row_errors(
+    task_fixture: dict[str, Any],
+) -> None:
+    client: AsyncClient = task_fixture["client"]
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    me = (await client.get("/api/v1/auth/me")).json()
+
+    def row(title: str, **extra: object) -> str:
+        record = {"column_id": column_id, "title": title, "description": "d"}
+        return json.dumps(record | extra)
+
+    lines = [
+        row("first"),
+        "{not json",
+        row("second", email=me["email"]),
+        row("ghost", email="nobody@example.com"),
+        row("lost", column_id=999_999),
+        row("third"),
+        row("over the limit"),
+    ]
+    result = await client.post(
+        f"/api/v1/board/{board_id}/tasks/bulk",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert result.status_code == 200
+    body = result.json()
+    assert [created["row"] for created in body["created"]] == [0, 2, 5]
+    assert [error["row"] for error in body["errors"]] == [1, 3, 4, 6]
+    assert "WIP" in body["errors"][-1]["detail"]
+
+    column = await client.get(f"/api/v1/board/{board_id}/columns/{column_id}/tasks/")
+    tasks = column.json()["tasks"]
+    assert [task["title"] for task in tasks] == ["first", "second", "third"]
+    assert tasks[1]["assignee_id"] == me["id"]
+
+
+async def test_bulk_create_from_json_array(task_fixture: dict[str, Any]) -> None:
+    client: AsyncClient = task_fixture["client"]
+    board_id = task_fixture["board_id"]
+    column = await client.post(
+        f"/api/v1/board/{board_id}/columns/add", json={"name": "Backlog"}
+    )
+    column_id = column.json()["id"]
+    rows = [
+        {"column_id": column_id, "title": f"task {n}", "description": "d"}
+        for n in range(50)
+    ]
+    rows.append(
+        {"column_id": column_id, "title": "top", "description": "d", "position": "Zz"}
+    )
+    result = await client.post(f"/api/v1/board/{board_id}/tasks/bulk", json=rows)
+    assert result.status_code == 200
+    assert len(result.json()["created"]) == 51
+    assert result.json()["errors"] == []
+
+    column = await client.get(f"/api/v1/board/{board_id}/columns/{column_id}/tasks/")
+    titles = [task["title"] for task in column.json()["tasks"]]
+    assert titles == ["top", *(f"task {n}" for n in range(50))]
+
+    malformed = await client.post(
+        f"/api/v1/board/{board_id}/tasks/bulk",
+        content=b"[{",
+        headers={"Content-Type": "application/json"},
+    )
+    assert malformed.status_code == 422
+
+
+@pytest.fixture
+def bulk_limit(monkeypatch: pytest.MonkeyPatch) -> int:
+    """Row limit of the apps created after this fixture"""
+    monkeypatch.setenv("BULK__MAX_ROWS", "3")
+    return 3
+
+
+async def test_bulk_create_rejects_uploads_over_the_row_limit(
+    bulk_limit: int, task_fixture: dict[str, Any]
+) -> None:
+    client: AsyncClient = task_fixture["client"]
+    board_id, column_id = task_fixture["board_id"], task_fixture["column_id"]
+    bulk_url = f"/api/v1/board/{board_id}/tasks/bulk"
+    rows = [
+        {"column_id": column_id, "title": f"task {n}", "description": "d"}
+        for n in range(bulk_limit + 1)
+    ]
+
+    too_large = await client.post(bulk_url, json=rows)
+    assert too_large.status_code == 413
+    too_large = await client.post(
+        bulk_url,
+        content="\n".join(json.dumps(row) for row in rows),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert too_large.status_code == 413
+    column = await client.get(f"/api/v1/board/{board_id}/columns/{column_id}/tasks/")
+    assert column.json()["tasks"] == []
+
+    accepted = await client.post(bulk_url, json=rows[:bulk_limit])
+    assert accepted.status_code == 200
+    assert len(accepted.json()["created"]) == bulk_limit
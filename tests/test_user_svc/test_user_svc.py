@@ -1,6 +1,10 @@
+from uuid import UUID
+
 import pytest
 from httpx import AsyncClient
 
+from backend.kanban.core.security.principal_cache import principal_cache
+
 
 @pytest.mark.parametrize(
     "email, password, status_code",
@@ -212,3 +216,13 @@ async def test_me_without_login(client: AsyncClient) -> None:
     )
     result = await client.get("/api/v1/auth/me")
     assert result.status_code == 401
+
+
+async def test_me_is_cached(auth_client: AsyncClient) -> None:
+    first = await auth_client.get("/api/v1/auth/me")
+    user_id = UUID(first.json()["id"])
+    cached = principal_cache.get(user_id)
+    assert cached is not None
+    assert cached.email == first.json()["email"]
+    second = await auth_client.get("/api/v1/auth/me")
+    assert second.json() == first.json()